@@ -0,0 +1,33 @@
+"""Настройки gunicorn: файл подхватывается из текущего каталога.
+
+Для метрик нескольких воркеров задайте PROMETHEUS_MULTIPROC_DIR
+(см. task_manager/metrics.py). Шаблоны и URLconf загружаются при запуске воркера
+(см. task_manager/warmup.py).
+"""
+
+import os
+from pathlib import Path
+
+from prometheus_client import multiprocess
+
+
+def on_starting(server):
+    # Значения прошлого запуска не должны попасть в новые метрики
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        for path in Path(directory).glob("*.db"):
+            path.unlink()
+
+
+def child_exit(server, worker):
+    # Значения gauge остановленного воркера больше не учитываются
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    # Приложение уже загружено: Django настроен
+    from task_manager.warmup import warm_up
+
+    warm_up()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+# Под ASGI - асинхронные варианты view, см. ASYNC_VIEWS в settings.py
+os.environ.setdefault("ASYNC_VIEWS", "true")
 
 application = get_asgi_application()
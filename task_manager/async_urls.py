@@ -0,0 +1,20 @@
+"""URL проекта под ASGI (settings.ASYNC_VIEWS): те же маршруты, но
+приложения подключены с асинхронными вариантами view."""
+
+from django.urls import include, path
+
+from task_manager import urls
+
+ASYNC_APPS = {
+    "users/": "task_manager.users.async_urls",
+    "statuses/": "task_manager.statuses.async_urls",
+    "tasks/": "task_manager.tasks.async_urls",
+    "labels/": "task_manager.labels.async_urls",
+}
+
+urlpatterns = [
+    path(route, include(ASYNC_APPS[route]))
+    if (route := str(pattern.pattern)) in ASYNC_APPS
+    else pattern
+    for pattern in urls.urlpatterns
+]
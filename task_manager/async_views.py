@@ -0,0 +1,236 @@
+"""Асинхронные варианты generic view для работы под ASGI.
+
+Записи читаются через async ORM (aget, acount, async for), и view не
+занимает поток на весь запрос. Проверка и сохранение формы - один
+вызов sync_to_async: уникальность, выбор из queryset и связи
+многие-ко-многим в формах синхронные. Шаблон Django отрисовывает уже
+после view, в потоке; объекты к этому моменту загружены.
+
+Маршруты с этими view - в async_urls.py приложений, их подключает
+settings.ASYNC_VIEWS.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.contrib.auth.mixins import AccessMixin
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponseRedirect
+from django.urls import path
+from django.utils.translation import gettext as _
+from django.views.generic import View
+from django.views.generic.base import ContextMixin
+from django.views.generic.detail import (
+    SingleObjectMixin,
+    SingleObjectTemplateResponseMixin,
+)
+from django.views.generic.edit import ModelFormMixin
+from django.views.generic.list import (
+    MultipleObjectMixin,
+    MultipleObjectTemplateResponseMixin,
+)
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """LoginRequiredMixin для асинхронных view.
+
+    Пользователь загружается через request.auser() и заменяет ленивый
+    request.user: иначе шаблон и проверки прав загрузили бы его еще раз,
+    синхронно.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super().dispatch(request, *args, **kwargs)
+
+
+class AsyncSingleObjectMixin(SingleObjectMixin):
+    async def aget_object(self, queryset=None):
+        if queryset is None:
+            queryset = self.get_queryset()
+        try:
+            return await queryset.aget(pk=self.kwargs[self.pk_url_kwarg])
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                _("No %(verbose_name)s found matching the query")
+                % {"verbose_name": queryset.model._meta.verbose_name}
+            ) from None
+
+
+class AsyncListView(
+    MultipleObjectTemplateResponseMixin, MultipleObjectMixin, View
+):
+    async def get(self, request, *args, **kwargs):
+        queryset = await self.aget_queryset()
+        page_size = self.get_paginate_by(queryset)
+        if page_size:
+            paginator, page = await self.apaginate_queryset(queryset, page_size)
+            self.object_list = page.object_list
+            context = {
+                "paginator": paginator,
+                "page_obj": page,
+                "is_paginated": page.has_other_pages(),
+            }
+        else:
+            self.object_list = [obj async for obj in queryset]
+            context = {
+                "paginator": None,
+                "page_obj": None,
+                "is_paginated": False,
+            }
+        return self.render_to_response(self.get_context_data(**context))
+
+    async def aget_queryset(self):
+        """Выборка списка; подклассы переопределяют, если для нее нужны
+        синхронные вызовы"""
+        return self.get_queryset()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """Как MultipleObjectMixin.paginate_queryset, но число записей
+        и страница читаются через async ORM"""
+        paginator = self.get_paginator(
+            queryset,
+            page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        # Paginator.count - cached_property: синхронный count() не нужен
+        paginator.count = await queryset.acount()
+        page = (
+            self.kwargs.get(self.page_kwarg)
+            or self.request.GET.get(self.page_kwarg)
+            or 1
+        )
+        try:
+            number = int(page)
+        except ValueError:
+            if page != "last":
+                raise Http404(
+                    _("Page is not “last”, nor can it be converted to an int.")
+                ) from None
+            number = paginator.num_pages
+        try:
+            number = paginator.validate_number(number)
+        except InvalidPage as error:
+            raise Http404(
+                _("Invalid page (%(page_number)s): %(message)s")
+                % {"page_number": number, "message": str(error)}
+            ) from None
+        bottom = (number - 1) * paginator.per_page
+        top = bottom + paginator.per_page
+        if top + paginator.orphans >= paginator.count:
+            top = paginator.count
+        objects = [obj async for obj in queryset[bottom:top]]
+        return paginator, paginator._get_page(objects, number, paginator)
+
+    def get_context_data(self, **kwargs):
+        """Как MultipleObjectMixin.get_context_data, но страница уже
+        выбрана и синхронной пагинации нет"""
+        kwargs.setdefault("object_list", self.object_list)
+        context_object_name = self.get_context_object_name(self.object_list)
+        if context_object_name is not None:
+            kwargs[context_object_name] = self.object_list
+        return ContextMixin.get_context_data(self, **kwargs)
+
+
+class AsyncDetailView(
+    SingleObjectTemplateResponseMixin, AsyncSingleObjectMixin, View
+):
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data())
+
+
+class AsyncModelFormView(
+    AsyncSingleObjectMixin,
+    ModelFormMixin,
+    SingleObjectTemplateResponseMixin,
+    View,
+):
+    """Основа асинхронных CreateView и UpdateView; сообщение об успехе -
+    как у SuccessMessageMixin"""
+
+    success_message = ""
+
+    async def aget_instance(self):
+        raise NotImplementedError
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_instance()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_instance()
+        form = self.get_form()
+        if not await sync_to_async(self.save_form)(form):
+            return self.form_invalid(form)
+        success_message = self.get_success_message(form.cleaned_data)
+        if success_message:
+            messages.success(request, success_message)
+        return HttpResponseRedirect(self.get_success_url())
+
+    def save_form(self, form):
+        """Проверяет и сохраняет форму; выполняется в потоке"""
+        if not form.is_valid():
+            return False
+        self.object = form.save()
+        return True
+
+    def get_success_message(self, cleaned_data):
+        return self.success_message % cleaned_data
+
+
+class AsyncCreateView(AsyncModelFormView):
+    template_name_suffix = "_form"
+
+    async def aget_instance(self):
+        return None
+
+
+class AsyncUpdateView(AsyncModelFormView):
+    template_name_suffix = "_form"
+
+    async def aget_instance(self):
+        return await self.aget_object()
+
+
+class AsyncDeleteView(
+    SingleObjectTemplateResponseMixin, AsyncSingleObjectMixin, View
+):
+    template_name_suffix = "_confirm_delete"
+    success_url = None
+    success_message = ""
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return await self.adelete_object()
+
+    async def adelete_object(self):
+        success_url = self.get_success_url()
+        await self.object.adelete()
+        if self.success_message:
+            messages.success(self.request, self.success_message)
+        return HttpResponseRedirect(success_url)
+
+    def get_success_url(self):
+        return self.success_url.format(**self.object.__dict__)
+
+
+def async_urlpatterns(urlpatterns, views):
+    """Копия urlpatterns, где маршруты с именами из views ведут на
+    асинхронные варианты"""
+    return [
+        path(
+            str(pattern.pattern),
+            views[pattern.name].as_view(),
+            name=pattern.name,
+        )
+        if pattern.name in views
+        else pattern
+        for pattern in urlpatterns
+    ]
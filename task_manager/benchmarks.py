@@ -0,0 +1,1066 @@
+"""Нагрузочные замеры страниц задач на сгенерированных данных.
+
+Запуск: python manage.py benchmark --sizes 1000,100000,1000000
+Команда создает отдельную тестовую базу, наполняет ее через seed_tasks
+до каждого из размеров по очереди и замеряет сценарии из CASES тестовым
+клиентом Django, то есть весь путь запроса: middleware, view, шаблон.
+Отчет - JSON, который можно сравнить с отчетом другого коммита
+(--compare).
+
+python manage.py benchmark_db сравнивает пропускную способность базы
+под параллельной нагрузкой с настройками производительности из
+settings.py и без них (ConcurrencyBenchmark), а benchmark_sessions -
+затраты на сессию в каждом запросе с разными движками (SessionBenchmark),
+benchmark_rows - отрисовку строк таблицы задач с пустым и заполненным
+кешем строк (RowRenderBenchmark), benchmark_startup - запуск процесса
+и первые запросы с прогревом шаблонов и без него (StartupBenchmark),
+а benchmark_servers - gunicorn и uvicorn под сотнями одновременных
+клиентов (ServerBenchmark).
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from importlib import import_module
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import (
+    DatabaseError,
+    connection,
+    connections,
+    transaction,
+)
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone, translation
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.management.commands.explain_task_filters import (
+    CANONICAL_FILTERS,
+)
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+DEFAULT_SIZES = (1_000, 100_000, 1_000_000)
+
+
+@dataclass
+class Case:
+    """Сценарий замера.
+
+    request(runner) готовит запрос и возвращает (метод, путь, данные);
+    он вызывается перед каждым повтором и в замер не входит.
+    """
+
+    name: str
+    request: object
+    expected_status: int = 200
+
+
+def _filter_params(values):
+    return {
+        name: "on" if value is True else value for name, value in values.items()
+    }
+
+
+def _list_case(name, params):
+    return Case(
+        name, lambda runner: ("get", reverse("tasks:tasks"), dict(params))
+    )
+
+
+def _next_page(runner):
+    # На базе меньше одной страницы второй страницы нет
+    params = {"cursor": runner.next_cursor} if runner.next_cursor else {}
+    return "get", reverse("tasks:tasks"), params
+
+
+def _detail(runner):
+    return "get", reverse("tasks:detail", args=[runner.task.pk]), None
+
+
+def _create(runner):
+    data = {"name": "Замер создания", "status": runner.status.pk}
+    return "post", reverse("tasks:create"), data
+
+
+def _update(runner):
+    data = {"name": "Замер изменения", "status": runner.status.pk}
+    return "post", reverse("tasks:update", args=[runner.task.pk]), data
+
+
+def _delete(runner):
+    task = Task.objects.create(
+        name="Замер удаления", status=runner.status, author=runner.user
+    )
+    return "post", reverse("tasks:delete", args=[task.pk]), None
+
+
+CASES = [
+    _list_case("task_list", {}),
+    Case("task_list_next_page", _next_page),
+    *(
+        _list_case(f"task_filter[{name}]", _filter_params(values))
+        for name, values in CANONICAL_FILTERS.items()
+        if values
+    ),
+    _list_case("task_search", {"q": "отчет"}),
+    Case("task_detail", _detail),
+    Case("task_create", _create, expected_status=302),
+    Case("task_update", _update, expected_status=302),
+    Case("task_delete", _delete, expected_status=302),
+]
+
+
+class BenchmarkRunner:
+    """Замеряет CASES на текущей базе, дополняя ее до нужного размера"""
+
+    def __init__(self, repeat=5, seed=0, stdout=None):
+        self.repeat = repeat
+        self.seed = seed
+        self.stdout = stdout
+
+    def run(self, sizes):
+        return {str(size): self.run_size(size) for size in sizes}
+
+    def run_size(self, size):
+        self.seed_to(size)
+        self.prepare()
+        results = {}
+        for case in CASES:
+            results[case.name] = self.measure(case)
+            self.log(f"{size:>9} {case.name}: {results[case.name]}")
+        return results
+
+    def seed_to(self, size):
+        missing = size - Task.objects.count()
+        if missing <= 0:
+            return
+        first_run = not User.objects.exists()
+        call_command(
+            "seed_tasks",
+            users=max(0, max(10, size // 1000) - User.objects.count()),
+            statuses=6 if first_run else 0,
+            labels=40 if first_run else 0,
+            tasks=missing,
+            seed=self.seed + size,
+            verbosity=0,
+        )
+
+    def prepare(self):
+        """Пользователь, от имени которого идут запросы, и его задача"""
+        self.client = Client()
+        self.user = User.objects.order_by("pk").first()
+        self.client.force_login(self.user)
+        self.status = Status.objects.order_by("pk").first()
+        self.task = Task.objects.filter(author=self.user).first()
+        if self.task is None:
+            self.task = Task.objects.create(
+                name="Замер", status=self.status, author=self.user
+            )
+        response = self.client.get(reverse("tasks:tasks"))
+        self.next_cursor = response.context["page_obj"].next_cursor
+
+    def measure(self, case):
+        # Первый прогон прогревает кеши и считает запросы к базе
+        with CaptureQueriesContext(connection) as queries:
+            self.send(case)
+        # Следующий запрос очистит журнал запросов - считаем сразу
+        query_count = len(queries)
+        timings = []
+        for _number in range(self.repeat):
+            method, path, data = case.request(self)
+            started = time.perf_counter()
+            response = getattr(self.client, method)(path, data)
+            timings.append((time.perf_counter() - started) * 1000)
+            self.check(case, response)
+        timings.sort()
+        return {
+            "queries": query_count,
+            "min_ms": round(timings[0], 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(
+                timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3
+            ),
+        }
+
+    def send(self, case):
+        method, path, data = case.request(self)
+        response = getattr(self.client, method)(path, data)
+        self.check(case, response)
+
+    @staticmethod
+    def check(case, response):
+        if response.status_code != case.expected_status:
+            raise RuntimeError(
+                f"{case.name}: expected {case.expected_status}, "
+                f"got {response.status_code}"
+            )
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+
+def build_report(results, repeat):
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(base, current):
+    """Строки (размер, сценарий, медиана было, медиана стало, изменение %)
+    для сценариев, которые есть в обоих отчетах"""
+    rows = []
+    for size, cases in current["results"].items():
+        for name, stats in cases.items():
+            before = base["results"].get(size, {}).get(name)
+            if before is None:
+                continue
+            change = (
+                (stats["median_ms"] - before["median_ms"])
+                / before["median_ms"]
+                * 100
+                if before["median_ms"]
+                else 0.0
+            )
+            rows.append(
+                (size, name, before["median_ms"], stats["median_ms"], change)
+            )
+    return rows
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+@dataclass
+class _ThreadStats:
+    latencies: list
+    errors: int = 0
+    # Исключение, на котором поток остановился раньше срока
+    crash: BaseException | None = None
+
+
+@dataclass
+class ConcurrencyResult:
+    profile: str
+    threads: int
+    operations: int
+    errors: int
+    ops_per_second: float
+    median_ms: float
+    p95_ms: float
+
+
+class ConcurrencyBenchmark:
+    """Смесь чтений и записей из нескольких потоков на разных профилях
+    настроек одной базы.
+
+    Каждая операция - как обработка веб-запроса: соединение берется
+    (из пула или заново) и в конце закрывается, как после ответа при
+    CONN_MAX_AGE=0. SQLite-профили получают по отдельному файлу в
+    directory: режим WAL сохраняется в файле базы. PostgreSQL-профили
+    работают с уже созданной тестовой базой.
+    """
+
+    tasks = 2000
+
+    def __init__(self, seconds=3.0, write_ratio=0.2, seed=0, stdout=None):
+        self.seconds = seconds
+        self.write_ratio = write_ratio
+        self.seed = seed
+        self.stdout = stdout
+
+    def profiles(self):
+        """{имя: OPTIONS} для сравнения на движке базы default"""
+        engine = connections.settings["default"]["ENGINE"]
+        if engine == "django.db.backends.sqlite3":
+            return {
+                "sqlite_default": {},
+                "sqlite_tuned": settings.SQLITE_OPTIONS,
+            }
+        if engine == "django.db.backends.postgresql":
+            return {
+                "postgresql_no_pool": {},
+                "postgresql_pool": {"pool": settings.DATABASE_POOL_OPTIONS},
+            }
+        raise ValueError(f"No benchmark profiles for {engine}")
+
+    def run(self, thread_counts, directory=None):
+        results = []
+        for profile, options in self.profiles().items():
+            alias = self.add_database(profile, options, directory)
+            try:
+                self.prepare(alias)
+                for threads in thread_counts:
+                    result = self.measure(profile, alias, threads)
+                    self.log(result)
+                    results.append(result)
+            finally:
+                self.remove_database(alias)
+        return results
+
+    def add_database(self, profile, options, directory):
+        alias = f"benchmark_{profile}"
+        database = {
+            **connections.settings["default"],
+            "OPTIONS": options,
+            "CONN_MAX_AGE": 0,
+        }
+        if database["ENGINE"] == "django.db.backends.sqlite3":
+            database["NAME"] = str(Path(directory) / f"{profile}.sqlite3")
+        connections.settings[alias] = database
+        return alias
+
+    def remove_database(self, alias):
+        pool_owner = connections[alias]
+        if hasattr(pool_owner, "close_pool"):
+            pool_owner.close_pool()
+        connections[alias].close()
+        del connections[alias]
+        del connections.settings[alias]
+
+    def prepare(self, alias):
+        if connections.settings[alias]["ENGINE"].endswith("sqlite3"):
+            call_command("migrate", database=alias, verbosity=0)
+        user = User.objects.using(alias).create(username=f"bench_{alias}")
+        status = Status.objects.using(alias).create(name=f"bench_{alias}")
+        Task.objects.using(alias).bulk_create(
+            Task(name=f"Задача {number}", status=status, author=user)
+            for number in range(self.tasks)
+        )
+        self.user_id, self.status_id = user.pk, status.pk
+        self.task_ids = list(
+            Task.objects.using(alias).values_list("pk", flat=True)
+        )
+        connections[alias].close()
+
+    def measure(self, profile, alias, threads):
+        deadline = time.perf_counter() + self.seconds
+        stats = [_ThreadStats([]) for _thread in range(threads)]
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(
+                    alias,
+                    deadline,
+                    random.Random(self.seed + number),
+                    stats[number],
+                ),
+            )
+            for number in range(threads)
+        ]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        crashes = [thread.crash for thread in stats if thread.crash]
+        if crashes:
+            # Иначе замер выглядел бы законченным, но с меньшим числом
+            # потоков
+            raise RuntimeError(
+                f"{len(crashes)} of {threads} benchmark threads crashed"
+            ) from crashes[0]
+
+        latencies = sorted(ms for thread in stats for ms in thread.latencies)
+        if not latencies:
+            latencies = [0.0]
+            operations = 0
+        else:
+            operations = len(latencies)
+        return ConcurrencyResult(
+            profile=profile,
+            threads=threads,
+            operations=operations,
+            errors=sum(thread.errors for thread in stats),
+            ops_per_second=round(operations / elapsed, 1),
+            median_ms=round(statistics.median(latencies), 3),
+            p95_ms=round(latencies[int(len(latencies) * 0.95)], 3),
+        )
+
+    def work(self, alias, deadline, rng, stats):
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    if rng.random() < self.write_ratio:
+                        self.write(alias, rng)
+                    else:
+                        self.read(alias, rng)
+                except DatabaseError:
+                    # "database is locked", таймаут пула и т. п.
+                    stats.errors += 1
+                    continue
+                finally:
+                    connections[alias].close()
+                stats.latencies.append((time.perf_counter() - started) * 1000)
+        except Exception as exc:  # noqa: BLE001 - поднимется в measure()
+            stats.crash = exc
+        finally:
+            connections[alias].close()
+
+    def read(self, alias, rng):
+        start = rng.choice(self.task_ids)
+        list(
+            Task.objects.using(alias)
+            .select_related("status", "author", "executor")
+            .filter(pk__lte=start)
+            .order_by("-pk")[:50]
+        )
+
+    def write(self, alias, rng):
+        with transaction.atomic(using=alias):
+            Task.objects.using(alias).filter(
+                pk=rng.choice(self.task_ids)
+            ).update(description=f"{rng.random()}")
+            Task.objects.using(alias).create(
+                name="Замер записи",
+                status_id=self.status_id,
+                author_id=self.user_id,
+            )
+
+    def log(self, result):
+        if self.stdout is not None:
+            self.stdout.write(
+                f"{result.profile:<20} {result.threads:>3} threads "
+                f"{result.ops_per_second:>9.1f} ops/s "
+                f"median {result.median_ms:.2f} ms, "
+                f"p95 {result.p95_ms:.2f} ms, {result.errors} error(s)"
+            )
+
+
+WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE")
+
+
+@dataclass
+class SessionResult:
+    profile: str
+    requests: int
+    queries_per_request: float
+    writes_per_request: float
+    median_ms: float
+    p95_ms: float
+
+
+class SessionBenchmark:
+    """Затраты SessionMiddleware на запрос вошедшего пользователя.
+
+    Каждый запрос проходит только через SessionMiddleware и view,
+    которое читает сессию, как AuthenticationMiddleware; остальная
+    обработка запроса в замер не входит.
+    """
+
+    # {имя: (SESSION_ENGINE, SESSION_SAVE_EVERY_REQUEST)}
+    profiles = {
+        "db": ("django.contrib.sessions.backends.db", False),
+        "db_sliding": ("django.contrib.sessions.backends.db", True),
+        "cached_db_sliding": (
+            "django.contrib.sessions.backends.cached_db",
+            True,
+        ),
+        "coalesced": ("task_manager.sessions", True),
+    }
+
+    def __init__(self, requests=200, stdout=None):
+        self.requests = requests
+        self.stdout = stdout
+
+    def run(self):
+        results = []
+        for profile, (engine, save_every_request) in self.profiles.items():
+            with override_settings(
+                SESSION_ENGINE=engine,
+                SESSION_SAVE_EVERY_REQUEST=save_every_request,
+            ):
+                result = self.measure(profile, engine)
+            self.log(result)
+            results.append(result)
+        return results
+
+    def measure(self, profile, engine):
+        session = import_module(engine).SessionStore()
+        session[SESSION_KEY] = "1"
+        session.save()
+        middleware = SessionMiddleware(self.view)
+        factory = RequestFactory()
+        factory.cookies[settings.SESSION_COOKIE_NAME] = session.session_key
+
+        timings = []
+        with CaptureQueriesContext(connection) as queries:
+            for _number in range(self.requests):
+                request = factory.get("/")
+                started = time.perf_counter()
+                middleware(request)
+                timings.append((time.perf_counter() - started) * 1000)
+        writes = sum(
+            query["sql"].lstrip().upper().startswith(WRITE_STATEMENTS)
+            for query in queries
+        )
+        timings.sort()
+        return SessionResult(
+            profile=profile,
+            requests=self.requests,
+            queries_per_request=round(len(queries) / self.requests, 3),
+            writes_per_request=round(writes / self.requests, 3),
+            median_ms=round(statistics.median(timings), 3),
+            p95_ms=round(timings[int(len(timings) * 0.95)], 3),
+        )
+
+    @staticmethod
+    def view(request):
+        request.session.get(SESSION_KEY)
+        return HttpResponse()
+
+    def log(self, result):
+        if self.stdout is not None:
+            self.stdout.write(
+                f"{result.profile:<20} "
+                f"{result.queries_per_request:>6.2f} queries "
+                f"{result.writes_per_request:>6.2f} writes per request, "
+                f"median {result.median_ms:.3f} ms, "
+                f"p95 {result.p95_ms:.3f} ms"
+            )
+
+
+DEFAULT_ROW_COUNTS = (1_000, 10_000, 50_000)
+
+
+@dataclass
+class RowRenderResult:
+    rows: int
+    uncached_ms: float
+    cold_ms: float
+    warm_ms: float
+
+
+class RowRenderBenchmark:
+    """Отрисовка tasks/rows.html без кеша строк, с пустым и с
+    заполненным кешем.
+
+    Задачи создаются в памяти, без базы: замеряется только шаблон.
+    Кеш строк на время замера - отдельный, размером с самую большую
+    выборку; в настройках по умолчанию в памяти процесса держится
+    только CACHES["default"]["OPTIONS"]["LOCAL_MAX_ENTRIES"] строк.
+    """
+
+    template_name = "tasks/rows.html"
+
+    def __init__(self, stdout=None):
+        self.stdout = stdout
+
+    def run(self, sizes):
+        capacity = max(sizes)
+        fragments = {
+            "BACKEND": "task_manager.cache.TieredCache",
+            "LOCATION": "benchmark_rows",
+            "OPTIONS": {"LOCAL_MAX_ENTRIES": capacity, "LOCAL_TIMEOUT": 600},
+        }
+        shared = {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "benchmark_rows",
+            "OPTIONS": {"MAX_ENTRIES": capacity + 1},
+        }
+        results = []
+        with (
+            override_settings(
+                CACHES={
+                    **settings.CACHES,
+                    "template_fragments": fragments,
+                    "benchmark_rows": shared,
+                }
+            ),
+            translation.override("ru"),
+        ):
+            for size in sizes:
+                result = self.measure(size)
+                self.log(result)
+                results.append(result)
+        return results
+
+    def measure(self, size):
+        tasks = self.build_tasks(size)
+        dummy = {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        with override_settings(
+            CACHES={**settings.CACHES, "template_fragments": dummy}
+        ):
+            uncached_ms = self.render(tasks)
+        caches["template_fragments"].clear()
+        cold_ms = self.render(tasks)
+        warm_ms = self.render(tasks)
+        return RowRenderResult(
+            size, round(uncached_ms, 3), round(cold_ms, 3), round(warm_ms, 3)
+        )
+
+    def render(self, tasks):
+        started = time.perf_counter()
+        render_to_string(self.template_name, {"tasks": tasks})
+        return (time.perf_counter() - started) * 1000
+
+    @staticmethod
+    def build_tasks(size):
+        now = timezone.now()
+        status = Status(pk=1, name="новый", updated_at=now)
+        users = [
+            User(
+                pk=number,
+                username=f"user{number}",
+                first_name="Имя",
+                last_name=f"Фамилия {number}",
+                updated_at=now,
+            )
+            for number in range(1, 11)
+        ]
+        return [
+            Task(
+                pk=number,
+                name=f"Задача {number}",
+                status=status,
+                author=users[number % 10],
+                executor=users[(number + 1) % 10] if number % 3 else None,
+                created_at=now,
+                updated_at=now,
+            )
+            for number in range(1, size + 1)
+        ]
+
+    def log(self, result):
+        if self.stdout is not None:
+            self.stdout.write(
+                f"{result.rows:>7} rows: "
+                f"uncached {result.uncached_ms:>10.1f} ms, "
+                f"cold {result.cold_ms:>10.1f} ms, "
+                f"warm {result.warm_ms:>10.1f} ms"
+            )
+
+
+# Дочерний процесс StartupBenchmark: argv - режим и адреса страниц.
+# Печатает JSON с временем запуска и первого и второго запроса к
+# каждой странице; Django в нем настраивается с нуля
+STARTUP_PROBE = """
+import json, os, sys, time
+
+started = time.perf_counter()
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+from django.core.wsgi import get_wsgi_application
+from django.test import Client
+
+get_wsgi_application()
+client = Client(HTTP_HOST="127.0.0.1")
+client.handler.load_middleware()
+if sys.argv[1] == "warm":
+    from task_manager.warmup import warm_up
+
+    warm_up()
+startup = time.perf_counter() - started
+
+requests = {}
+for path in sys.argv[2:]:
+    timings = []
+    for _repeat in range(2):
+        request_started = time.perf_counter()
+        response = client.get(path)
+        timings.append(time.perf_counter() - request_started)
+        if response.status_code != 200:
+            sys.exit(f"{path}: status {response.status_code}")
+    requests[path] = timings
+print(json.dumps({"startup": startup, "requests": requests}))
+"""
+
+STARTUP_PATHS = ("/", "/login/", "/users/create/")
+
+
+@dataclass
+class StartupResult:
+    mode: str
+    runs: int
+    startup_ms: float
+    first_request_ms: dict
+    second_request_ms: dict
+
+
+class StartupBenchmark:
+    """Запуск процесса и первые запросы к страницам без прогрева шаблонов
+    (cold) и с прогревом при запуске (warm).
+
+    Каждый прогон - новый процесс Python; в отчете - медианы прогонов.
+    Страницы STARTUP_PATHS открываются без входа и без запросов к базе.
+    """
+
+    modes = ("cold", "warm")
+
+    def __init__(self, runs=5, paths=STARTUP_PATHS, stdout=None):
+        self.runs = runs
+        self.paths = paths
+        self.stdout = stdout
+
+    def run(self):
+        results = []
+        for mode in self.modes:
+            samples = [self.probe(mode) for _run in range(self.runs)]
+            result = StartupResult(
+                mode=mode,
+                runs=self.runs,
+                startup_ms=_median_ms(sample["startup"] for sample in samples),
+                first_request_ms={
+                    path: _median_ms(
+                        sample["requests"][path][0] for sample in samples
+                    )
+                    for path in self.paths
+                },
+                second_request_ms={
+                    path: _median_ms(
+                        sample["requests"][path][1] for sample in samples
+                    )
+                    for path in self.paths
+                },
+            )
+            self.log(result)
+            results.append(result)
+        return results
+
+    def probe(self, mode):
+        completed = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE, mode, *self.paths],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip())
+        return json.loads(completed.stdout.splitlines()[-1])
+
+    def log(self, result):
+        if self.stdout is None:
+            return
+        self.stdout.write(f"{result.mode}: startup {result.startup_ms:.1f} ms")
+        for path in self.paths:
+            self.stdout.write(
+                f"  {path:<20} first {result.first_request_ms[path]:>7.1f} ms, "
+                f"second {result.second_request_ms[path]:>7.1f} ms"
+            )
+
+
+def _median_ms(seconds):
+    return round(statistics.median(seconds) * 1000, 3)
+
+
+# Дочерний процесс ServerBenchmark: создает схему и данные во временной
+# базе и печатает JSON с cookie сессии и id задачи
+SERVER_SETUP = """
+import json, os
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "task_manager.settings")
+import django
+
+django.setup()
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+call_command("migrate", verbosity=0)
+user = User.objects.create_user(username="benchmark", first_name="Bench")
+status = Status.objects.create(name="benchmark")
+task = Task.objects.create(name="Benchmark", status=status, author=user)
+task.labels.add(Label.objects.create(name="benchmark"))
+client = Client()
+client.force_login(user)
+print(
+    json.dumps(
+        {
+            "session": client.cookies[settings.SESSION_COOKIE_NAME].value,
+            "task": task.pk,
+        }
+    )
+)
+"""
+
+SERVER_PATHS = ("/statuses/", "/labels/", "/tasks/{task}/")
+
+# Аргументы python -m для каждого сервера
+SERVER_COMMANDS = {
+    "wsgi": [
+        "gunicorn",
+        "task_manager.wsgi",
+        "--workers={workers}",
+        "--threads={threads}",
+        "--bind=127.0.0.1:{port}",
+        "--log-level=warning",
+    ],
+    "asgi": [
+        "uvicorn",
+        "task_manager.asgi:application",
+        "--workers={workers}",
+        "--port={port}",
+        "--log-level=warning",
+        "--no-access-log",
+    ],
+}
+
+
+@dataclass
+class ServerResult:
+    server: str
+    clients: int
+    requests: int
+    errors: int
+    requests_per_second: float
+    median_ms: float
+    p95_ms: float
+
+
+class ServerBenchmark:
+    """Пропускная способность и задержка gunicorn (WSGI, потоки gthread)
+    и uvicorn (ASGI, асинхронные view) при сотнях одновременных клиентов.
+
+    Серверы запускаются отдельными процессами на временной базе SQLite
+    с общим файловым кешем, как несколько воркеров с Redis. Каждый
+    клиент - одно соединение keep-alive, которое по кругу запрашивает
+    страницы paths от имени вошедшего пользователя; клиенты - задачи
+    asyncio в этом процессе. Ответ не 200 и разрыв соединения - ошибки.
+    """
+
+    def __init__(
+        self,
+        seconds=10.0,
+        workers=2,
+        threads=8,
+        paths=SERVER_PATHS,
+        stdout=None,
+    ):
+        self.seconds = seconds
+        self.workers = workers
+        self.threads = threads
+        self.paths = paths
+        self.stdout = stdout
+
+    def run(self, servers, client_counts, directory):
+        _raise_open_files_limit(max(client_counts) + 256)
+        env = self.environment(directory)
+        setup = self.setup(env)
+        cookie = f"{settings.SESSION_COOKIE_NAME}={setup['session']}"
+        paths = [path.format(task=setup["task"]) for path in self.paths]
+        results = []
+        for server in servers:
+            process, port = self.start(server, env)
+            try:
+                # Прогрев: воркеры загружают код, шаблоны и кеш
+                asyncio.run(self.load(port, 1, paths, cookie, seconds=1.0))
+                for clients in client_counts:
+                    result = asyncio.run(
+                        self.load(port, clients, paths, cookie)
+                    )
+                    result.server = server
+                    self.log(result)
+                    results.append(result)
+            finally:
+                process.terminate()
+                process.wait(timeout=30)
+        return results
+
+    def environment(self, directory):
+        env = {
+            **os.environ,
+            "DATABASE_URL": f"sqlite:///{Path(directory) / 'db.sqlite3'}",
+            "CACHE_DIR": str(Path(directory) / "cache"),
+            "DEBUG": "",
+        }
+        # asgi.py сам включает асинхронные view, wsgi.py - нет
+        env.pop("ASYNC_VIEWS", None)
+        env.pop("REDIS_URL", None)
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+        return env
+
+    def setup(self, env):
+        completed = subprocess.run(
+            [sys.executable, "-c", SERVER_SETUP],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(completed.stderr.strip())
+        return json.loads(completed.stdout.splitlines()[-1])
+
+    def start(self, server, env, timeout=30):
+        port = _free_port()
+        arguments = [
+            argument.format(
+                workers=self.workers, threads=self.threads, port=port
+            )
+            for argument in SERVER_COMMANDS[server]
+        ]
+        process = subprocess.Popen(
+            [sys.executable, "-m", *arguments],
+            cwd=settings.BASE_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(
+                    f"{server} server exited: {process.stderr.read().strip()}"
+                )
+            try:
+                socket.create_connection(("127.0.0.1", port), 0.1).close()
+            except OSError:
+                time.sleep(0.1)
+                continue
+            return process, port
+        process.kill()
+        raise RuntimeError(f"{server} server did not start in {timeout} s")
+
+    async def load(self, port, clients, paths, cookie, seconds=None):
+        """clients соединений запрашивают paths по кругу seconds секунд"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (seconds or self.seconds)
+        latencies = []
+        errors = 0
+        requests = [
+            (
+                f"GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                f"Cookie: {cookie}\r\n\r\n"
+            ).encode()
+            for path in paths
+        ]
+
+        async def client(number):
+            nonlocal errors
+            writer = None
+            while loop.time() < deadline:
+                request = requests[number % len(requests)]
+                number += 1
+                started = time.perf_counter()
+                try:
+                    if writer is None:
+                        reader, writer = await asyncio.open_connection(
+                            "127.0.0.1", port
+                        )
+                    writer.write(request)
+                    await writer.drain()
+                    status, keep_alive = await _read_response(reader)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    keep_alive = False
+                    status = None
+                if status == 200:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                elif status is not None:
+                    errors += 1
+                if not keep_alive and writer is not None:
+                    writer.close()
+                    writer = None
+            if writer is not None:
+                writer.close()
+
+        started = loop.time()
+        await asyncio.gather(*(client(number) for number in range(clients)))
+        elapsed = loop.time() - started
+        latencies.sort()
+        return ServerResult(
+            server="",
+            clients=clients,
+            requests=len(latencies),
+            errors=errors,
+            requests_per_second=round(len(latencies) / elapsed, 1),
+            median_ms=round(statistics.median(latencies or [0.0]), 3),
+            p95_ms=round(
+                latencies[int(len(latencies) * 0.95)] if latencies else 0.0, 3
+            ),
+        )
+
+    def log(self, result):
+        if self.stdout is not None:
+            self.stdout.write(
+                f"{result.server:<5} {result.clients:>5} clients "
+                f"{result.requests_per_second:>9.1f} req/s "
+                f"median {result.median_ms:.2f} ms, "
+                f"p95 {result.p95_ms:.2f} ms, {result.errors} error(s)"
+            )
+
+
+async def _read_response(reader):
+    """Код ответа HTTP/1.1 и можно ли продолжать соединение; тело
+    читается и отбрасывается"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    status_line, *lines = head.decode("latin-1").split("\r\n")
+    status = int(status_line.split()[1])
+    headers = {}
+    for line in lines:
+        name, _sep, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip().lower()
+    if headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readuntil(b"\r\n")).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readuntil(b"\r\n")
+    else:
+        await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers.get("connection") != "close"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _raise_open_files_limit(needed):
+    # Каждый клиент - сокет; мягкий предел часто 1024
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        limit = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
@@ -0,0 +1,190 @@
+"""Двухуровневый кеш: LRU в памяти процесса перед общим кешем.
+
+Общий кеш (CACHES["shared"]) видят все процессы, но каждое обращение к
+нему - поход по сети или на диск. Частые ключи оседают в маленьком LRU
+процесса на LOCAL_TIMEOUT секунд: записи и удаления через этот кеш
+обновляют оба уровня, а изменения из других процессов становятся видны
+не позже чем через LOCAL_TIMEOUT. Поэтому счетчики версий
+(tasks.choices.CacheVersion) читаются прямо из общего кеша.
+
+get_or_set с конечным сроком защищает от "лавины": значение хранится
+вместе со сроком и временем вычисления, и незадолго до истечения
+отдельные запросы пересчитывают его заранее с вероятностью, растущей
+к концу срока (probabilistic early expiration, XFetch). Поэтому к
+истечению срока ключ уже обновлен, и все процессы разом не бросаются
+считать одно и то же. incr для таких ключей не поддерживается.
+"""
+
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+
+from task_manager.metrics import cache_tier_requests
+
+_MISSING = object()
+
+
+@dataclass
+class Entry:
+    """Значение get_or_set со сроком и временем вычисления (секунды)"""
+
+    value: object
+    expires_at: float
+    delta: float
+
+    def should_refresh(self, beta):
+        # -log(random()) > 0: чем дольше вычисление и ближе срок,
+        # тем вероятнее досрочный пересчет
+        jitter = -self.delta * beta * math.log(1 - random.random())
+        return time.time() + jitter >= self.expires_at
+
+
+def _record(tier, value):
+    result = "miss" if value is _MISSING else "hit"
+    cache_tier_requests.labels(tier, result).inc()
+
+
+def _unwrap(value):
+    return value.value if isinstance(value, Entry) else value
+
+
+class TieredCache(BaseCache):
+    """LOCATION - имя общего кеша в CACHES.
+
+    OPTIONS: LOCAL_MAX_ENTRIES (1000), LOCAL_TIMEOUT (5 секунд),
+    EARLY_EXPIRY_BETA (1.0; больше - пересчет начинается раньше).
+    """
+
+    def __init__(self, server, params):
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.shared_alias = server
+        self.local_max_entries = int(options.get("LOCAL_MAX_ENTRIES", 1000))
+        self.local_timeout = float(options.get("LOCAL_TIMEOUT", 5))
+        self.early_expiry_beta = float(options.get("EARLY_EXPIRY_BETA", 1.0))
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @cached_property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def _version(self, version):
+        return self.version if version is None else version
+
+    # Локальный уровень: {ключ: (значение, срок по time.monotonic())}
+
+    def _local_get(self, key):
+        with self._lock:
+            item = self._local.get(key)
+            if item is None:
+                return _MISSING
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        ttl = self.local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            ttl = min(ttl, timeout)
+        if ttl <= 0:
+            self._local_delete(key)
+            return
+        with self._lock:
+            self._local[key] = (value, time.monotonic() + ttl)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _local_delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def _get_raw(self, key, version):
+        """Значение как оно хранится (возможно, Entry) или _MISSING"""
+        local_key = self.make_and_validate_key(key, version)
+        value = self._local_get(local_key)
+        _record("local", value)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(key, _MISSING, version)
+        _record("shared", value)
+        if value is not _MISSING:
+            self._local_set(local_key, value)
+        return value
+
+    def get(self, key, default=None, version=None):
+        value = self._get_raw(key, self._version(version))
+        return default if value is _MISSING else _unwrap(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        self.shared.set(key, value, timeout, version)
+        self._local_set(
+            self.make_and_validate_key(key, version), value, timeout
+        )
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self._local_set(
+                self.make_and_validate_key(key, version), value, timeout
+            )
+        return added
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        if timeout is None:
+            return super().get_or_set(key, default, None, version)
+
+        value = self._get_raw(key, version)
+        if value is not _MISSING and not (
+            isinstance(value, Entry)
+            and value.should_refresh(self.early_expiry_beta)
+        ):
+            return _unwrap(value)
+        started = time.monotonic()
+        value = default() if callable(default) else default
+        delta = time.monotonic() - started
+        entry = Entry(value, time.time() + timeout, delta)
+        self.set(key, entry, timeout, version)
+        return value
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.delete(key, version)
+
+    def incr(self, key, delta=1, version=None):
+        version = self._version(version)
+        self._local_delete(self.make_and_validate_key(key, version))
+        return self.shared.incr(key, delta, version)
+
+    def has_key(self, key, version=None):
+        return self._get_raw(key, self._version(version)) is not _MISSING
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
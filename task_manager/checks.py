@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    """Общий кеш в памяти процесса у каждого воркера свой: версии
+    списков и вариантов выбора, выход из системы и смена пароля в одном
+    процессе не видны в других"""
+    if settings.DEBUG or not settings.SHARED_CACHE_IS_LOCAL:
+        return []
+    return [
+        Warning(
+            "The shared cache is kept in the memory of each process.",
+            hint=(
+                "Set REDIS_URL or CACHE_DIR when running more than one "
+                "worker process."
+            ),
+            id="task_manager.W001",
+        )
+    ]
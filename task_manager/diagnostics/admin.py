@@ -0,0 +1,35 @@
+from django.contrib import admin
+from django.template.defaultfilters import truncatechars
+from django.utils.translation import gettext_lazy as _
+
+from .models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    list_display = ["captured_at", "duration_ms", "view", "call_site", "query"]
+    list_filter = ["view"]
+    search_fields = ["sql", "call_site", "path"]
+    date_hierarchy = "captured_at"
+    fields = [
+        "captured_at",
+        "duration_ms",
+        "view",
+        "path",
+        "call_site",
+        "sql",
+        "params",
+        "plan",
+    ]
+    readonly_fields = fields
+
+    @admin.display(description=_("SQL"))
+    def query(self, obj):
+        return truncatechars(obj.sql, 120)
+
+    # Записи появляются только из журнала; удалять старые можно
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "captured_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Captured at",
+                    ),
+                ),
+                ("duration_ms", models.FloatField(verbose_name="Duration, ms")),
+                ("sql", models.TextField(verbose_name="SQL")),
+                (
+                    "params",
+                    models.TextField(blank=True, verbose_name="Parameters"),
+                ),
+                ("plan", models.TextField(blank=True, verbose_name="Plan")),
+                (
+                    "view",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="View"
+                    ),
+                ),
+                (
+                    "path",
+                    models.CharField(
+                        blank=True, max_length=2000, verbose_name="Path"
+                    ),
+                ),
+                (
+                    "call_site",
+                    models.CharField(
+                        blank=True, max_length=300, verbose_name="Call site"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Slow query",
+                "verbose_name_plural": "Slow queries",
+                "db_table": "slow_queries",
+                "ordering": ["-captured_at", "-id"],
+            },
+        ),
+    ]
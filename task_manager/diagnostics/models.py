@@ -0,0 +1,38 @@
+from django.db.models import (
+    CharField,
+    DateTimeField,
+    FloatField,
+    Model,
+    TextField,
+)
+from django.utils.translation import gettext_lazy as _
+
+
+class SlowQuery(Model):
+    """Запрос к базе дольше порога SLOW_QUERY_THRESHOLD_MS.
+
+    Таблица - кольцевой буфер: хранятся только последние
+    SLOW_QUERY_LOG_SIZE записей.
+    """
+
+    captured_at = DateTimeField(
+        auto_now_add=True, db_index=True, verbose_name=_("Captured at")
+    )
+    duration_ms = FloatField(verbose_name=_("Duration, ms"))
+    sql = TextField(verbose_name=_("SQL"))
+    params = TextField(blank=True, verbose_name=_("Parameters"))
+    plan = TextField(blank=True, verbose_name=_("Plan"))
+    view = CharField(max_length=200, blank=True, verbose_name=_("View"))
+    path = CharField(max_length=2000, blank=True, verbose_name=_("Path"))
+    call_site = CharField(
+        max_length=300, blank=True, verbose_name=_("Call site")
+    )
+
+    class Meta:
+        verbose_name = _("Slow query")
+        verbose_name_plural = _("Slow queries")
+        db_table = "slow_queries"
+        ordering = ["-captured_at", "-id"]
+
+    def __str__(self):
+        return f"{self.duration_ms:.0f} ms {self.call_site}"
@@ -0,0 +1,109 @@
+"""Журнал медленных запросов к базе с планом выполнения."""
+
+import re
+import sys
+from dataclasses import dataclass
+
+from django.db import DatabaseError, NotSupportedError, transaction
+
+from task_manager.instrumentation import ExecuteWrapper, call_site
+
+from .models import SlowQuery
+
+# EXPLAIN ANALYZE выполняет запрос еще раз - только для чтения. WITH
+# не подходит: в CTE может быть INSERT, UPDATE или DELETE
+READ_ONLY_SQL = re.compile(r"^\s*SELECT\b", re.IGNORECASE)
+# SELECT ... FOR UPDATE/SHARE повторно взял бы блокировки строк
+LOCKING_SQL = re.compile(
+    r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.IGNORECASE
+)
+
+
+def is_read_only(sql):
+    return bool(READ_ONLY_SQL.match(sql)) and not LOCKING_SQL.search(sql)
+
+
+@dataclass
+class Capture:
+    sql: str
+    params: str
+    duration_ms: float
+    plan: str
+    call_site: str
+
+
+class SlowQueryRecorder(ExecuteWrapper):
+    """Собирает запросы дольше threshold_ms и сразу получает их план:
+    позже данные и состояние транзакции могут измениться."""
+
+    def __init__(self, threshold_ms, analyze=True):
+        self.threshold_ms = threshold_ms
+        self.analyze = analyze
+        self.captures = []
+        self.explaining = False
+
+    def record(self, sql, params, many, context, seconds):
+        duration_ms = seconds * 1000
+        if self.explaining or many or duration_ms < self.threshold_ms:
+            return
+        self.captures.append(
+            Capture(
+                sql=sql,
+                params=repr(params),
+                duration_ms=duration_ms,
+                plan=self.explain(context["connection"], sql, params),
+                call_site=call_site(sys._getframe()),
+            )
+        )
+
+    def explain(self, connection, sql, params):
+        options = {}
+        if (
+            self.analyze
+            and connection.vendor == "postgresql"
+            and is_read_only(sql)
+        ):
+            options = {"analyze": True, "buffers": True}
+        try:
+            prefix = connection.ops.explain_query_prefix(**options)
+        except NotSupportedError:
+            return ""
+        self.explaining = True
+        try:
+            # Точка сохранения: ошибка EXPLAIN не ломает транзакцию view,
+            # а ее откат отменяет все, что сделал повторный запуск
+            with (
+                transaction.atomic(using=connection.alias),
+                connection.cursor() as cursor,
+            ):
+                cursor.execute(f"{prefix} {sql}", params)
+                # План - в последнем столбце: у PostgreSQL он единственный,
+                # у SQLite это detail
+                plan = "\n".join(str(row[-1]) for row in cursor.fetchall())
+                transaction.set_rollback(True, using=connection.alias)
+                return plan
+        except DatabaseError as error:
+            return f"EXPLAIN failed: {error}"
+        finally:
+            self.explaining = False
+
+
+def save_captures(captures, view, path, keep):
+    """Сохраняет найденные запросы и удаляет все, кроме последних keep"""
+    SlowQuery.objects.bulk_create(
+        SlowQuery(
+            sql=capture.sql,
+            params=capture.params,
+            duration_ms=capture.duration_ms,
+            plan=capture.plan,
+            call_site=capture.call_site[:300],
+            view=view[:200],
+            path=path[:2000],
+        )
+        for capture in captures
+    )
+    oldest_kept = SlowQuery.objects.order_by("-id").values_list(
+        "id", flat=True
+    )[keep - 1 : keep]
+    if oldest_kept:
+        SlowQuery.objects.filter(id__lt=oldest_kept[0]).delete()
@@ -0,0 +1,126 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.diagnostics.models import SlowQuery
+from task_manager.diagnostics.recorder import (
+    Capture,
+    SlowQueryRecorder,
+    is_read_only,
+    save_captures,
+)
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class SlowQueryRecorderTest(TestCase):
+    """Тесты сбора медленных запросов"""
+
+    def test_captures_query_with_plan_and_call_site(self):
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        with recorder.install():
+            list(Status.objects.filter(name="новый"))
+        capture = recorder.captures[0]
+        self.assertIn('FROM "statuses"', capture.sql)
+        self.assertEqual(capture.params, "('новый',)")
+        self.assertIn("statuses", capture.plan)
+        self.assertIn(
+            "task_manager/diagnostics/tests/test_slow_queries.py",
+            capture.call_site,
+        )
+
+    def test_threshold(self):
+        recorder = SlowQueryRecorder(threshold_ms=60_000)
+        with recorder.install():
+            Status.objects.count()
+        self.assertEqual(recorder.captures, [])
+
+    def test_explain_error_does_not_break_transaction(self):
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        plan = recorder.explain(connection, "SELECT * FROM no_such_table", [])
+        self.assertIn("EXPLAIN failed", plan)
+        self.assertEqual(Status.objects.count(), 0)
+
+    def test_explain_rollback_keeps_view_changes(self):
+        # Откатывается только точка сохранения EXPLAIN
+        recorder = SlowQueryRecorder(threshold_ms=0)
+        with recorder.install():
+            Status.objects.create(name="новый")
+        self.assertEqual(Status.objects.count(), 1)
+        self.assertTrue(recorder.captures)
+
+    def test_only_plain_select_is_analyzed(self):
+        self.assertTrue(is_read_only('SELECT "id" FROM "statuses"'))
+        for sql in (
+            (
+                'WITH moved AS (DELETE FROM "statuses" RETURNING *) '
+                "SELECT * FROM moved"
+            ),
+            'SELECT "id" FROM "tasks" WHERE "id" = 1 FOR UPDATE',
+            'SELECT "id" FROM "tasks" FOR NO KEY UPDATE SKIP LOCKED',
+            'UPDATE "tasks" SET "name" = 1',
+        ):
+            with self.subTest(sql=sql):
+                self.assertFalse(is_read_only(sql))
+
+    def test_ring_buffer(self):
+        captures = [
+            Capture(f"SELECT {number}", "()", 1.0, "", "site")
+            for number in range(5)
+        ]
+        save_captures(captures[:3], "view", "/", keep=4)
+        save_captures(captures[3:], "view", "/", keep=4)
+        self.assertEqual(
+            [query.sql for query in SlowQuery.objects.order_by("id")],
+            ["SELECT 1", "SELECT 2", "SELECT 3", "SELECT 4"],
+        )
+
+
+class SlowQueryMiddlewareTest(TestCase):
+    """Тесты журнала медленных запросов и его страниц в админке"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(
+            username="admin", password=TEST_PASSWORD
+        )
+        self.client.force_login(self.user)
+
+    def test_disabled_by_default(self):
+        self.client.get(reverse("statuses:statuses"))
+        self.assertFalse(SlowQuery.objects.exists())
+
+    @override_settings(
+        SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG_SIZE=50
+    )
+    def test_log(self):
+        self.client.get(reverse("tasks:tasks"), {"self_tasks": "on"})
+        query = SlowQuery.objects.filter(sql__contains='FROM "tasks"').first()
+        self.assertEqual(query.view, "tasks:tasks")
+        self.assertEqual(query.path, "/tasks/?self_tasks=on")
+        self.assertIn("tasks", query.plan)
+        self.assertTrue(query.call_site)
+
+    @override_settings(
+        SLOW_QUERY_LOG=True, SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_LOG_SIZE=3
+    )
+    def test_log_size(self):
+        self.client.get(reverse("tasks:tasks"))
+        self.client.get(reverse("statuses:statuses"))
+        self.assertEqual(SlowQuery.objects.count(), 3)
+
+    def test_admin(self):
+        query = SlowQuery.objects.create(
+            sql="SELECT 1", duration_ms=250.0, plan="SCAN tasks"
+        )
+        response = self.client.get(
+            reverse("admin:diagnostics_slowquery_changelist")
+        )
+        self.assertContains(response, "SELECT 1")
+        response = self.client.get(
+            reverse("admin:diagnostics_slowquery_change", args=[query.pk])
+        )
+        self.assertContains(response, "SCAN tasks")
+        response = self.client.get(reverse("admin:diagnostics_slowquery_add"))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,29 @@
+from django.db.models import F, PositiveIntegerField
+
+
+class CounterField(PositiveIntegerField):
+    """Денормализованный счетчик.
+
+    Меняется только запросами UPDATE ... SET n = n + delta (см.
+    tasks/counters.py). Обычное сохранение модели записывает в колонку ее
+    же значение: форма редактирования не затрет счетчик числом, которое
+    прочитала до чужого изменения.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("default", 0)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if kwargs.get("default") == 0:
+            del kwargs["default"]
+        if kwargs.get("editable") is False:
+            del kwargs["editable"]
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        if add:
+            return super().pre_save(model_instance, add)
+        return F(self.attname)
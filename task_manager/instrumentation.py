@@ -0,0 +1,180 @@
+"""Замеры обработки запроса: SQL, view и отрисовка шаблона."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template.base import Node
+from django.views import View
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+# Middleware только замеряет: запросы из его кадров - это запросы
+# middleware Django (сессии, сообщения), а не кода проекта. Кадры
+# _execute этого модуля - обертка соединения
+SKIPPED_FILES = {
+    PROJECT_DIR / "middleware.py",
+    PROJECT_DIR / "instrumentation.py",
+}
+
+# Обертки, подключенные через ExecuteWrapper.install(). Хранятся в
+# контексте, а не в соединении: под ASGI запросы async ORM выполняются
+# в потоках sync_to_async со своими соединениями, а контекст копируется
+# в эти потоки
+_installed = ContextVar("execute_wrappers", default=())
+
+
+def _execute(execute, sql, params, many, context):
+    """Постоянная обертка каждого соединения: передает запрос оберткам
+    из текущего контекста"""
+    for wrapper in reversed(_installed.get()):
+        execute = partial(wrapper, execute)
+    return execute(sql, params, many, context)
+
+
+def _add_execute_hook(connection, **kwargs):
+    # В начало списка: connection.execute_wrapper() снимает обертку
+    # с конца, и вставка внутри его блока сломала бы порядок
+    if _execute not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _execute)
+
+
+connection_created.connect(_add_execute_hook)
+
+
+class ExecuteWrapper:
+    """Основа оберток connection.execute_wrapper.
+
+    Замеряет каждый успешный запрос и передает его в record().
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        self.record(sql, params, many, context, time.perf_counter() - started)
+        return result
+
+    def record(self, sql, params, many, context, seconds):
+        raise NotImplementedError
+
+    @contextmanager
+    def install(self):
+        """Подключает обертку ко всем базам на время блока, в том числе
+        к соединениям потоков, в которые перейдет текущий контекст"""
+        # Соединения, открытые до импорта модуля, сигнал не застал
+        for connection in connections.all(initialized_only=True):
+            _add_execute_hook(connection)
+        token = _installed.set((*_installed.get(), self))
+        try:
+            yield self
+        finally:
+            _installed.reset(token)
+
+
+class QueryTimer(ExecuteWrapper):
+    """Считает запросы и их суммарное время"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def record(self, sql, params, many, context, seconds):
+        self.count += 1
+        self.seconds += seconds
+
+
+def call_site(frame):
+    """Место вызова запроса: шаблон и строка, файл проекта и строка
+    или метод view, если запрос выполнил унаследованный код Django.
+
+    frame - кадр, с которого начинается поиск вверх по стеку; кадры
+    оберток ExecuteWrapper пропускаются.
+    """
+    while frame is not None:
+        obj = frame.f_locals.get("self")
+        # type(), а не isinstance: isinstance вычислил бы ленивый объект
+        # вроде request.user и выполнил бы еще один запрос
+        cls = type(obj)
+        if issubclass(cls, Node) and obj.origin is not None:
+            template = obj.origin.template_name or obj.origin.name
+            line = obj.token.lineno if obj.token else "?"
+            return f"{template}:{line}"
+        path = Path(frame.f_code.co_filename)
+        if (
+            path.is_relative_to(PROJECT_DIR)
+            and path not in SKIPPED_FILES
+            and not issubclass(cls, ExecuteWrapper)
+        ):
+            relative = path.relative_to(PROJECT_DIR.parent)
+            return f"{relative}:{frame.f_lineno} ({frame.f_code.co_name})"
+        if issubclass(cls, View):
+            return f"{cls.__qualname__}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return "<unknown>"
+
+
+@dataclass
+class RequestTiming:
+    """Отметки времени одного запроса (perf_counter, секунды)"""
+
+    started: float
+    queries: QueryTimer
+    view_started: float | None = None
+    view_finished: float | None = None
+    render_started: float | None = None
+    render_finished: float | None = None
+    finished: float | None = None
+
+    @property
+    def total_ms(self):
+        return _ms(self.started, self.finished)
+
+    @property
+    def db_ms(self):
+        return self.queries.seconds * 1000
+
+    @property
+    def view_ms(self):
+        return _ms(self.view_started, self.view_finished or self.finished)
+
+    @property
+    def template_ms(self):
+        return _ms(self.render_started, self.render_finished)
+
+    @property
+    def middleware_ms(self):
+        """Все, что не view и не шаблон: middleware, маршрутизация"""
+        return max(0.0, self.total_ms - self.view_ms - self.template_ms)
+
+    def server_timing(self):
+        """Значение заголовка Server-Timing"""
+        return ", ".join(
+            [
+                f'db;dur={self.db_ms:.1f};desc="{self.queries.count} queries"',
+                f"view;dur={self.view_ms:.1f}",
+                f"tpl;dur={self.template_ms:.1f}",
+                f"mw;dur={self.middleware_ms:.1f}",
+                f"total;dur={self.total_ms:.1f}",
+            ]
+        )
+
+    def as_dict(self):
+        return {
+            "queries": self.queries.count,
+            "db_ms": round(self.db_ms, 1),
+            "view_ms": round(self.view_ms, 1),
+            "template_ms": round(self.template_ms, 1),
+            "middleware_ms": round(self.middleware_ms, 1),
+            "total_ms": round(self.total_ms, 1),
+        }
+
+
+def _ms(started, finished):
+    if started is None or finished is None:
+        return 0.0
+    return (finished - started) * 1000
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:52
+
+from django.db import migrations
+
+import task_manager.fields
+from task_manager.operations import AddColumn
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labels", "0002_label_name_prefix_index"),
+    ]
+
+    # Без перестройки таблицы в SQLite: сохраняются индексы из 0002
+    operations = [
+        AddColumn(
+            model_name="label",
+            name="tasks_count",
+            field=task_manager.fields.CounterField(verbose_name="Tasks"),
+        ),
+    ]
@@ -1,11 +1,15 @@
 from django.db.models import CharField, DateTimeField, Model
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.fields import CounterField
+
 
 class Label(Model):
     name = CharField(max_length=100, unique=True, verbose_name=_("Name"))
     created_at = DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    # Число задач, см. tasks/counters.py
+    tasks_count = CounterField(verbose_name=_("Tasks"))
 
     class Meta:
         verbose_name = _("Label")
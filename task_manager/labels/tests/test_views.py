@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from task_manager.labels.models import Label
@@ -165,3 +165,13 @@ class LabelDeleteProtectionTest(TestCase):
 
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Label.objects.count(), label_count_before - 1)
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncLabelsViewsTest(LabelsViewsTest):
+    """Те же сценарии с асинхронными view"""
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncLabelDeleteProtectionTest(LabelDeleteProtectionTest):
+    """Те же сценарии с асинхронными view"""
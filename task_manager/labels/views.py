@@ -6,6 +6,14 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.async_views import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+    AsyncUpdateView,
+)
+
 from .forms import LabelForm
 from .models import Label
 
@@ -42,9 +50,52 @@ class LabelDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
     def post(self, request, *args, **kwargs):
         """Проверяем, используется ли метка перед удалением"""
         self.object = self.get_object()
-        if self.object.tasks.exists():
+        # Счетчик прочитан вместе с меткой. Ноль перепроверяется по
+        # таблице связей: разошедшийся счетчик не должен привести к
+        # удалению метки вместе со связями
+        if self.object.tasks_count or self.object.tasks.exists():
             messages.error(
                 request, _("Cannot delete label because it is in use")
             )
             return redirect("labels:labels")
         return super().post(request, *args, **kwargs)
+
+
+class AsyncLabelsListView(AsyncLoginRequiredMixin, AsyncListView):
+    model = Label
+    template_name = "labels/index.html"
+    context_object_name = "labels"
+    ordering = ["name"]
+
+
+class AsyncLabelCreateView(AsyncLoginRequiredMixin, AsyncCreateView):
+    model = Label
+    form_class = LabelForm
+    template_name = "labels/create.html"
+    success_url = reverse_lazy("labels:labels")
+    success_message = _("Label successfully created")
+
+
+class AsyncLabelUpdateView(AsyncLoginRequiredMixin, AsyncUpdateView):
+    model = Label
+    form_class = LabelForm
+    template_name = "labels/update.html"
+    success_url = reverse_lazy("labels:labels")
+    success_message = _("Label successfully updated")
+
+
+class AsyncLabelDeleteView(AsyncLoginRequiredMixin, AsyncDeleteView):
+    model = Label
+    template_name = "labels/delete.html"
+    success_url = reverse_lazy("labels:labels")
+    success_message = _("Label successfully deleted")
+
+    async def post(self, request, *args, **kwargs):
+        """Проверяем, используется ли метка перед удалением"""
+        self.object = await self.aget_object()
+        if self.object.tasks_count or await self.object.tasks.aexists():
+            messages.error(
+                request, _("Cannot delete label because it is in use")
+            )
+            return redirect("labels:labels")
+        return await self.adelete_object()
@@ -0,0 +1,85 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from task_manager.benchmarks import (
+    DEFAULT_SIZES,
+    BenchmarkRunner,
+    build_report,
+    compare_reports,
+    load_report,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the task pages on generated data of several sizes in a "
+        "throwaway test database and writes a JSON report"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default=",".join(str(size) for size in DEFAULT_SIZES),
+            help="Comma-separated task counts (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timed requests per case (default: %(default)s)",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output",
+            default="benchmark.json",
+            help="Report path (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--compare", help="Previous report to compare the results with"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be a list of integers") from None
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be positive")
+        base = load_report(options["compare"]) if options["compare"] else None
+
+        runner = BenchmarkRunner(
+            options["repeat"], options["seed"], stdout=self.stdout
+        )
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            results = runner.run(sizes)
+            report = build_report(results, options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        with open(options["output"], "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(f"Report is written to {options['output']}")
+        )
+
+        if base is not None:
+            for size, name, before, after, change in compare_reports(
+                base, report
+            ):
+                line = (
+                    f"{size:>9} {name:<36} {before:>10.3f} -> "
+                    f"{after:>10.3f} ms ({change:+.1f}%)"
+                )
+                style = self.style.ERROR if change > 10 else self.style.SUCCESS
+                self.stdout.write(style(line))
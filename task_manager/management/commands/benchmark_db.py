@@ -0,0 +1,71 @@
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from task_manager.benchmarks import ConcurrencyBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares database throughput under concurrent reads and writes "
+        "with and without the performance settings: SQLite pragmas or the "
+        "PostgreSQL connection pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            default="1,4,16",
+            help="Comma-separated thread counts (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=3.0,
+            help="Duration of each run (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--write-ratio",
+            type=float,
+            default=0.2,
+            help="Share of write operations (default: %(default)s)",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            threads = [int(count) for count in options["threads"].split(",")]
+        except ValueError:
+            raise CommandError("--threads must be a list of integers") from None
+        if min(threads) < 1 or options["seconds"] <= 0:
+            raise CommandError("--threads and --seconds must be positive")
+        if not 0 <= options["write_ratio"] <= 1:
+            raise CommandError("--write-ratio must be between 0 and 1")
+
+        benchmark = ConcurrencyBenchmark(
+            options["seconds"],
+            options["write_ratio"],
+            options["seed"],
+            stdout=self.stdout,
+        )
+        if connection.vendor == "sqlite":
+            # Файлы баз профилей во временном каталоге
+            with tempfile.TemporaryDirectory() as directory:
+                benchmark.run(threads, directory)
+            return
+
+        # PostgreSQL: профили работают с одной тестовой базой
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            benchmark.run(threads)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
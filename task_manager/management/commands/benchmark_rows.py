@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import DEFAULT_ROW_COUNTS, RowRenderBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Times rendering of the task table rows without the row cache and "
+        "with a cold and a warm one"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default=",".join(str(size) for size in DEFAULT_ROW_COUNTS),
+            help="Comma-separated row counts (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be a list of integers") from None
+        if sizes[0] < 1:
+            raise CommandError("--sizes must be positive")
+
+        RowRenderBenchmark(stdout=self.stdout).run(sizes)
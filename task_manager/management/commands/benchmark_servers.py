@@ -0,0 +1,79 @@
+import tempfile
+from importlib.util import find_spec
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import SERVER_COMMANDS, ServerBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares gunicorn (WSGI, threads) and uvicorn (ASGI, async views) "
+        "throughput and latency under many concurrent clients"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--servers",
+            default=",".join(SERVER_COMMANDS),
+            help="Comma-separated servers (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--clients",
+            default="100,250,500,1000",
+            help="Comma-separated concurrent client counts "
+            "(default: %(default)s)",
+        )
+        parser.add_argument(
+            "--seconds",
+            type=float,
+            default=10.0,
+            help="Duration of each run (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=2,
+            help="Worker processes per server (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Threads per gunicorn worker (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        servers = options["servers"].split(",")
+        for server in servers:
+            if server not in SERVER_COMMANDS:
+                raise CommandError(f"Unknown server: {server}")
+            module = SERVER_COMMANDS[server][0]
+            if find_spec(module) is None:
+                raise CommandError(f"{module} is not installed")
+        try:
+            clients = [int(count) for count in options["clients"].split(",")]
+        except ValueError:
+            raise CommandError("--clients must be a list of integers") from None
+        if (
+            min(clients) < 1
+            or options["seconds"] <= 0
+            or options["workers"] < 1
+            or options["threads"] < 1
+        ):
+            raise CommandError(
+                "--clients, --seconds, --workers and --threads must be positive"
+            )
+
+        benchmark = ServerBenchmark(
+            options["seconds"],
+            options["workers"],
+            options["threads"],
+            stdout=self.stdout,
+        )
+        # База и файловый кеш серверов - во временном каталоге
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                benchmark.run(servers, clients, directory)
+            except RuntimeError as error:
+                raise CommandError(error) from None
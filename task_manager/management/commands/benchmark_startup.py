@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.benchmarks import StartupBenchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Times process startup and the first requests to several pages "
+        "with and without parsing the templates at startup"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Processes started per mode (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        if options["runs"] < 1:
+            raise CommandError("--runs must be positive")
+        StartupBenchmark(options["runs"], stdout=self.stdout).run()
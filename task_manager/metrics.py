@@ -0,0 +1,123 @@
+"""Метрики приложения в формате Prometheus.
+
+Значения хранятся в памяти процесса. Под gunicorn с несколькими
+воркерами задайте PROMETHEUS_MULTIPROC_DIR - пустой каталог, общий для
+воркеров: каждый процесс пишет свои значения в файлы этого каталога
+без блокировок между процессами, а /metrics складывает их при чтении
+(см. gunicorn.conf.py). Переменная должна быть задана до запуска
+процесса: prometheus_client выбирает хранилище при импорте.
+"""
+
+import os
+
+from django.db import connection
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Имя маршрута для запросов, которые не дошли до view (404 и т. п.)
+UNRESOLVED = "<unresolved>"
+
+request_latency = Histogram(
+    "task_manager_request_duration_seconds",
+    "Request processing time by URL name",
+    ["view"],
+)
+responses = Counter(
+    "task_manager_responses",
+    "Responses by URL name and status code",
+    ["view", "status"],
+)
+db_queries = Counter(
+    "task_manager_db_queries",
+    "SQL queries executed while handling requests, by URL name",
+    ["view"],
+)
+db_seconds = Counter(
+    "task_manager_db_duration_seconds",
+    "Time spent in SQL queries while handling requests, by URL name",
+    ["view"],
+)
+cache_requests = Counter(
+    "task_manager_cache_requests",
+    "Cache lookups by cache name and result (hit or miss)",
+    ["cache", "result"],
+)
+cache_tier_requests = Counter(
+    "task_manager_cache_tier_requests",
+    "Lookups in the two-tier cache by tier (local or shared) and result",
+    ["tier", "result"],
+)
+
+
+def record_cache(name, hit):
+    cache_requests.labels(name, "hit" if hit else "miss").inc()
+
+
+class RowCountCollector:
+    """Число строк основных таблиц, считается при каждом чтении метрик.
+
+    На PostgreSQL берется оценка планировщика из pg_class: точный
+    COUNT(*) по миллиону задач на каждый опрос Prometheus слишком дорог.
+    """
+
+    def collect(self):
+        from task_manager.labels.models import Label
+        from task_manager.statuses.models import Status
+        from task_manager.tasks.models import Task
+        from task_manager.users.models import User
+
+        models = (Task, Label, Status, User)
+        estimates = self.estimates([model._meta.db_table for model in models])
+        rows = GaugeMetricFamily(
+            "task_manager_rows", "Rows in the main tables", labels=["table"]
+        )
+        for model in models:
+            table = model._meta.db_table
+            count = estimates.get(table)
+            if count is None:
+                count = model.objects.count()
+            rows.add_metric([table], count)
+        yield rows
+
+    def estimates(self, tables):
+        if connection.vendor != "postgresql":
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relname, reltuples FROM pg_class "
+                "WHERE relkind = 'r' AND relname = ANY(%s)",
+                [tables],
+            )
+            # reltuples < 0: таблицу еще не анализировали
+            return {table: int(count) for table, count in cursor if count >= 0}
+
+
+def build_registry():
+    """Реестр для /metrics: значения всех процессов и число строк"""
+    registry = CollectorRegistry()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_ProcessMetrics())
+    registry.register(RowCountCollector())
+    return registry
+
+
+class _ProcessMetrics:
+    """Метрики из глобального реестра текущего процесса"""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def render_metrics():
+    """(текст в формате Prometheus, content type)"""
+    return generate_latest(build_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,308 @@
+import json
+import logging
+import time
+from types import MethodType
+
+import rollbar
+from asgiref.sync import (
+    iscoroutinefunction,
+    markcoroutinefunction,
+    sync_to_async,
+)
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import Http404
+from rollbar.contrib.django.middleware import (
+    RollbarNotifierMiddleware,
+    _apply_sensitive_post_params,
+    _should_ignore_404,
+)
+from rollbar.lib.session import reset_current_session, set_current_session
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from task_manager import metrics
+from task_manager.diagnostics.recorder import (
+    SlowQueryRecorder,
+    save_captures,
+)
+from task_manager.instrumentation import QueryTimer, RequestTiming
+
+logger = logging.getLogger("task_manager.timing")
+
+
+class AsyncCapableMiddleware:
+    """Основа middleware, которые под ASGI работают в цикле событий.
+
+    Синхронный middleware заставил бы Django выполнять под ASGI всю
+    внутреннюю часть цепочки, вместе с асинхронными view, в потоке.
+    Подклассы реализуют __call__ для WSGI и __acall__ для ASGI, как
+    MiddlewareMixin; режим Django выбирает по get_response. Хуки из
+    loop_hooks не делают ввода-вывода и под ASGI вызываются прямо в
+    цикле событий, а не через sync_to_async.
+    """
+
+    sync_capable = True
+    async_capable = True
+    loop_hooks = ()
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            for name in self.loop_hooks:
+                setattr(self, name, _in_loop(getattr(self, name)))
+
+
+def _in_loop(method):
+    # Связанный метод: Django берет имя класса из __self__ хука
+    async def hook(self, *args):
+        return method(*args)
+
+    return MethodType(hook, method.__self__)
+
+
+class RequestTimingMiddleware(AsyncCapableMiddleware):
+    """Заголовок Server-Timing и журнал медленных запросов.
+
+    Включается настройкой REQUEST_TIMING; без нее Django исключает
+    middleware из цепочки (MiddlewareNotUsed), и накладных расходов нет.
+    Должен стоять первым в MIDDLEWARE, чтобы total учитывал остальные
+    middleware. Время шаблона видно для TemplateResponse (все
+    class-based view); render() в функциях входит во время view.
+    """
+
+    loop_hooks = ("process_view", "process_template_response")
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+        self.slow_ms = settings.REQUEST_TIMING_SLOW_MS
+        self.slow_queries = settings.REQUEST_TIMING_SLOW_QUERIES
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timing = request.timing = RequestTiming(
+            time.perf_counter(), QueryTimer()
+        )
+        with timing.queries.install():
+            response = self.get_response(request)
+        return self.finish(request, response, timing)
+
+    async def __acall__(self, request):
+        timing = request.timing = RequestTiming(
+            time.perf_counter(), QueryTimer()
+        )
+        with timing.queries.install():
+            response = await self.get_response(request)
+        return self.finish(request, response, timing)
+
+    def finish(self, request, response, timing):
+        timing.finished = time.perf_counter()
+        response["Server-Timing"] = timing.server_timing()
+        if self.is_slow(timing):
+            logger.warning(
+                "Slow request %s",
+                json.dumps(
+                    {
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "view": getattr(request, "timing_view", None),
+                        **timing.as_dict(),
+                    }
+                ),
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view = getattr(view_func, "view_class", view_func)
+        request.timing_view = f"{view.__module__}.{view.__qualname__}"
+        request.timing.view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Отрисовка TemplateResponse начинается сразу после этого вызова
+        timing = request.timing
+        timing.view_finished = timing.render_started = time.perf_counter()
+
+        def render_finished(response):
+            timing.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(render_finished)
+        return response
+
+    def is_slow(self, timing):
+        return (
+            timing.total_ms > self.slow_ms
+            or timing.queries.count > self.slow_queries
+        )
+
+
+class MetricsMiddleware(AsyncCapableMiddleware):
+    """Время ответа, коды ответов и SQL-запросы по именам маршрутов
+    для /metrics. Выключается настройкой METRICS."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = QueryTimer()
+        started = time.perf_counter()
+        with queries.install():
+            response = self.get_response(request)
+        self.observe(request, response, queries, started)
+        return response
+
+    async def __acall__(self, request):
+        queries = QueryTimer()
+        started = time.perf_counter()
+        with queries.install():
+            response = await self.get_response(request)
+        self.observe(request, response, queries, started)
+        return response
+
+    def observe(self, request, response, queries, started):
+        seconds = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else metrics.UNRESOLVED
+        metrics.request_latency.labels(view).observe(seconds)
+        metrics.responses.labels(view, response.status_code).inc()
+        metrics.db_queries.labels(view).inc(queries.count)
+        metrics.db_seconds.labels(view).inc(queries.seconds)
+
+
+class SlowQueryMiddleware(AsyncCapableMiddleware):
+    """Журнал запросов к базе дольше SLOW_QUERY_THRESHOLD_MS с планом
+    выполнения, местом вызова и view; список - в админке.
+
+    Включается настройкой SLOW_QUERY_LOG. Найденные запросы сохраняются
+    после ответа, вне транзакций view. Запросы потоковых ответов
+    (выгрузка) выполняются уже после middleware и в журнал не попадают.
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG:
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = self.recorder()
+        with recorder.install():
+            response = self.get_response(request)
+        if recorder.captures:
+            self.save(request, recorder.captures)
+        return response
+
+    async def __acall__(self, request):
+        recorder = self.recorder()
+        with recorder.install():
+            response = await self.get_response(request)
+        if recorder.captures:
+            await sync_to_async(self.save)(request, recorder.captures)
+        return response
+
+    def recorder(self):
+        return SlowQueryRecorder(
+            settings.SLOW_QUERY_THRESHOLD_MS,
+            settings.SLOW_QUERY_EXPLAIN_ANALYZE,
+        )
+
+    def save(self, request, captures):
+        match = request.resolver_match
+        save_captures(
+            captures,
+            view=match.view_name if match else "",
+            path=request.get_full_path(),
+            keep=settings.SLOW_QUERY_LOG_SIZE,
+        )
+
+
+class StaticFilesMiddleware(AsyncCapableMiddleware, WhiteNoiseMiddleware):
+    """WhiteNoise, который под ASGI не переводит цепочку в поток.
+
+    Поиск файла - обращение к словарю, он выполняется в цикле событий;
+    в поток уходят только открытие найденного файла и поиск на диске
+    в режиме autorefresh (DEBUG).
+    """
+
+    def __init__(self, get_response):
+        WhiteNoiseMiddleware.__init__(self, get_response)
+        AsyncCapableMiddleware.__init__(self, get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(
+                self.find_file, thread_sensitive=False
+            )(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        return await sync_to_async(self.serve, thread_sensitive=False)(
+            static_file, request
+        )
+
+
+class RollbarMiddleware(RollbarNotifierMiddleware):
+    """Отчеты Rollbar об исключениях, под ASGI - без блокировки цикла
+    событий.
+
+    RollbarNotifierMiddleware синхронный: под ASGI Django вызывает его
+    process_exception в потоке запроса, а __call__ снимает контекст
+    заголовков раньше, чем view завершится. Здесь контекст живет до
+    конца запроса, а отчет собирается в общем пуле потоков; по сети
+    rollbar отправляет его из своего потока.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if self.async_mode:
+            self.process_exception = self.aprocess_exception
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        set_current_session(
+            {
+                key[5:].replace("_", "-").title(): value
+                for key, value in request.META.items()
+                if key.startswith("HTTP_")
+            }
+        )
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_current_session()
+
+    async def aprocess_exception(self, request, exc):
+        await sync_to_async(self.report, thread_sensitive=False)(request, exc)
+
+    def report(self, request, exc):
+        # В потоке пула sys.exc_info() пуст - исключение передается явно
+        if isinstance(exc, Http404) and _should_ignore_404(
+            request.get_full_path()
+        ):
+            return
+        _apply_sensitive_post_params(request)
+        rollbar.report_exc_info(
+            (type(exc), exc, exc.__traceback__),
+            request,
+            extra_data=self.get_extra_data(request, exc),
+            payload_data=self.get_payload_data(request, exc),
+        )
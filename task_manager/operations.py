@@ -0,0 +1,69 @@
+from django.db import migrations, router
+
+
+class RunVendorSQL(migrations.RunSQL):
+    """RunSQL с отдельным SQL для каждой СУБД.
+
+    sql и reverse_sql - словари {vendor: sql}. Для СУБД, которой нет
+    в словаре, операция ничего не делает.
+    """
+
+    def __init__(self, sql, reverse_sql=None, **kwargs):
+        self.vendor_sql = sql
+        self.vendor_reverse_sql = reverse_sql or {}
+        super().__init__(
+            sql=migrations.RunSQL.noop,
+            reverse_sql=migrations.RunSQL.noop,
+            **kwargs,
+        )
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        kwargs["sql"] = self.vendor_sql
+        kwargs["reverse_sql"] = self.vendor_reverse_sql
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        self._run_vendor_sql(app_label, schema_editor, self.vendor_sql)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        self._run_vendor_sql(app_label, schema_editor, self.vendor_reverse_sql)
+
+    def _run_vendor_sql(self, app_label, schema_editor, vendor_sql):
+        sql = vendor_sql.get(schema_editor.connection.vendor)
+        if sql and router.allow_migrate(
+            schema_editor.connection.alias, app_label, **self.hints
+        ):
+            self._run_sql(schema_editor, sql)
+
+
+class AddColumn(migrations.AddField):
+    """AddField, который в SQLite добавляет колонку на месте.
+
+    Поле NOT NULL Django добавляет в SQLite перестройкой таблицы, и вместе
+    со старой таблицей пропадают индексы и триггеры, созданные через
+    RunVendorSQL. Колонка с постоянным значением по умолчанию добавляется
+    обычным ALTER TABLE ADD COLUMN; DEFAULT остается в схеме - SQLite не
+    умеет его удалять, а Django все равно передает значение сам.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "sqlite":
+            return super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(schema_editor.connection.alias, model):
+            return
+        field = model._meta.get_field(self.name)
+        definition, params = schema_editor.column_sql(
+            model, field, include_default=True
+        )
+        schema_editor.execute(
+            f"ALTER TABLE {schema_editor.quote_name(model._meta.db_table)} "
+            f"ADD COLUMN {schema_editor.quote_name(field.column)} "
+            f"{definition}",
+            params,
+        )
@@ -0,0 +1,87 @@
+"""Сессии в кеше с записью в базу (как cached_db), но без лишних записей.
+
+Срок сессии продлевается с каждым запросом (SESSION_SAVE_EVERY_REQUEST),
+однако неизмененная сессия записывается не чаще раза в
+SESSION_REFRESH_INTERVAL секунд: время последней записи хранится в
+самой сессии. Срок в базе поэтому может отставать от срока cookie не
+больше чем на этот интервал.
+
+Если общий кеш - память процесса (SHARED_CACHE_IS_LOCAL), сессия
+читается из базы: копия в кеше этого процесса пережила бы выход из
+системы в другом процессе.
+
+Раз в SESSION_PRUNE_INTERVAL секунд один из процессов удаляет истекшие
+сессии пачками; manage.py clearsessions делает то же самое вручную.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db, db
+from django.core.cache import caches
+from django.utils import timezone
+
+REFRESHED_KEY = "_session_refreshed"
+PRUNE_LOCK_KEY = "sessions:pruned"
+PRUNE_BATCH_SIZE = 1000
+
+
+class SessionStore(cached_db.SessionStore):
+    # Момент следующей чистки по time.monotonic() в этом процессе
+    next_prune = None
+
+    def load(self):
+        if settings.SHARED_CACHE_IS_LOCAL:
+            return db.SessionStore.load(self)
+        return super().load()
+
+    async def aload(self):
+        if settings.SHARED_CACHE_IS_LOCAL:
+            return await db.SessionStore.aload(self)
+        return await super().aload()
+
+    def save(self, must_create=False):
+        if not (must_create or self.modified) and self.is_fresh():
+            return
+        self._get_session(no_load=must_create)[REFRESHED_KEY] = int(time.time())
+        super().save(must_create)
+        self.prune_if_due()
+
+    def is_fresh(self):
+        """Сессию записывали меньше SESSION_REFRESH_INTERVAL назад"""
+        refreshed = self._session.get(REFRESHED_KEY)
+        return (
+            refreshed is not None
+            and time.time() - refreshed < settings.SESSION_REFRESH_INTERVAL
+        )
+
+    @classmethod
+    def prune_if_due(cls):
+        """Чистка не раньше чем через интервал после запуска процесса;
+        ключ в общем кеше не дает чистить нескольким процессам сразу."""
+        interval = settings.SESSION_PRUNE_INTERVAL
+        if not interval:
+            return
+        now = time.monotonic()
+        if cls.next_prune is None:
+            cls.next_prune = now + interval
+        if now < cls.next_prune:
+            return
+        cls.next_prune = now + interval
+        cache = caches[settings.SESSION_CACHE_ALIAS]
+        if cache.add(PRUNE_LOCK_KEY, True, interval):
+            cls.clear_expired()
+
+    @classmethod
+    def clear_expired(cls):
+        """Удаляет истекшие сессии пачками по PRUNE_BATCH_SIZE, чтобы
+        не держать долгую блокировку таблицы"""
+        model = cls.get_model_class()
+        expired = model.objects.filter(expire_date__lt=timezone.now())
+        deleted = 0
+        while keys := list(
+            expired.values_list("pk", flat=True)[:PRUNE_BATCH_SIZE]
+        ):
+            model.objects.filter(pk__in=keys).delete()
+            deleted += len(keys)
+        return deleted
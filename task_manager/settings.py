@@ -56,12 +56,17 @@ INSTALLED_APPS = [
     "task_manager.statuses",
     "task_manager.tasks",
     "task_manager.labels",
+    "task_manager.diagnostics",
     "django_filters",
 ]
 
 MIDDLEWARE = [
+    # Первым: total в Server-Timing включает все остальные middleware
+    "task_manager.middleware.RequestTimingMiddleware",
+    "task_manager.middleware.MetricsMiddleware",
+    "task_manager.middleware.SlowQueryMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "task_manager.middleware.StaticFilesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -69,10 +74,47 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.locale.LocaleMiddleware",
-    "rollbar.contrib.django.middleware.RollbarNotifierMiddleware",
+    "task_manager.middleware.RollbarMiddleware",
 ]
 
-ROOT_URLCONF = "task_manager.urls"
+# Заголовок Server-Timing (SQL, view, шаблон) и журнал медленных запросов
+# в логгере task_manager.timing. По умолчанию выключено.
+REQUEST_TIMING = os.getenv("REQUEST_TIMING", "").lower() in ("1", "true")
+REQUEST_TIMING_SLOW_MS = int(os.getenv("REQUEST_TIMING_SLOW_MS", "1000"))
+REQUEST_TIMING_SLOW_QUERIES = int(
+    os.getenv("REQUEST_TIMING_SLOW_QUERIES", "50")
+)
+
+# Журнал медленных запросов к базе с EXPLAIN (в админке). На PostgreSQL
+# SELECT выполняется повторно с EXPLAIN ANALYZE, если не задано
+# SLOW_QUERY_EXPLAIN_ANALYZE=false. По умолчанию выключено.
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG", "").lower() in ("1", "true")
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_LOG_SIZE = int(os.getenv("SLOW_QUERY_LOG_SIZE", "500"))
+SLOW_QUERY_EXPLAIN_ANALYZE = os.getenv(
+    "SLOW_QUERY_EXPLAIN_ANALYZE", "true"
+).lower() in ("1", "true")
+
+# Метрики Prometheus на /metrics. Доступ - сотрудникам (is_staff)
+# или с заголовком "Authorization: Bearer <METRICS_TOKEN>"
+METRICS = os.getenv("METRICS", "true").lower() in ("1", "true")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Асинхронные варианты view (task_manager/async_views.py) для работы
+# под ASGI; asgi.py включает их по умолчанию. Под WSGI каждый async view
+# выполнялся бы в отдельном цикле событий, поэтому там они выключены.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "").lower() in ("1", "true")
+
+ROOT_URLCONF = "task_manager.async_urls" if ASYNC_VIEWS else "task_manager.urls"
+
+# Живое обновление списка задач (tasks/events.py): бэкенд раздачи
+# событий, буфер подписчика (задач) и интервал пустых сообщений в потоке
+# (секунды). Поток событий есть только среди асинхронных маршрутов.
+TASK_EVENTS_BACKEND = os.getenv(
+    "TASK_EVENTS_BACKEND", "task_manager.tasks.events.LocalBackend"
+)
+TASK_EVENTS_BUFFER_SIZE = int(os.getenv("TASK_EVENTS_BUFFER_SIZE", "100"))
+TASK_EVENTS_HEARTBEAT = float(os.getenv("TASK_EVENTS_HEARTBEAT", "15"))
 
 TEMPLATES = [
     {
@@ -89,6 +131,22 @@ TEMPLATES = [
     },
 ]
 
+# В production загрузчики заданы явно: разобранные шаблоны хранятся в
+# памяти воркера до перезапуска, а task_manager/warmup.py разбирает их
+# при запуске. С DEBUG Django сам включает кешированный загрузчик,
+# который сбрасывается при изменении файлов.
+if not DEBUG:
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 WSGI_APPLICATION = "task_manager.wsgi.application"
 
 
@@ -102,13 +160,112 @@ DATABASES = {
     }
 }
 
+# Пул соединений PostgreSQL (psycopg 3): воркер берет соединение из пула
+# на время запроса вместо того, чтобы держать свое или открывать новое.
+# DATABASE_POOL=false возвращает постоянные соединения (CONN_MAX_AGE).
+DATABASE_POOL = os.getenv("DATABASE_POOL", "true").lower() in ("1", "true")
+DATABASE_POOL_OPTIONS = {
+    "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+    "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+    # Сколько секунд ждать свободного соединения
+    "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+}
+
+# Профиль SQLite: WAL позволяет читать во время записи, synchronous=NORMAL
+# в режиме WAL безопасен и не ждет fsync на каждой транзакции. BEGIN
+# IMMEDIATE берет блокировку записи сразу, и конкурирующий писатель ждет
+# busy timeout, а не получает "database is locked" посреди транзакции.
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 2**20)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+SQLITE_OPTIONS = {
+    "init_command": ";".join(
+        [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+            # Отрицательное значение - размер в КиБ, а не в страницах
+            f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+        ]
+    ),
+    "transaction_mode": "IMMEDIATE",
+    # Busy timeout, секунды
+    "timeout": float(os.getenv("SQLITE_BUSY_TIMEOUT", "5")),
+}
+
 if os.environ.get("DATABASE_URL"):
     db_from_env = dj_database_url.config(
-        conn_max_age=600,
-        conn_health_checks=True,
+        conn_max_age=0 if DATABASE_POOL else 600,
+        conn_health_checks=not DATABASE_POOL,
     )
     DATABASES["default"].update(db_from_env)
 
+if DATABASES["default"]["ENGINE"] == "django.db.backends.sqlite3":
+    DATABASES["default"].setdefault("OPTIONS", {}).update(SQLITE_OPTIONS)
+elif (
+    DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql"
+    and DATABASE_POOL
+):
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = (
+        DATABASE_POOL_OPTIONS
+    )
+
+# Кеш: маленький LRU в памяти процесса перед общим кешем "shared"
+# (task_manager/cache.py). Общий кеш - Redis (REDIS_URL, нужен пакет
+# redis), каталог на диске (CACHE_DIR) или память процесса, если не
+# задано ни то, ни другое. Память процесса годится только для одного
+# процесса: версии данных, сессии и пользователи в ней другим воркерам
+# не видны, поэтому без DEBUG проверка task_manager.W001 предупреждает
+# об этом. CACHE_VERSION сбрасывает все ключи разом.
+CACHE_VERSION = int(os.getenv("CACHE_VERSION", "1"))
+SHARED_CACHE_IS_LOCAL = False
+if os.getenv("REDIS_URL"):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }
+elif os.getenv("CACHE_DIR"):
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("CACHE_DIR"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+else:
+    SHARED_CACHE = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    }
+    SHARED_CACHE_IS_LOCAL = True
+
+CACHES = {
+    "default": {
+        "BACKEND": "task_manager.cache.TieredCache",
+        "LOCATION": "shared",
+        "VERSION": CACHE_VERSION,
+        "OPTIONS": {
+            "LOCAL_MAX_ENTRIES": int(
+                os.getenv("CACHE_LOCAL_MAX_ENTRIES", "1000")
+            ),
+            "LOCAL_TIMEOUT": float(os.getenv("CACHE_LOCAL_TIMEOUT", "5")),
+        },
+    },
+    "shared": {**SHARED_CACHE, "VERSION": CACHE_VERSION},
+}
+
+# Тесты идут в одном процессе: кеш в памяти для них общий
+TEST_RUNNER = "task_manager.test_runner.TestRunner"
+
+# Сессии: кеш с записью в базу, срок продлевается с каждым запросом,
+# но неизмененная сессия записывается не чаще раза в
+# SESSION_REFRESH_INTERVAL секунд (task_manager/sessions.py). Кеш -
+# общий, без уровня в памяти процесса: иначе выход из системы в одном
+# процессе был бы не сразу виден в других. Если и общий кеш - память
+# процесса (SHARED_CACHE_IS_LOCAL), сессии читаются из базы.
+SESSION_ENGINE = "task_manager.sessions"
+SESSION_CACHE_ALIAS = "shared"
+SESSION_SAVE_EVERY_REQUEST = True
+SESSION_REFRESH_INTERVAL = int(os.getenv("SESSION_REFRESH_INTERVAL", "3600"))
+# Удаление истекших сессий; 0 - только вручную (manage.py clearsessions)
+SESSION_PRUNE_INTERVAL = int(os.getenv("SESSION_PRUNE_INTERVAL", "3600"))
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -173,6 +330,9 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "users.User"
 
+# Пользователь сессии читается из кеша, а не из базы в каждом запросе
+AUTHENTICATION_BACKENDS = ["task_manager.users.backends.CachedModelBackend"]
+
 ROLLBAR = {
     "access_token": os.getenv("ROLLBAR_ACCESS_TOKEN"),
     "environment": "development" if DEBUG else "production",
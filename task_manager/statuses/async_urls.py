@@ -0,0 +1,16 @@
+from task_manager.async_views import async_urlpatterns
+
+from . import views
+from .urls import app_name, urlpatterns
+
+__all__ = ["app_name", "urlpatterns"]
+
+urlpatterns = async_urlpatterns(
+    urlpatterns,
+    {
+        "statuses": views.AsyncStatusesListView,
+        "create": views.AsyncStatusCreateView,
+        "update": views.AsyncStatusUpdateView,
+        "delete": views.AsyncStatusDeleteView,
+    },
+)
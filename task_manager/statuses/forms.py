@@ -7,8 +7,8 @@ from .models import Status
 class StatusForm(ModelForm):
     class Meta:
         model = Status
-        fields = ["name"]
-        labels = {"name": _("Name")}
+        fields = ["name", "is_closed"]
+        labels = {"name": _("Name"), "is_closed": _("Closes tasks")}
         widgets = {
             "name": TextInput(
                 attrs={"class": "form-control", "placeholder": _("Name")}
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+from django.db import migrations
+
+from task_manager.operations import RunVendorSQL
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("statuses", "0001_initial"),
+    ]
+
+    # Индексы для поиска по началу строки без учета регистра (istartswith)
+    operations = [
+        RunVendorSQL(
+            sql={
+                "postgresql": (
+                    "CREATE INDEX statuses_name_prefix_idx "
+                    "ON statuses (UPPER(name::text) text_pattern_ops)"
+                ),
+                "sqlite": (
+                    "CREATE INDEX statuses_name_prefix_idx "
+                    "ON statuses (name COLLATE NOCASE)"
+                ),
+            },
+            reverse_sql={
+                "postgresql": "DROP INDEX statuses_name_prefix_idx",
+                "sqlite": "DROP INDEX statuses_name_prefix_idx",
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+from task_manager.operations import AddColumn
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("statuses", "0003_status_tasks_count"),
+    ]
+
+    # Без перестройки таблицы в SQLite: сохраняются индексы из 0002
+    operations = [
+        AddColumn(
+            model_name="status",
+            name="is_closed",
+            field=models.BooleanField(
+                default=False, verbose_name="Closes tasks"
+            ),
+        ),
+    ]
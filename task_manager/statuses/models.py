@@ -1,11 +1,17 @@
-from django.db.models import CharField, DateTimeField, Model
+from django.db.models import BooleanField, CharField, DateTimeField, Model
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.fields import CounterField
+
 
 class Status(Model):
     name = CharField(max_length=100, unique=True, verbose_name=_("Name"))
+    # Задача в таком статусе считается закрытой, см. Task.closed_at
+    is_closed = BooleanField(default=False, verbose_name=_("Closes tasks"))
     created_at = DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    # Число задач, см. tasks/counters.py
+    tasks_count = CounterField(verbose_name=_("Tasks"))
 
     class Meta:
         verbose_name = _("Status")
@@ -14,3 +20,12 @@ class Status(Model):
 
     def __str__(self):
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Значение из базы: при сохранении сигналы сравнивают с ним новое,
+        # чтобы закрыть или открыть задачи статуса (tasks/rollups.py)
+        if "is_closed" in field_names:
+            instance._loaded_is_closed = instance.is_closed
+        return instance
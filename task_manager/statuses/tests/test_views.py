@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
@@ -216,3 +216,8 @@ class StatusesViewsTest(TestCase):
         # Статусы должны идти в порядке их ID (pos1 < pos2 < pos3)
         self.assertLess(pos1, pos2)
         self.assertLess(pos2, pos3)
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncStatusesViewsTest(StatusesViewsTest):
+    """Те же сценарии с асинхронными view"""
@@ -7,6 +7,14 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.async_views import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+    AsyncUpdateView,
+)
+
 from .forms import StatusForm
 from .models import Status
 
@@ -51,3 +59,45 @@ class StatusDeleteView(LoginRequiredMixin, SuccessMessageMixin, DeleteView):
                 request, _("Cannot delete status because it is in use")
             )
             return redirect("statuses:statuses")
+
+
+class AsyncStatusesListView(AsyncLoginRequiredMixin, AsyncListView):
+    model = Status
+    template_name = "statuses/index.html"
+    context_object_name = "statuses"
+    ordering = ["id"]
+
+
+class AsyncStatusCreateView(AsyncLoginRequiredMixin, AsyncCreateView):
+    model = Status
+    form_class = StatusForm
+    template_name = "statuses/create.html"
+    success_url = reverse_lazy("statuses:statuses")
+    success_message = _("Status successfully created")
+    extra_context = {"title": _("Create Status")}
+
+
+class AsyncStatusUpdateView(AsyncLoginRequiredMixin, AsyncUpdateView):
+    model = Status
+    form_class = StatusForm
+    template_name = "statuses/update.html"
+    success_url = reverse_lazy("statuses:statuses")
+    success_message = _("Status successfully updated")
+    extra_context = {"title": _("Update Status")}
+
+
+class AsyncStatusDeleteView(AsyncLoginRequiredMixin, AsyncDeleteView):
+    model = Status
+    template_name = "statuses/delete.html"
+    success_url = reverse_lazy("statuses:statuses")
+    success_message = _("Status successfully deleted")
+    extra_context = {"title": _("Delete Status")}
+
+    async def adelete_object(self):
+        try:
+            return await super().adelete_object()
+        except ProtectedError:
+            messages.error(
+                self.request, _("Cannot delete status because it is in use")
+            )
+            return redirect("statuses:statuses")
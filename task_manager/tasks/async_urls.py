@@ -0,0 +1,29 @@
+from django.urls import path
+
+from task_manager.async_views import async_urlpatterns
+
+from . import views
+from .urls import app_name, urlpatterns
+
+__all__ = ["app_name", "urlpatterns"]
+
+# Импорт и подсказки остаются синхронными: чтение файла и виджеты
+# подсказок не имеют async API
+urlpatterns = async_urlpatterns(
+    urlpatterns,
+    {
+        "tasks": views.AsyncTasksListView,
+        "create": views.AsyncTaskCreateView,
+        "detail": views.AsyncTaskDetailView,
+        "update": views.AsyncTaskUpdateView,
+        "delete": views.AsyncTaskDeleteView,
+        "move": views.AsyncTaskMoveView,
+        "export": views.AsyncTaskExportView,
+    },
+)
+
+# Поток изменений держит соединение открытым: под WSGI он занял бы
+# поток сервера на все время, пока открыта страница
+urlpatterns += [
+    path("events/", views.TaskEventsView.as_view(), name="events"),
+]
@@ -0,0 +1,135 @@
+import time
+from functools import partial
+
+from django.core.cache import cache, caches
+from django.utils.choices import BaseChoiceIterator
+
+from task_manager.labels.models import Label
+from task_manager.metrics import record_cache
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+
+class CacheVersion:
+    """Номер версии данных, хранимый в кеше.
+
+    Начальное значение берется из часов, чтобы после вытеснения ключа
+    из кеша номер не повторил один из уже выданных. Номер хранится
+    только в общем кеше: в памяти процесса другие воркеры видели бы
+    старую версию.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    @property
+    def cache(self):
+        return caches["shared"]
+
+    def get(self):
+        return self.cache.get_or_set(self.key, time.time_ns, None)
+
+    async def aget(self):
+        """get() для асинхронных view: не блокирует цикл событий"""
+        return await self.cache.aget_or_set(self.key, time.time_ns, None)
+
+    def increment(self):
+        try:
+            self.cache.incr(self.key)
+        except ValueError:
+            self.cache.set(self.key, time.time_ns(), None)
+
+
+class CachedChoices:
+    """Варианты выпадающего списка (pk, подпись), хранимые в кеше.
+
+    Данные лежат под ключом с номером версии. Сигналы сохранения и удаления
+    увеличивают версию, и следующий запрос строит список заново, а старые
+    версии просто истекают.
+    """
+
+    timeout = 24 * 60 * 60
+
+    def __init__(self, name, get_queryset, label=str):
+        self.name = name
+        self.get_queryset = get_queryset
+        self.label = label
+        self.version = CacheVersion(f"choices:{name}:version")
+
+    @property
+    def key(self):
+        return f"choices:{self.name}"
+
+    @property
+    def version_key(self):
+        return self.version.key
+
+    def get_version(self):
+        return self.version.get()
+
+    async def aget_version(self):
+        return await self.version.aget()
+
+    def get(self):
+        built = False
+
+        def build():
+            nonlocal built
+            built = True
+            return [(obj.pk, self.label(obj)) for obj in self.get_queryset()]
+
+        choices = cache.get_or_set(
+            self.key, build, self.timeout, version=self.get_version()
+        )
+        record_cache(self.key, not built)
+        return choices
+
+    def invalidate(self):
+        self.version.increment()
+
+    def bind(self, field):
+        """Подключает список к ModelChoiceField.
+
+        queryset поля остается прежним: валидация по-прежнему проверяет
+        отправленные pk в базе, а варианты для отрисовки берутся из кеша.
+        """
+        field.iterator = partial(CachedChoiceIterator, choices=self)
+        field.widget.choices = field.choices
+
+
+class CachedChoiceIterator(BaseChoiceIterator):
+    """Замена ModelChoiceIterator, которая не выполняет запрос.
+
+    Как и ModelChoiceIterator, читает варианты лениво - только при
+    отрисовке списка, а не при создании формы.
+    """
+
+    def __init__(self, field, choices):
+        self.field = field
+        self.choices = choices
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ("", self.field.empty_label)
+        yield from self.choices.get()
+
+    def __len__(self):
+        return len(self.choices.get()) + (self.field.empty_label is not None)
+
+    def __bool__(self):
+        return self.field.empty_label is not None or bool(self.choices.get())
+
+
+status_choices = CachedChoices(
+    "statuses", lambda: Status.objects.only("name").order_by("name")
+)
+executor_choices = CachedChoices(
+    "executors",
+    lambda: User.objects.only("first_name", "last_name").order_by(
+        "first_name", "last_name", "username"
+    ),
+    label=User.get_display_name,
+)
+label_choices = CachedChoices(
+    "labels", lambda: Label.objects.only("name").order_by("name")
+)
@@ -0,0 +1,121 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.contrib import messages
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils.translation import get_language
+
+from .choices import (
+    CacheVersion,
+    executor_choices,
+    label_choices,
+    status_choices,
+)
+
+# Меняется при каждом сохранении и удалении задачи, см. signals.py
+task_list_version = CacheVersion("tasks:list:version")
+
+# Списки, версии которых входят в ETag каждой страницы
+ETAG_CHOICES = (status_choices, label_choices, executor_choices)
+
+
+class ConditionalGetMixin:
+    """Отвечает 304 Not Modified, если страница не изменилась.
+
+    Валидаторы считаются дешевыми запросами до построения страницы, поэтому
+    при совпадении ETag шаблон не рендерится и метки не загружаются.
+    Подклассы реализуют get_validators(): (время изменения, части ETag)
+    или None, если проверка невозможна (например, задачи нет).
+
+    В ETag, кроме данных подкласса, входят пользователь, язык, CSRF-токен
+    и версии списков статусов, меток и пользователей - переименование
+    статуса меняет страницу, хотя updated_at задач остается прежним.
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        # Сообщение показывается один раз - такую страницу отдаем целиком
+        if self.has_messages(request):
+            return super().get(request, *args, **kwargs)
+
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, timestamp, response = self.check_validators(
+            validators, self.get_versions()
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return self.add_validators(response, etag, timestamp)
+
+    def has_messages(self, request):
+        return bool(len(messages.get_messages(request)))
+
+    def get_versions(self):
+        return [choices.get_version() for choices in ETAG_CHOICES]
+
+    def check_validators(self, validators, versions):
+        """ETag, время изменения и ответ 304 (412) или None"""
+        last_modified, parts = validators
+        etag = self.make_etag([*parts, *versions])
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            self.request, etag=etag, last_modified=timestamp
+        )
+        return etag, timestamp, response
+
+    def add_validators(self, response, etag, timestamp):
+        response.headers.setdefault("ETag", etag)
+        if timestamp is not None:
+            response.headers.setdefault("Last-Modified", http_date(timestamp))
+        return response
+
+    def make_etag(self, parts):
+        parts = [
+            *parts,
+            self.request.user.pk,
+            get_language(),
+            self.request.META.get("CSRF_COOKIE", ""),
+        ]
+        data = "|".join(str(part) for part in parts)
+        return quote_etag(
+            hashlib.md5(data.encode(), usedforsecurity=False).hexdigest()
+        )
+
+
+class AsyncConditionalGetMixin(ConditionalGetMixin):
+    """ConditionalGetMixin для асинхронных view: валидаторы считаются
+    через async ORM в aget_validators(), версии читаются из кеша через
+    его асинхронные методы"""
+
+    async def aget_validators(self):
+        raise NotImplementedError
+
+    async def aget_versions(self):
+        return [await choices.aget_version() for choices in ETAG_CHOICES]
+
+    async def get(self, request, *args, **kwargs):
+        # Сообщения могут лежать в сессии, а ее чтение синхронное
+        if await sync_to_async(self.has_messages)(request):
+            return await super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs
+            )
+
+        validators = await self.aget_validators()
+        if validators is None:
+            return await super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs
+            )
+
+        etag, timestamp, response = self.check_validators(
+            validators, await self.aget_versions()
+        )
+        if response is None:
+            response = await super(ConditionalGetMixin, self).get(
+                request, *args, **kwargs
+            )
+        return self.add_validators(response, etag, timestamp)
@@ -0,0 +1,160 @@
+"""Счетчики задач у статусов, меток и пользователей.
+
+Счетчики - поля CounterField: Status.tasks_count, Label.tasks_count,
+User.authored_tasks_count и User.assigned_tasks_count. Списки статусов
+и меток показывают их без подсчета по таблице задач.
+
+Счетчик меняется запросом UPDATE ... SET n = n + delta в той же
+транзакции, что и задачи: сохранение и удаление задачи и изменение ее
+меток - в signals.py, массовые операции - там, где они выполняются.
+Если счетчик все же разошелся с задачами (правка базы вручную, загрузка
+дампа), recount() находит такие строки и пересчитывает их - команда
+manage.py recount.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import router, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+from .models import Task
+
+# Имя счетчика: модель, поле счетчика и поле связи с задачами
+COUNTERS = {
+    "status": (Status, "tasks_count", "status"),
+    "author": (User, "authored_tasks_count", "author"),
+    "executor": (User, "assigned_tasks_count", "executor"),
+    "labels": (Label, "tasks_count", "label"),
+}
+
+# Поля задачи, от которых зависят счетчики
+TASK_FIELDS = {
+    "status": "status_id",
+    "author": "author_id",
+    "executor": "executor_id",
+}
+
+
+def add(name, deltas, using=None):
+    """Прибавляет к счетчикам {pk: delta}; одинаковые приращения -
+    одним запросом. using - псевдоним базы, как у сигналов моделей"""
+    model, field, _relation = COUNTERS[name]
+    by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            by_delta[delta].append(pk)
+    for delta, pks in by_delta.items():
+        model.objects.using(using).filter(pk__in=pks).update(
+            **{field: F(field) + delta}
+        )
+
+
+def task_values(task):
+    """Значения полей задачи, от которых зависят счетчики"""
+    return {
+        name: getattr(task, attname) for name, attname in TASK_FIELDS.items()
+    }
+
+
+def affects_counters(update_fields):
+    return update_fields is None or bool(
+        set(update_fields) & {*TASK_FIELDS, *TASK_FIELDS.values()}
+    )
+
+
+def stored_values(pk, using=None, extra=()):
+    """Значения полей счетчиков в базе; строка блокируется до конца
+    транзакции. extra - другие поля задачи, которые нужно прочитать тем же
+    запросом, под своими именами"""
+    extra = list(extra)
+    row = (
+        Task.objects.using(using)
+        .select_for_update()
+        .filter(pk=pk)
+        .values_list(*TASK_FIELDS.values(), *extra)
+        .first()
+    )
+    return None if row is None else dict(zip([*TASK_FIELDS, *extra], row))
+
+
+def add_tasks(tasks, sign=1, using=None):
+    """Учитывает созданные (sign=1) или удаленные (sign=-1) задачи"""
+    deltas = {name: Counter() for name in TASK_FIELDS}
+    for values in tasks:
+        for name, pk in values.items():
+            deltas[name][pk] += sign
+    for name, counter in deltas.items():
+        add(name, counter, using)
+
+
+def move_tasks(changes, using=None):
+    """Учитывает смену полей задач: [(старые значения, новые значения)]"""
+    deltas = {name: Counter() for name in TASK_FIELDS}
+    for old, new in changes:
+        for name in TASK_FIELDS:
+            if old[name] != new[name]:
+                deltas[name][old[name]] -= 1
+                deltas[name][new[name]] += 1
+    for name, counter in deltas.items():
+        add(name, counter, using)
+
+
+def linked_labels(task_ids=None, label_ids=None, using=None):
+    """Число связей задач с метками: {pk метки: число}; None - без условия"""
+    links = Task.labels.through.objects.using(using).order_by()
+    if task_ids is not None:
+        links = links.filter(task_id__in=task_ids)
+    if label_ids is not None:
+        links = links.filter(label_id__in=label_ids)
+    return dict(links.values_list("label_id").annotate(count=Count("pk")))
+
+
+def remove_labels(links, using=None):
+    """Вычитает из счетчиков меток связи из linked_labels()"""
+    add("labels", {pk: -count for pk, count in links.items()}, using)
+
+
+def actual_count(name):
+    """Подзапрос с настоящим числом задач для строки модели счетчика"""
+    _model, _field, relation = COUNTERS[name]
+    source = Task.labels.through if name == "labels" else Task
+    tasks = (
+        source.objects.filter(**{relation: OuterRef("pk")})
+        .order_by()
+        .values(relation)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(tasks), Value(0))
+
+
+def recount(names=None, pks=None, using=None):
+    """Пересчитывает разошедшиеся счетчики; возвращает {имя: число строк}.
+
+    pks ограничивает пересчет этими строками модели счетчика.
+    """
+    repaired = {}
+    for name in names or COUNTERS:
+        model, field, _relation = COUNTERS[name]
+        db = using or router.db_for_write(model)
+        queryset = model.objects.using(db)
+        if pks is not None:
+            queryset = queryset.filter(pk__in=pks)
+        with transaction.atomic(using=db):
+            stale = list(
+                queryset.select_for_update()
+                .annotate(actual=actual_count(name))
+                .exclude(**{field: F("actual")})
+                .values_list("pk", flat=True)
+            )
+            if stale:
+                model.objects.using(db).filter(pk__in=stale).update(
+                    **{field: actual_count(name)}
+                )
+        repaired[name] = len(stale)
+    return repaired
@@ -0,0 +1,142 @@
+"""Изменения задач для живого обновления списка (Server-Sent Events).
+
+Сигналы моделей публикуют события после фиксации транзакции:
+create, update или delete и номера задач. Брокер раздает их
+подписчикам - открытым потокам TaskEventsView. Доставка - через
+бэкенд из settings.TASK_EVENTS_BACKEND; LocalBackend раздает события
+в пределах процесса, и для нескольких процессов нужен бэкенд с общей
+шиной (например, Redis pub/sub) с тем же интерфейсом.
+
+Публикация не ждет подписчиков. У каждого подписчика свой буфер на
+TASK_EVENTS_BUFFER_SIZE задач: события одной задачи сливаются в одно,
+а при переполнении буфер очищается и подписчик получает reset -
+страницу нужно загрузить заново. Медленный клиент не копит события в
+памяти и не задерживает остальных.
+"""
+
+import asyncio
+import threading
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
+
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+RESET = "reset"
+
+
+class Subscription:
+    """Буфер событий одного подписчика; живет в его цикле событий"""
+
+    def __init__(self, buffer_size):
+        self.loop = asyncio.get_running_loop()
+        self.buffer_size = buffer_size
+        self.pending = {}
+        self.overflowed = False
+        self.ready = asyncio.Event()
+
+    def deliver(self, action, task_ids):
+        """Передает события из любого потока"""
+        try:
+            self.loop.call_soon_threadsafe(self.put, action, task_ids)
+        except RuntimeError:
+            # Цикл подписчика уже закрыт
+            pass
+
+    def put(self, action, task_ids):
+        if self.overflowed:
+            return
+        for task_id in task_ids:
+            previous = self.pending.get(task_id)
+            if previous == CREATE and action == DELETE:
+                # Клиент еще не видел задачу - сообщать нечего
+                del self.pending[task_id]
+                continue
+            if previous is None and len(self.pending) >= self.buffer_size:
+                self.pending.clear()
+                self.overflowed = True
+                break
+            if previous == CREATE:
+                continue
+            self.pending[task_id] = action
+        self.ready.set()
+
+    async def get(self, timeout):
+        """События, накопленные с прошлого вызова: [(действие, задачи)].
+
+        Пустой список - за timeout секунд ничего не произошло.
+        """
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except TimeoutError:
+            return []
+        self.ready.clear()
+        if self.overflowed:
+            self.overflowed = False
+            return [(RESET, [])]
+        events = {}
+        for task_id, action in self.pending.items():
+            events.setdefault(action, []).append(task_id)
+        self.pending.clear()
+        return list(events.items())
+
+
+class LocalBackend:
+    """Подписчики этого процесса"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def publish(self, action, task_ids):
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        for subscription in subscriptions:
+            subscription.deliver(action, task_ids)
+
+    def subscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions.discard(subscription)
+
+
+class Broker:
+    @cached_property
+    def backend(self):
+        return import_string(settings.TASK_EVENTS_BACKEND)()
+
+    def publish(self, action, task_ids, using=None):
+        """Рассылает событие после фиксации текущей транзакции базы
+        using"""
+        task_ids = list(task_ids)
+        if task_ids:
+            transaction.on_commit(
+                lambda: self.backend.publish(action, task_ids), using=using
+            )
+
+    def subscribe(self):
+        """Новый подписчик в текущем цикле событий; после него нужен
+        unsubscribe()"""
+        subscription = Subscription(settings.TASK_EVENTS_BUFFER_SIZE)
+        self.backend.subscribe(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.backend.unsubscribe(subscription)
+
+
+broker = Broker()
+
+
+@receiver(setting_changed)
+def reset_backend(setting, **kwargs):
+    if setting == "TASK_EVENTS_BACKEND":
+        broker.__dict__.pop("backend", None)
@@ -0,0 +1,94 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+FIELDS = [
+    "id",
+    "name",
+    "description",
+    "status",
+    "author",
+    "executor",
+    "labels",
+    "created_at",
+    "updated_at",
+]
+
+
+def _user_name(user):
+    if user is None:
+        return ""
+    return user.get_display_name()
+
+
+def task_row(task):
+    """Строка выгрузки. Метки берутся из prefetch, без запроса на задачу"""
+    return {
+        "id": task.id,
+        "name": task.name,
+        "description": task.description,
+        "status": task.status.name,
+        "author": _user_name(task.author),
+        "executor": _user_name(task.executor),
+        "labels": [label.name for label in task.labels.all()],
+        "created_at": task.created_at,
+        "updated_at": task.updated_at,
+    }
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: write() возвращает строку, а не пишет"""
+
+    def write(self, value):
+        return value
+
+
+def csv_values(task):
+    row = task_row(task)
+    row["labels"] = ", ".join(row["labels"])
+    row["created_at"] = row["created_at"].isoformat()
+    row["updated_at"] = row["updated_at"].isoformat()
+    return [row[field] for field in FIELDS]
+
+
+def jsonl_line(task):
+    row = json.dumps(task_row(task), cls=DjangoJSONEncoder, ensure_ascii=False)
+    return f"{row}\n"
+
+
+def csv_stream(tasks):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    for task in tasks:
+        yield writer.writerow(csv_values(task))
+
+
+async def acsv_stream(tasks):
+    """csv_stream для асинхронного итератора задач (aiterator)"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(FIELDS)
+    async for task in tasks:
+        yield writer.writerow(csv_values(task))
+
+
+def jsonl_stream(tasks):
+    for task in tasks:
+        yield jsonl_line(task)
+
+
+async def ajsonl_stream(tasks):
+    async for task in tasks:
+        yield jsonl_line(task)
+
+
+# Формат выгрузки -> (content type, генератор строк, он же для
+# асинхронного итератора задач)
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", csv_stream, acsv_stream),
+    "jsonl": (
+        "application/x-ndjson; charset=utf-8",
+        jsonl_stream,
+        ajsonl_stream,
+    ),
+}
@@ -1,15 +1,35 @@
-from django.forms import CheckboxInput
+from django.db.models import Exists, OuterRef
+from django.forms import CheckboxInput, TextInput
 from django.utils.translation import gettext_lazy as _
-from django_filters import BooleanFilter, FilterSet, ModelChoiceFilter
+from django_filters import (
+    BooleanFilter,
+    CharFilter,
+    FilterSet,
+    ModelChoiceFilter,
+)
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.users.models import User
 
+from .choices import executor_choices, label_choices, status_choices
 from .models import Task
+from .search import search_tasks
+from .widgets import AutocompleteSelect
 
 
 class TaskFilter(FilterSet):
+    q = CharFilter(
+        method="filter_search",
+        label=_("Search"),
+        widget=TextInput(
+            attrs={
+                "class": "form-control",
+                "placeholder": _("Search by name or description"),
+            }
+        ),
+    )
+
     status = ModelChoiceFilter(
         queryset=Status.objects.all(),
         label=_("Status"),
@@ -20,12 +40,15 @@ class TaskFilter(FilterSet):
         queryset=User.objects.all(),
         label=_("Executor"),
         empty_label=_("Any executor"),
+        widget=AutocompleteSelect("tasks:autocomplete_users"),
     )
 
     labels = ModelChoiceFilter(
         queryset=Label.objects.all(),
+        method="filter_labels",
         label=_("Label"),
         empty_label=_("Any label"),
+        widget=AutocompleteSelect("tasks:autocomplete_labels"),
     )
 
     self_tasks = BooleanFilter(
@@ -38,6 +61,24 @@ class TaskFilter(FilterSet):
         model = Task
         fields = ["status", "executor", "labels"]
 
+    def filter_labels(self, queryset, name, value):
+        """EXISTS вместо JOIN: задачи читаются по индексу в порядке
+        сортировки, и для страницы не нужна дополнительная сортировка"""
+        if value:
+            through = Task.labels.through
+            return queryset.filter(
+                Exists(
+                    through.objects.filter(task_id=OuterRef("pk"), label=value)
+                )
+            )
+        return queryset
+
+    def filter_search(self, queryset, name, value):
+        """Полнотекстовый поиск по названию и описанию, см. search.py"""
+        if value:
+            return search_tasks(queryset, value)
+        return queryset
+
     def filter_self_tasks(self, queryset, name, value):
         if value:
             return queryset.filter(author=self.request.user)
@@ -47,7 +88,7 @@ class TaskFilter(FilterSet):
         super().__init__(*args, **kwargs)
 
         executor_filter = self.filters["executor"]
-        executor_filter.field.label_from_instance = User.get_full_name
+        executor_filter.field.label_from_instance = User.get_display_name
 
         # Упорядочиваем queryset для выпадающих списков
         self.filters["status"].queryset = Status.objects.all().order_by("name")
@@ -55,3 +96,8 @@ class TaskFilter(FilterSet):
             "first_name", "last_name", "username"
         )
         self.filters["labels"].queryset = Label.objects.all().order_by("name")
+
+        # Варианты списков берутся из кеша, а не из базы при каждом запросе
+        status_choices.bind(self.form.fields["status"])
+        executor_choices.bind(self.form.fields["executor"])
+        label_choices.bind(self.form.fields["labels"])
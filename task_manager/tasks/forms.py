@@ -1,18 +1,32 @@
+from django.db import router, transaction
 from django.forms import (
+    ChoiceField,
+    FileField,
+    Form,
+    ModelChoiceField,
     ModelForm,
+    ModelMultipleChoiceField,
+    MultipleHiddenInput,
     Select,
-    SelectMultiple,
     Textarea,
     TextInput,
     ValidationError,
 )
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 from task_manager.users.models import User
 
+from . import counters, rollups
+from .choices import executor_choices, label_choices, status_choices
+from .conditional import task_list_version
+from .events import UPDATE, broker
+from .importer import IMPORT_FORMATS
 from .models import Task
+from .validators import validate_task_name
+from .widgets import AutocompleteSelect, AutocompleteSelectMultiple
 
 
 class TaskForm(ModelForm):
@@ -38,9 +52,12 @@ class TaskForm(ModelForm):
                 }
             ),
             "status": Select(attrs={"class": "form-control"}),
-            "executor": Select(attrs={"class": "form-control"}),
-            "labels": SelectMultiple(
-                attrs={"class": "form-control", "size": 5}
+            "executor": AutocompleteSelect(
+                "tasks:autocomplete_users", attrs={"class": "form-control"}
+            ),
+            "labels": AutocompleteSelectMultiple(
+                "tasks:autocomplete_labels",
+                attrs={"class": "form-control", "size": 5},
             ),
         }
 
@@ -50,16 +67,196 @@ class TaskForm(ModelForm):
         self.fields["executor"].queryset = User.objects.all().order_by(
             "first_name", "last_name", "username"
         )
-        self.fields["executor"].label_from_instance = User.get_full_name
+        self.fields["executor"].label_from_instance = User.get_display_name
         self.fields["status"].queryset = Status.objects.all().order_by("name")
         self.fields["labels"].queryset = Label.objects.all().order_by("name")
         self.fields["labels"].required = False
 
+        # Варианты списков берутся из кеша, а не из базы при каждом запросе
+        status_choices.bind(self.fields["status"])
+        executor_choices.bind(self.fields["executor"])
+        label_choices.bind(self.fields["labels"])
+
     def clean_name(self):
         """Валидация имени задачи"""
         name = self.cleaned_data.get("name")
-        if len(name) < 2:
-            raise ValidationError(
-                _("Task name must be at least 2 characters long")
-            )
+        validate_task_name(name)
         return name
+
+
+class TaskBulkForm(Form):
+    """Одно действие над несколькими выбранными задачами"""
+
+    # Действие -> поле формы со значением для него
+    ACTION_FIELDS = {
+        "status": "status",
+        "executor": "executor",
+        "add_label": "label",
+        "remove_label": "label",
+        "delete": None,
+    }
+
+    action = ChoiceField(
+        label=_("Action"),
+        choices=[
+            ("status", _("Set status")),
+            ("executor", _("Set executor")),
+            ("add_label", _("Add label")),
+            ("remove_label", _("Remove label")),
+            ("delete", _("Delete")),
+        ],
+        widget=Select(attrs={"class": "form-select"}),
+    )
+    # Флажки выбора рендерятся в строках таблицы задач, а не формой
+    tasks = ModelMultipleChoiceField(
+        queryset=Task.objects.only(
+            "name", "author", "status", "executor", "created_at", "closed_at"
+        ),
+        widget=MultipleHiddenInput,
+        error_messages={"required": _("Select at least one task")},
+    )
+    status = ModelChoiceField(
+        queryset=Status.objects.all(),
+        required=False,
+        label=_("Status"),
+        widget=Select(attrs={"class": "form-select"}),
+    )
+    executor = ModelChoiceField(
+        queryset=User.objects.all(),
+        required=False,
+        label=_("Executor"),
+        empty_label=_("No executor"),
+        widget=AutocompleteSelect(
+            "tasks:autocomplete_users", attrs={"class": "form-select"}
+        ),
+    )
+    label = ModelChoiceField(
+        queryset=Label.objects.all(),
+        required=False,
+        label=_("Label"),
+        widget=AutocompleteSelect(
+            "tasks:autocomplete_labels", attrs={"class": "form-select"}
+        ),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        status_choices.bind(self.fields["status"])
+        executor_choices.bind(self.fields["executor"])
+        label_choices.bind(self.fields["label"])
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        field = self.ACTION_FIELDS.get(action)
+        # Пустой исполнитель означает "снять исполнителя"
+        if field in ("status", "label") and not cleaned_data.get(field):
+            self.add_error(
+                field,
+                ValidationError(
+                    _("Choose a value for this action"), code="required"
+                ),
+            )
+        return cleaned_data
+
+    def save(self, user):
+        """Применяет действие одной транзакцией.
+
+        Статус и исполнитель меняются одним bulk_update, метки - одной
+        вставкой или удалением в таблице связей. Удалить можно только свои
+        задачи, как и в TaskDeleteView. Возвращает число обработанных задач
+        и список задач, которые удалить нельзя.
+        """
+        action = self.cleaned_data["action"]
+        tasks = list(self.cleaned_data["tasks"])
+        task_ids = [task.pk for task in tasks]
+        denied = []
+        now = timezone.now()
+        using = router.db_for_write(Task)
+        rows = Task.objects.using(using)
+        links = Task.labels.through.objects.using(using)
+
+        with transaction.atomic(using=using):
+            if action in ("status", "executor"):
+                changes, day_changes = [], []
+                fields = [action, "updated_at"]
+                for task in tasks:
+                    old = counters.task_values(task)
+                    old_days = rollups.task_days(task)
+                    setattr(task, action, self.cleaned_data[action])
+                    if action == "status":
+                        task.update_closed_at()
+                    # bulk_update не обновляет auto_now поля сам
+                    task.updated_at = now
+                    changes.append((old, counters.task_values(task)))
+                    day_changes.append((old_days, rollups.task_days(task)))
+                if action == "status":
+                    fields.append("closed_at")
+                rows.bulk_update(tasks, fields)
+                counters.move_tasks(changes, using)
+                rollups.move_tasks(day_changes, using)
+            elif action == "add_label":
+                links.bulk_create(
+                    [
+                        links.model(
+                            task_id=task_id, label=self.cleaned_data["label"]
+                        )
+                        for task_id in task_ids
+                    ],
+                    ignore_conflicts=True,
+                )
+                rows.filter(pk__in=task_ids).update(updated_at=now)
+                # Какие связи уже были, bulk_create с ignore_conflicts
+                # не сообщает - метку проще пересчитать
+                counters.recount(
+                    ["labels"], [self.cleaned_data["label"].pk], using
+                )
+            elif action == "remove_label":
+                removed, _deleted = links.filter(
+                    task_id__in=task_ids, label=self.cleaned_data["label"]
+                ).delete()
+                counters.add(
+                    "labels", {self.cleaned_data["label"].pk: -removed}, using
+                )
+                rows.filter(pk__in=task_ids).update(updated_at=now)
+            elif action == "delete":
+                denied = [task for task in tasks if task.author_id != user.pk]
+                tasks = [task for task in tasks if task.author_id == user.pk]
+                rows.filter(pk__in=[task.pk for task in tasks]).delete()
+            # bulk_update, update() и таблица связей обходят сигналы моделей
+            transaction.on_commit(task_list_version.increment, using=using)
+            if action != "delete":
+                broker.publish(UPDATE, task_ids, using)
+
+        return len(tasks), denied
+
+
+class TaskImportForm(Form):
+    """Файл для импорта задач в формате выгрузки"""
+
+    file = FileField(
+        label=_("File"),
+        help_text=_(
+            "CSV or JSON Lines with the same columns as the export. "
+            "Status, executor and labels are matched by name."
+        ),
+    )
+    format = ChoiceField(
+        label=_("Format"),
+        required=False,
+        choices=[("", _("By file extension"))]
+        + [(name, name.upper()) for name in IMPORT_FORMATS],
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        upload = cleaned_data.get("file")
+        if upload and not cleaned_data.get("format"):
+            extension = upload.name.rpartition(".")[2].lower()
+            if extension not in IMPORT_FORMATS:
+                self.add_error(
+                    "format",
+                    _("Cannot detect the file format, choose it explicitly"),
+                )
+            cleaned_data["format"] = extension
+        return cleaned_data
@@ -0,0 +1,201 @@
+import csv
+import json
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.utils.translation import gettext as _
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+from . import counters, rollups
+from .conditional import task_list_version
+from .events import CREATE, broker
+from .models import Task
+from .validators import validate_task_name
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class RejectedRow:
+    line: int
+    error: str
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    rejected: list = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        total = self.created + len(self.rejected)
+        return total / self.seconds if self.seconds else 0.0
+
+
+def read_rows(file, import_format):
+    """Строки файла как пары (номер строки, словарь полей).
+
+    Формат совпадает с выгрузкой: в CSV метки перечислены через запятую,
+    в JSON Lines - списком. Испорченная строка JSON дает словарь None.
+    """
+    if import_format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+class TaskImporter:
+    """Импорт задач пачками через bulk_create.
+
+    Статусы, метки и пользователи один раз загружаются в словари
+    "имя -> pk", поэтому проверка строки не обращается к базе. Каждая
+    пачка задач вместе со строками таблицы связей с метками вставляется
+    в отдельной транзакции. Автор всех задач - пользователь, от имени
+    которого идет импорт.
+    """
+
+    def __init__(self, author, batch_size=1000):
+        self.author = author
+        self.batch_size = batch_size
+        statuses = list(Status.objects.values_list("name", "pk", "is_closed"))
+        self.statuses = {name: pk for name, pk, _closed in statuses}
+        self.closed_statuses = {pk for _name, pk, closed in statuses if closed}
+        self.labels = dict(Label.objects.values_list("name", "pk"))
+        self.users = self._user_lookup()
+
+    @staticmethod
+    def _user_lookup():
+        """Исполнитель ищется по username или по полному имени (так он
+        выглядит в выгрузке), если полное имя не повторяется"""
+        rows = list(
+            User.objects.values_list(
+                "pk", "username", "first_name", "last_name"
+            )
+        )
+        full_names = {
+            pk: f"{first_name} {last_name}".strip()
+            for pk, _username, first_name, last_name in rows
+        }
+        counts = Counter(full_names.values())
+        lookup = {
+            name: pk
+            for pk, name in full_names.items()
+            if name and counts[name] == 1
+        }
+        lookup.update((username, pk) for pk, username, *_names in rows)
+        return lookup
+
+    def run(self, rows):
+        result = ImportResult()
+        started = time.perf_counter()
+        batch = []
+        for line, row in rows:
+            try:
+                batch.append(self.build(row))
+            except ValidationError as error:
+                result.rejected.append(
+                    RejectedRow(line, " ".join(error.messages))
+                )
+                continue
+            if len(batch) >= self.batch_size:
+                result.created += self.insert(batch)
+                batch = []
+        if batch:
+            result.created += self.insert(batch)
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def build(self, row):
+        """Задача и pk ее меток из строки файла или ValidationError"""
+        if row is None:
+            raise ValidationError(_("Malformed row"))
+
+        name = (row.get("name") or "").strip()
+        if not name:
+            raise ValidationError(_("Task name is required"))
+        validate_task_name(name)
+        max_length = Task._meta.get_field("name").max_length
+        if len(name) > max_length:
+            raise ValidationError(
+                _("Task name is longer than %(max)d characters")
+                % {"max": max_length}
+            )
+
+        status_id = self.lookup(
+            self.statuses, row.get("status"), _("Unknown status: %(value)s")
+        )
+        if status_id is None:
+            raise ValidationError(_("Status is required"))
+        executor_id = self.lookup(
+            self.users, row.get("executor"), _("Unknown user: %(value)s")
+        )
+
+        labels = row.get("labels") or []
+        if isinstance(labels, str):
+            labels = labels.split(",")
+        label_ids = {
+            self.lookup(self.labels, label, _("Unknown label: %(value)s"))
+            for label in labels
+        }
+        label_ids.discard(None)
+
+        task = Task(
+            name=name,
+            description=row.get("description") or "",
+            status_id=status_id,
+            author=self.author,
+            executor_id=executor_id,
+        )
+        return task, label_ids
+
+    @staticmethod
+    def lookup(mapping, value, error):
+        value = str(value or "").strip()
+        if not value:
+            return None
+        try:
+            return mapping[value]
+        except KeyError:
+            raise ValidationError(error % {"value": value}) from None
+
+    def insert(self, batch):
+        through = Task.labels.through
+        using = router.db_for_write(Task)
+        with transaction.atomic(using=using):
+            tasks = [task for task, _labels in batch]
+            rollups.close_tasks(tasks, self.closed_statuses)
+            tasks = Task.objects.using(using).bulk_create(tasks)
+            links = through.objects.using(using).bulk_create(
+                through(task_id=task.pk, label_id=label_id)
+                for task, (_task, label_ids) in zip(tasks, batch)
+                for label_id in label_ids
+            )
+            # bulk_create не отправляет post_save
+            counters.add_tasks(
+                (counters.task_values(task) for task in tasks), using=using
+            )
+            counters.add(
+                "labels", Counter(link.label_id for link in links), using
+            )
+            rollups.add_tasks(
+                (rollups.task_days(task) for task in tasks), using=using
+            )
+            transaction.on_commit(task_list_version.increment, using=using)
+            broker.publish(CREATE, (task.pk for task in tasks), using)
+        return len(tasks)
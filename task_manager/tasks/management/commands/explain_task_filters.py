@@ -0,0 +1,120 @@
+import re
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.models import Task
+from task_manager.tasks.pagination import Cursor, KeysetPaginator
+from task_manager.tasks.views import TasksListView
+from task_manager.users.models import User
+
+# Сочетания фильтров TaskFilter, которые встречаются на странице задач
+CANONICAL_FILTERS = {
+    "all": {},
+    "status": {"status": 1},
+    "executor": {"executor": 1},
+    "labels": {"labels": 1},
+    "self_tasks": {"self_tasks": True},
+    "status+executor": {"status": 1, "executor": 1},
+    "status+labels": {"status": 1, "labels": 1},
+    "status+self_tasks": {"status": 1, "self_tasks": True},
+    "executor+self_tasks": {"executor": 1, "self_tasks": True},
+    "labels+self_tasks": {"labels": 1, "self_tasks": True},
+}
+
+PROBLEMS = {
+    "sqlite": [
+        (re.compile(r"\bSCAN (TABLE )?\w+$"), "sequential scan"),
+        (re.compile(r"USE TEMP B-TREE FOR .*ORDER BY"), "extra sort"),
+    ],
+    "postgresql": [
+        (re.compile(r"\bSeq Scan\b"), "sequential scan"),
+        (re.compile(r"\bSort\b"), "extra sort"),
+    ],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN for every canonical TaskFilter combination and fails "
+        "if a plan contains a sequential scan or an extra sort"
+    )
+
+    def handle(self, *args, **options):
+        problems = PROBLEMS.get(connection.vendor)
+        if problems is None:
+            raise CommandError(
+                f"EXPLAIN checks are not supported for {connection.vendor}"
+            )
+
+        paginator = KeysetPaginator(
+            TasksListView.paginate_by, TasksListView.ordering
+        )
+        cursors = {
+            "first page": None,
+            "next page": Cursor([timezone.now(), 0]),
+        }
+        failures = []
+        for name, values in CANONICAL_FILTERS.items():
+            queryset = self.filter_queryset(values)
+            for page, cursor in cursors.items():
+                plan = self.explain(
+                    paginator.get_page_queryset(queryset, cursor)
+                )
+                found = sorted(
+                    {
+                        problem
+                        for line in plan.splitlines()
+                        for pattern, problem in problems
+                        if pattern.search(line.strip())
+                    }
+                )
+                label = f"{name} ({page})"
+                if found:
+                    failures.append(label)
+                    self.stdout.write(
+                        self.style.ERROR(f"{label}: {', '.join(found)}")
+                    )
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"{label}: OK"))
+                if found or options["verbosity"] > 1:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} filter combination(s) are not served by "
+                f"an index: {', '.join(failures)}"
+            )
+
+    def filter_queryset(self, values):
+        """Применяет фильтры TaskFilter напрямую, минуя валидацию формы:
+        для EXPLAIN не нужны существующие статусы, метки и пользователи"""
+        request = SimpleNamespace(user=User(pk=1))
+        filterset = TaskFilter(
+            queryset=Task.objects.select_related(
+                "status", "author", "executor"
+            ),
+            request=request,
+        )
+        queryset = filterset.queryset
+        for name, value in values.items():
+            queryset = filterset.filters[name].filter(queryset, value)
+        return queryset
+
+    def explain(self, queryset):
+        """План запроса.
+
+        В PostgreSQL seq scan и сортировка запрещаются на время EXPLAIN:
+        на маленькой таблице планировщик выбирает их сам, а так в плане
+        они останутся, только если подходящего индекса нет.
+        """
+        if connection.vendor != "postgresql":
+            return queryset.explain()
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+                cursor.execute("SET LOCAL enable_sort = off")
+            return queryset.explain()
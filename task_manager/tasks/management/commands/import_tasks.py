@@ -0,0 +1,77 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks.importer import IMPORT_FORMATS, TaskImporter, read_rows
+from task_manager.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports tasks from a CSV or JSON Lines file in the export format. "
+        "Rejected rows are written to an error report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSON Lines file")
+        parser.add_argument(
+            "--author",
+            required=True,
+            help="Username of the author of the imported tasks",
+        )
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="File format; by default taken from the file extension",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tasks per INSERT batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--errors",
+            help="Write rejected rows to this CSV file instead of stderr",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        import_format = options["format"] or path.suffix.lstrip(".").lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Cannot detect the format of {path}, use --format"
+            )
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        try:
+            author = User.objects.get(username=options["author"])
+        except User.DoesNotExist:
+            raise CommandError(
+                f"User {options['author']} does not exist"
+            ) from None
+
+        importer = TaskImporter(author, options["batch_size"])
+        with path.open(encoding="utf-8-sig", newline="") as file:
+            result = importer.run(read_rows(file, import_format))
+
+        if result.rejected:
+            self.write_errors(result.rejected, options["errors"])
+        message = (
+            f"Imported {result.created} task(s), rejected "
+            f"{len(result.rejected)} row(s) in {result.seconds:.2f} s "
+            f"({result.rows_per_second:.0f} rows/s)"
+        )
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def write_errors(self, rejected, path):
+        if path:
+            with open(path, "w", encoding="utf-8", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(["line", "error"])
+                writer.writerows((row.line, row.error) for row in rejected)
+            self.stderr.write(f"Rejected rows are written to {path}")
+            return
+        for row in rejected:
+            self.stderr.write(f"line {row.line}: {row.error}")
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from task_manager.tasks.counters import COUNTERS, recount
+
+
+class Command(BaseCommand):
+    help = (
+        "Finds task counters of statuses, labels and users that differ "
+        "from the tasks table and recounts them"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "counters",
+            nargs="*",
+            metavar="counter",
+            help=f"Counters to check: {', '.join(COUNTERS)} (default: all)",
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options["counters"]) - set(COUNTERS)
+        if unknown:
+            raise CommandError(
+                f"Unknown counters: {', '.join(sorted(unknown))}"
+            )
+        repaired = recount(options["counters"] or None)
+        if options["verbosity"] < 1:
+            return
+        for name, count in repaired.items():
+            style = self.style.WARNING if count else self.style.SUCCESS
+            self.stdout.write(style(f"{name}: {count} row(s) recounted"))
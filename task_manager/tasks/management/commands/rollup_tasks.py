@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from task_manager.tasks.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the daily task statistics shown on the home page from "
+        "the tasks table"
+    )
+
+    def handle(self, *args, **options):
+        days = rebuild()
+        if options["verbosity"] >= 1:
+            self.stdout.write(self.style.SUCCESS(f"{days} day(s) rebuilt"))
@@ -0,0 +1,205 @@
+import random
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, rollups
+from task_manager.tasks.choices import (
+    executor_choices,
+    label_choices,
+    status_choices,
+)
+from task_manager.tasks.conditional import task_list_version
+from task_manager.tasks.models import Task
+from task_manager.users.backends import forget_users
+from task_manager.users.models import User
+
+# Пароль всех сгенерированных пользователей
+SEED_PASSWORD = "seed-password"
+
+# Доля задач с 0, 1, 2, ... метками: у большинства одна-две метки,
+# у немногих - много
+LABEL_COUNT_WEIGHTS = [30, 35, 20, 10, 4, 1]
+
+# Доля задач с назначенным исполнителем
+EXECUTOR_SHARE = 0.8
+
+WORDS = (
+    "отчет",
+    "сервер",
+    "клиент",
+    "договор",
+    "релиз",
+    "ошибка",
+    "интерфейс",
+    "база",
+    "данные",
+    "оплата",
+    "заказ",
+    "доставка",
+    "склад",
+    "сайт",
+    "почта",
+    "встреча",
+    "презентация",
+    "бюджет",
+    "тест",
+    "документация",
+    "миграция",
+    "резервная",
+    "копия",
+    "доступ",
+    "настройка",
+    "обновление",
+    "проверка",
+    "анализ",
+    "план",
+    "поддержка",
+)
+
+
+def zipf_weights(count):
+    """Веса "популярности": первый элемент выбирают вдвое чаще второго,
+    втрое чаще третьего и т. д."""
+    return [1 / rank for rank in range(1, count + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users, statuses, labels and tasks with bulk inserts. "
+        "Repeated runs add to the existing data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=50)
+        parser.add_argument("--statuses", type=int, default=6)
+        parser.add_argument("--labels", type=int, default=40)
+        parser.add_argument("--tasks", type=int, default=1000)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Tasks per INSERT batch (default: 5000)",
+        )
+        parser.add_argument(
+            "--seed", type=int, help="Random seed for reproducible data"
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        self.random = random.Random(options["seed"])
+        started = time.perf_counter()
+
+        self.create_users(options["users"])
+        self.create_named(Status, "status", options["statuses"])
+        self.create_named(Label, "label", options["labels"])
+
+        user_ids = list(User.objects.values_list("pk", flat=True))
+        status_ids = list(Status.objects.values_list("pk", flat=True))
+        label_ids = list(Label.objects.values_list("pk", flat=True))
+        if options["tasks"] and not (user_ids and status_ids):
+            raise CommandError("Tasks need at least one user and one status")
+
+        created = 0
+        while created < options["tasks"]:
+            size = min(options["batch_size"], options["tasks"] - created)
+            self.create_tasks(size, user_ids, status_ids, label_ids)
+            created += size
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{created} task(s) created")
+
+        # bulk_create обходит сигналы, которые сбрасывают эти версии
+        status_choices.invalidate()
+        label_choices.invalidate()
+        executor_choices.invalidate()
+        task_list_version.increment()
+
+        seconds = time.perf_counter() - started
+        rate = created / seconds if seconds else 0
+        if options["verbosity"] < 1:
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {options['users']} user(s), "
+                f"{options['statuses']} status(es), "
+                f"{options['labels']} label(s) and {created} task(s) "
+                f"in {seconds:.2f} s ({rate:.0f} tasks/s)"
+            )
+        )
+
+    def create_users(self, count):
+        # Хеш пароля считается один раз: это самая медленная часть
+        password = make_password(SEED_PASSWORD)
+        start = User.objects.filter(username__startswith="seed_").count()
+        users = User.objects.bulk_create(
+            User(
+                username=f"seed_{number}",
+                first_name=self.random.choice(("Анна", "Иван", "Мария")),
+                last_name=f"Тестова-{number}",
+                password=password,
+            )
+            for number in range(start, start + count)
+        )
+        # Номер удаленного пользователя может достаться новому, а сигнал,
+        # который сбрасывает кеш пользователя сессии, не срабатывает
+        forget_users(user.pk for user in users)
+
+    def create_named(self, model, prefix, count):
+        start = model.objects.filter(name__startswith=f"{prefix} ").count()
+        model.objects.bulk_create(
+            model(name=f"{prefix} {number}")
+            for number in range(start, start + count)
+        )
+
+    def create_tasks(self, count, user_ids, status_ids, label_ids):
+        status_weights = zipf_weights(len(status_ids))
+        label_weights = zipf_weights(len(label_ids))
+        tasks, labels = [], []
+        for _number in range(count):
+            status_id = self.random.choices(status_ids, status_weights)[0]
+            executor_id = None
+            if self.random.random() < EXECUTOR_SHARE:
+                executor_id = self.random.choice(user_ids)
+            tasks.append(
+                Task(
+                    name=self.sentence(2, 6).capitalize(),
+                    description=self.sentence(0, 30),
+                    status_id=status_id,
+                    author_id=self.random.choice(user_ids),
+                    executor_id=executor_id,
+                )
+            )
+            labels.append(self.pick_labels(label_ids, label_weights))
+
+        through = Task.labels.through
+        with transaction.atomic():
+            rollups.close_tasks(tasks, rollups.closed_status_ids())
+            Task.objects.bulk_create(tasks)
+            links = through.objects.bulk_create(
+                through(task_id=task.pk, label_id=label_id)
+                for task, task_labels in zip(tasks, labels)
+                for label_id in task_labels
+            )
+            counters.add_tasks(counters.task_values(task) for task in tasks)
+            counters.add("labels", Counter(link.label_id for link in links))
+            rollups.add_tasks(rollups.task_days(task) for task in tasks)
+
+    def pick_labels(self, label_ids, weights):
+        count = self.random.choices(
+            range(len(LABEL_COUNT_WEIGHTS)), LABEL_COUNT_WEIGHTS
+        )[0]
+        count = min(count, len(label_ids))
+        picked = set()
+        while len(picked) < count:
+            picked.add(self.random.choices(label_ids, weights)[0])
+        return picked
+
+    def sentence(self, min_words, max_words):
+        count = self.random.randint(min_words, max_words)
+        return " ".join(self.random.choices(WORDS, k=count))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("labels", "0001_initial"),
+        ("statuses", "0001_initial"),
+        ("tasks", "0002_task_labels"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="tasks_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="tasks_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["executor", "-created_at", "-id"],
+                name="tasks_executor_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="tasks_author_created_idx",
+            ),
+        ),
+        # Фильтр по метке идет от метки к задачам: (label_id, task_id)
+        # покрывает и поиск по метке, и получение id задач без чтения таблицы
+        migrations.RunSQL(
+            sql=(
+                "CREATE INDEX tasks_labels_label_task_idx "
+                "ON tasks_labels (label_id, task_id)"
+            ),
+            reverse_sql="DROP INDEX tasks_labels_label_task_idx",
+        ),
+    ]
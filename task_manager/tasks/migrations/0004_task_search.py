@@ -0,0 +1,87 @@
+from django.db import migrations
+
+from task_manager.operations import RunVendorSQL
+
+# В PostgreSQL - сгенерированная колонка tsvector (название весит больше
+# описания) с GIN-индексом. В SQLite - FTS5-таблица с внешним содержимым
+# (сами тексты хранятся только в tasks), которую обновляют триггеры.
+#
+# SQLite при перестройке таблицы tasks (ALTER, который SQLite не умеет
+# выполнять на месте) удаляет ее триггеры, поэтому миграция, которая
+# перестраивает tasks, должна создать их заново.
+SQLITE_TRIGGERS = [
+    """
+    CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER tasks_fts_update AFTER UPDATE OF name, description
+    ON tasks BEGIN
+        INSERT INTO tasks_fts (tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0003_task_filter_indexes"),
+    ]
+
+    operations = [
+        RunVendorSQL(
+            sql={
+                "postgresql": [
+                    """
+                    ALTER TABLE tasks ADD COLUMN search_vector tsvector
+                    GENERATED ALWAYS AS (
+                        setweight(
+                            to_tsvector('russian', coalesce(name, '')), 'A'
+                        )
+                        || setweight(
+                            to_tsvector('russian', coalesce(description, '')),
+                            'B'
+                        )
+                    ) STORED
+                    """,
+                    (
+                        "CREATE INDEX tasks_search_vector_idx "
+                        "ON tasks USING GIN (search_vector)"
+                    ),
+                ],
+                "sqlite": [
+                    (
+                        "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+                        "name, description, "
+                        "content='tasks', content_rowid='id', "
+                        "tokenize='unicode61 remove_diacritics 2')"
+                    ),
+                    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+                    *SQLITE_TRIGGERS,
+                ],
+            },
+            reverse_sql={
+                "postgresql": [
+                    "DROP INDEX tasks_search_vector_idx",
+                    "ALTER TABLE tasks DROP COLUMN search_vector",
+                ],
+                "sqlite": [
+                    "DROP TRIGGER tasks_fts_insert",
+                    "DROP TRIGGER tasks_fts_delete",
+                    "DROP TRIGGER tasks_fts_update",
+                    "DROP TABLE tasks_fts",
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    """Начальные значения счетчиков задач, см. tasks/counters.py"""
+    db_alias = schema_editor.connection.alias
+    Task = apps.get_model("tasks", "Task")
+    through = Task.labels.through
+    counters = [
+        (apps.get_model("statuses", "Status"), "tasks_count", Task, "status"),
+        (apps.get_model("labels", "Label"), "tasks_count", through, "label"),
+        (
+            apps.get_model("users", "User"),
+            "authored_tasks_count",
+            Task,
+            "author",
+        ),
+        (
+            apps.get_model("users", "User"),
+            "assigned_tasks_count",
+            Task,
+            "executor",
+        ),
+    ]
+    for model, field, source, relation in counters:
+        tasks = (
+            source.objects.filter(**{relation: OuterRef("pk")})
+            .order_by()
+            .values(relation)
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        model.objects.using(db_alias).update(
+            **{field: Coalesce(Subquery(tasks), Value(0))}
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tasks", "0004_task_search"),
+        ("statuses", "0003_status_tasks_count"),
+        ("labels", "0003_label_tasks_count"),
+        ("users", "0003_user_task_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:16
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+import task_manager.fields
+
+
+def fill_created(apps, schema_editor):
+    """Созданные задачи по дням, см. tasks/rollups.py. Закрытых пока нет:
+    статусов с is_closed до этой миграции не было"""
+    db_alias = schema_editor.connection.alias
+    Task = apps.get_model("tasks", "Task")
+    DailyTaskStats = apps.get_model("tasks", "DailyTaskStats")
+    days = (
+        Task.objects.using(db_alias)
+        .annotate(day=TruncDate("created_at"))
+        .order_by()
+        .values_list("day")
+        .annotate(count=Count("pk"))
+    )
+    DailyTaskStats.objects.using(db_alias).bulk_create(
+        DailyTaskStats(day=day, created=count) for day, count in days
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("statuses", "0004_status_is_closed"),
+        ("tasks", "0005_task_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyTaskStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(unique=True, verbose_name="Day")),
+                (
+                    "created",
+                    task_manager.fields.CounterField(verbose_name="Created"),
+                ),
+                (
+                    "closed",
+                    task_manager.fields.CounterField(verbose_name="Closed"),
+                ),
+            ],
+            options={
+                "verbose_name": "Daily task statistics",
+                "verbose_name_plural": "Daily task statistics",
+                "db_table": "task_daily_stats",
+            },
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="closed_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Closed at"
+            ),
+        ),
+        migrations.RunPython(fill_created, migrations.RunPython.noop),
+    ]
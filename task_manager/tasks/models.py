@@ -1,15 +1,20 @@
 from django.contrib.auth import get_user_model
+from django.db import router, transaction
 from django.db.models import (
     PROTECT,
     CharField,
+    DateField,
     DateTimeField,
     ForeignKey,
+    Index,
     ManyToManyField,
     Model,
     TextField,
 )
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.fields import CounterField
 from task_manager.labels.models import Label
 from task_manager.statuses.models import Status
 
@@ -39,12 +44,78 @@ class Task(Model):
     )
     created_at = DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
     updated_at = DateTimeField(auto_now=True, verbose_name=_("Updated at"))
+    # Время перехода в закрывающий статус (Status.is_closed); меняется
+    # при сохранении вместе со статусом
+    closed_at = DateTimeField(
+        null=True, blank=True, editable=False, verbose_name=_("Closed at")
+    )
 
     class Meta:
         verbose_name = _("Task")
         verbose_name_plural = _("Tasks")
         db_table = "tasks"
         ordering = ["-created_at"]
+        # Индексы повторяют формы запросов TaskFilter: равенство по одному
+        # из полей фильтра + ORDER BY created_at DESC, id DESC для пагинации
+        indexes = [
+            Index(fields=["-created_at", "-id"], name="tasks_created_idx"),
+            Index(
+                fields=["status", "-created_at", "-id"],
+                name="tasks_status_created_idx",
+            ),
+            Index(
+                fields=["executor", "-created_at", "-id"],
+                name="tasks_executor_created_idx",
+            ),
+            Index(
+                fields=["author", "-created_at", "-id"],
+                name="tasks_author_created_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "status" in update_fields:
+            self.update_closed_at(kwargs.get("using"))
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "closed_at"}
+        # Сигналы post_save меняют счетчики задач (counters.py) и дневные
+        # сводки (rollups.py) - в той же транзакции, что и сама задача
+        with transaction.atomic(using=kwargs.get("using"), savepoint=False):
+            super().save(*args, **kwargs)
+
+    def update_closed_at(self, using=None):
+        """Ставит closed_at при переходе в закрывающий статус и снимает
+        при возврате в открытый"""
+        if Task.status.is_cached(self):
+            closed = self.status.is_closed
+        else:
+            using = using or router.db_for_write(Task, instance=self)
+            closed = (
+                Status.objects.using(using)
+                .filter(pk=self.status_id, is_closed=True)
+                .exists()
+            )
+        if not closed:
+            self.closed_at = None
+        elif self.closed_at is None:
+            self.closed_at = timezone.now()
+
+
+class DailyTaskStats(Model):
+    """Число созданных и закрытых задач за день, см. rollups.py"""
+
+    day = DateField(unique=True, verbose_name=_("Day"))
+    created = CounterField(verbose_name=_("Created"))
+    closed = CounterField(verbose_name=_("Closed"))
+
+    class Meta:
+        verbose_name = _("Daily task statistics")
+        verbose_name_plural = _("Daily task statistics")
+        db_table = "task_daily_stats"
+
+    def __str__(self):
+        return str(self.day)
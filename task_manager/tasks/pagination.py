@@ -0,0 +1,176 @@
+from datetime import datetime
+
+from django.core import signing
+from django.db.models import Q
+from django.http import QueryDict
+
+CURSOR_SALT = "task_manager.tasks.cursor"
+
+
+class Cursor:
+    """Позиция в выборке: значения ключа сортировки, направление, фильтры
+    и сама сортировка"""
+
+    def __init__(self, values, backwards=False, params=None, ordering=()):
+        self.values = list(values)
+        self.backwards = backwards
+        self.params = params if params is not None else QueryDict()
+        self.ordering = tuple(ordering)
+
+    def encode(self):
+        payload = {
+            "v": [_serialize(value) for value in self.values],
+            "b": self.backwards,
+            "f": list(self.params.lists()),
+            "o": list(self.ordering),
+        }
+        return signing.dumps(payload, salt=CURSOR_SALT, compress=True)
+
+    @classmethod
+    def decode(cls, token, orderings=None):
+        """Возвращает курсор или None, если токен пустой, подделан или
+        выдан для сортировки не из orderings.
+
+        Подпись у курсоров всех списков общая: без проверки сортировки
+        курсор одного списка подставил бы в другой чужие фильтры.
+        """
+        if not token:
+            return None
+        try:
+            payload = signing.loads(token, salt=CURSOR_SALT)
+            ordering = tuple(payload["o"])
+            if orderings is not None and ordering not in {
+                tuple(allowed) for allowed in orderings
+            }:
+                return None
+            params = QueryDict(mutable=True)
+            for key, values in payload["f"]:
+                params.setlist(key, values)
+            params._mutable = False
+            return cls(payload["v"], bool(payload["b"]), params, ordering)
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            return None
+
+
+class KeysetPage:
+    """Страница keyset-пагинации, совместимая по интерфейсу с page_obj"""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Постраничный вывод по ключу сортировки без OFFSET и COUNT(*).
+
+    Последнее поле в ordering должно быть уникальным (обычно id), иначе
+    записи с одинаковым ключом на границе страниц могут потеряться.
+    Каждая страница - это один запрос с условием "после курсора" и
+    LIMIT per_page + 1, поэтому страница N стоит столько же, сколько первая.
+    """
+
+    def __init__(self, per_page, ordering=("-created_at", "-id")):
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+
+    def get_page_queryset(self, queryset, cursor=None):
+        """Запрос одной страницы: условие по курсору, ORDER BY и LIMIT"""
+        ordering = self.ordering
+        if cursor is not None and cursor.backwards:
+            ordering = self._reverse(ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(ordering, cursor.values))
+        return queryset[: self.per_page + 1]
+
+    def paginate(self, queryset, cursor=None, params=None):
+        """Страница после курсора; курсор другой сортировки не подходит
+        к ключу, и с ним выводится первая страница"""
+        cursor = self._check_cursor(cursor)
+        rows = list(self.get_page_queryset(queryset, cursor))
+        return self._page(rows, cursor, params)
+
+    async def apaginate(self, queryset, cursor=None, params=None):
+        """paginate() для асинхронных view: страница читается через
+        aiterator одной пачкой вместе с метками"""
+        cursor = self._check_cursor(cursor)
+        rows = [
+            obj
+            async for obj in self.get_page_queryset(queryset, cursor).aiterator(
+                chunk_size=self.per_page + 1
+            )
+        ]
+        return self._page(rows, cursor, params)
+
+    def _check_cursor(self, cursor):
+        if cursor is not None and cursor.ordering != self.ordering:
+            return None
+        return cursor
+
+    def _page(self, rows, cursor, params):
+        params = params if params is not None else QueryDict()
+        backwards = cursor is not None and cursor.backwards
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if backwards:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = self._cursor(rows[-1], False, params)
+        if rows and has_previous:
+            previous_cursor = self._cursor(rows[0], True, params)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def _key(self, obj):
+        return [getattr(obj, field.lstrip("-")) for field in self.ordering]
+
+    def _cursor(self, obj, backwards, params):
+        return Cursor(self._key(obj), backwards, params, self.ordering).encode()
+
+    @staticmethod
+    def _reverse(ordering):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in ordering
+        )
+
+    @staticmethod
+    def _after(ordering, values):
+        """Строит (a < x) OR (a = x AND b < y) OR ... для ключа сортировки"""
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        return condition
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
@@ -0,0 +1,176 @@
+"""Дневные сводки по задачам для главной страницы.
+
+DailyTaskStats хранит на каждый день число созданных и закрытых задач:
+задача учтена в дне своего created_at и, пока закрыта, в дне closed_at.
+Строки меняются запросом UPDATE ... SET n = n + delta в той же
+транзакции, что и задачи, как счетчики в counters.py: сохранение и
+удаление задачи - в signals.py, массовые операции - там, где они
+выполняются. Поэтому главная страница читает только строки за выбранные
+дни, а распределение задач по статусам, исполнителям и меткам берет из
+счетчиков counters.py.
+
+Если сводки разошлись с задачами, rebuild() собирает их заново по
+таблице задач - команда manage.py rollup_tasks.
+"""
+
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from task_manager.statuses.models import Status
+
+from .models import DailyTaskStats, Task
+
+# Поле сводки: поле задачи с моментом события
+FIELDS = {
+    "created": "created_at",
+    "closed": "closed_at",
+}
+
+
+def day_of(value):
+    return None if value is None else timezone.localdate(value)
+
+
+def task_days(task):
+    """Дни, в которых учтена задача: {поле сводки: день или None}"""
+    return {
+        name: day_of(getattr(task, attname)) for name, attname in FIELDS.items()
+    }
+
+
+def stored_days(values):
+    """То же для значений из counters.stored_values(..., extra=FIELDS)"""
+    return {name: day_of(values[attname]) for name, attname in FIELDS.items()}
+
+
+def add(name, deltas, using=None):
+    """Прибавляет к полю сводки {день: delta}; строка дня создается при
+    первом событии"""
+    rows = DailyTaskStats.objects.using(using)
+    for day, delta in deltas.items():
+        if day is None or not delta:
+            continue
+        change = {name: F(name) + delta}
+        if not rows.filter(day=day).update(**change):
+            rows.bulk_create([DailyTaskStats(day=day)], ignore_conflicts=True)
+            rows.filter(day=day).update(**change)
+
+
+def add_tasks(tasks, sign=1, using=None):
+    """Учитывает созданные (sign=1) или удаленные (sign=-1) задачи:
+    tasks - результаты task_days()"""
+    deltas = {name: Counter() for name in FIELDS}
+    for days in tasks:
+        for name, day in days.items():
+            deltas[name][day] += sign
+    for name, counter in deltas.items():
+        add(name, counter, using)
+
+
+def move_tasks(changes, using=None):
+    """Учитывает смену дней задач: [(старые дни, новые дни)]"""
+    deltas = {name: Counter() for name in FIELDS}
+    for old, new in changes:
+        for name in FIELDS:
+            if old[name] != new[name]:
+                deltas[name][old[name]] -= 1
+                deltas[name][new[name]] += 1
+    for name, counter in deltas.items():
+        add(name, counter, using)
+
+
+def closed_status_ids(using=None):
+    return set(
+        Status.objects.using(using)
+        .filter(is_closed=True)
+        .values_list("pk", flat=True)
+    )
+
+
+def close_tasks(tasks, closed_ids):
+    """closed_at для новых задач, созданных через bulk_create: сохранение
+    модели, которое ставит его само, там не вызывается. closed_ids -
+    результат closed_status_ids()"""
+    now = timezone.now()
+    for task in tasks:
+        task.closed_at = now if task.status_id in closed_ids else None
+
+
+def reclose_status(status, using=None):
+    """Закрывает или открывает задачи статуса, у которого сменился
+    is_closed"""
+    tasks = Task.objects.using(using).filter(status=status)
+    if status.is_closed:
+        tasks = tasks.filter(closed_at__isnull=True)
+        closed_at = timezone.now()
+        days = {timezone.localdate(closed_at): tasks.count()}
+    else:
+        tasks = tasks.filter(closed_at__isnull=False)
+        closed_at = None
+        days = {
+            day: -count
+            for day, count in tasks.annotate(day=TruncDate("closed_at"))
+            .order_by()
+            .values_list("day")
+            .annotate(count=Count("pk"))
+        }
+    tasks.update(closed_at=closed_at)
+    add("closed", days, using)
+
+
+def daily(days):
+    """Созданные и закрытые задачи за последние days дней, по дням"""
+    today = timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    rows = {
+        row.day: row
+        for row in DailyTaskStats.objects.filter(day__range=(start, today))
+    }
+    result = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        row = rows.get(day)
+        result.append(
+            {
+                "day": day,
+                "created": row.created if row else 0,
+                "closed": row.closed if row else 0,
+            }
+        )
+    return result
+
+
+def rebuild():
+    """Собирает сводки заново по таблице задач; возвращает число дней.
+
+    Заодно приводит closed_at в соответствие со статусами задач.
+    """
+    with transaction.atomic():
+        Task.objects.filter(
+            status__is_closed=True, closed_at__isnull=True
+        ).update(closed_at=F("updated_at"))
+        Task.objects.filter(
+            status__is_closed=False, closed_at__isnull=False
+        ).update(closed_at=None)
+        rows = {}
+        for name, attname in FIELDS.items():
+            counts = (
+                Task.objects.filter(**{f"{attname}__isnull": False})
+                .annotate(day=TruncDate(attname))
+                .order_by()
+                .values_list("day")
+                .annotate(count=Count("pk"))
+            )
+            for day, count in counts:
+                row = rows.setdefault(day, DailyTaskStats(day=day))
+                setattr(row, name, count)
+        DailyTaskStats.objects.all().delete()
+        DailyTaskStats.objects.bulk_create(
+            sorted(rows.values(), key=lambda row: row.day)
+        )
+    return len(rows)
@@ -0,0 +1,78 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+from .models import Task
+
+# Порядок выдачи поиска: сначала более релевантные, при равенстве - новые
+SEARCH_ORDERING = ("-search_rank", "-id")
+
+# Слова запроса. Все остальное (кавычки, операторы, скобки) отбрасывается,
+# поэтому пользовательский ввод не может сломать синтаксис tsquery или MATCH
+WORD_RE = re.compile(r"\w+")
+
+TS_CONFIG = "russian"
+
+
+def search_tasks(queryset, query):
+    """Оставляет задачи, в названии или описании которых есть все слова
+    запроса (каждое - как начало слова), и добавляет поле search_rank.
+
+    Чем больше search_rank, тем выше задача в выдаче. Совпадения в
+    названии весят больше, чем в описании. Если в запросе нет ни одного
+    слова, queryset возвращается без изменений.
+    """
+    words = WORD_RE.findall(query)
+    if not words:
+        return queryset
+
+    connection = connections[queryset.db]
+    table = connection.ops.quote_name(Task._meta.db_table)
+    if connection.vendor == "postgresql":
+        match, rank = _postgresql_search(table, words)
+    else:
+        match, rank = _sqlite_search(table, words)
+    return queryset.filter(match).annotate(search_rank=rank)
+
+
+def _postgresql_search(table, words):
+    """Поиск по сгенерированной колонке search_vector с GIN-индексом"""
+    tsquery = " & ".join(f"{word}:*" for word in words)
+    query_sql = f"to_tsquery('{TS_CONFIG}', %s)"
+    match = RawSQL(
+        f"{table}.search_vector @@ {query_sql}",
+        [tsquery],
+        output_field=BooleanField(),
+    )
+    # ts_rank возвращает real: значение из курсора, записанное в JSON и
+    # переданное обратно как double precision, не совпало бы с ним, и
+    # keyset-пагинация повторяла бы или теряла строки с равным рангом
+    rank = RawSQL(
+        f"ts_rank({table}.search_vector, {query_sql})::double precision",
+        [tsquery],
+        output_field=FloatField(),
+    )
+    return match, rank
+
+
+def _sqlite_search(table, words):
+    """Поиск по FTS5-таблице tasks_fts, которую заполняют триггеры.
+
+    bm25 возвращает отрицательные числа (меньше - лучше), поэтому знак
+    меняется, чтобы search_rank сортировался так же, как в PostgreSQL.
+    """
+    fts_query = " ".join(f'"{word}"*' for word in words)
+    match = RawSQL(
+        f"{table}.id IN (SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH %s)",
+        [fts_query],
+        output_field=BooleanField(),
+    )
+    rank = RawSQL(
+        "(SELECT -bm25(tasks_fts, 10.0, 1.0) FROM tasks_fts "
+        f"WHERE tasks_fts MATCH %s AND rowid = {table}.id)",
+        [fts_query],
+        output_field=FloatField(),
+    )
+    return match, rank
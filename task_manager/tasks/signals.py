@@ -0,0 +1,182 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+from . import counters, rollups
+from .choices import executor_choices, label_choices, status_choices
+from .conditional import task_list_version
+from .events import CREATE, DELETE, UPDATE, broker
+from .models import Task
+
+# Поля пользователя, которые видны в списке исполнителей
+EXECUTOR_FIELDS = {"first_name", "last_name", "username"}
+
+# Версии списков меняются только после фиксации транзакции: иначе
+# параллельный запрос по новой версии собрал бы список из еще не
+# зафиксированных строк и положил бы его в кеш на сутки
+
+
+@receiver([post_save, post_delete], sender=Status)
+def invalidate_status_choices(sender, using, **kwargs):
+    transaction.on_commit(status_choices.invalidate, using=using)
+
+
+@receiver(post_save, sender=Status)
+def reclose_status_tasks(sender, instance, raw, using, **kwargs):
+    """Задачи статуса закрываются или открываются вместе с ним"""
+    if raw:
+        return
+    loaded = instance.__dict__.get("_loaded_is_closed")
+    if loaded is not None and loaded != instance.is_closed:
+        rollups.reclose_status(instance, using)
+    instance._loaded_is_closed = instance.is_closed
+
+
+@receiver([post_save, post_delete], sender=Label)
+def invalidate_label_choices(sender, using, **kwargs):
+    transaction.on_commit(label_choices.invalidate, using=using)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_executor_choices(sender, using, update_fields=None, **kwargs):
+    # Вход в систему сохраняет только last_login - список не меняется
+    if update_fields is None or EXECUTOR_FIELDS & set(update_fields):
+        transaction.on_commit(executor_choices.invalidate, using=using)
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_task_list(sender, using, **kwargs):
+    # Как и версии списков выше: ETag по новой версии не должен считаться
+    # по незафиксированным данным
+    transaction.on_commit(task_list_version.increment, using=using)
+
+
+@receiver(pre_save, sender=Task)
+def remember_counted_values(
+    sender, instance, update_fields, raw, using, **kwargs
+):
+    """Значения полей счетчиков и дней сводок до сохранения - из базы,
+    под блокировкой: объект в памяти мог устареть"""
+    instance._counted_values = None
+    if (
+        not instance._state.adding
+        and not raw
+        and counters.affects_counters(update_fields)
+    ):
+        instance._counted_values = counters.stored_values(
+            instance.pk, using, extra=rollups.FIELDS.values()
+        )
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, raw, using, **kwargs):
+    if raw:
+        return
+    if created:
+        counters.add_tasks([counters.task_values(instance)], using=using)
+        rollups.add_tasks([rollups.task_days(instance)], using=using)
+    elif instance._counted_values is not None:
+        counters.move_tasks(
+            [(instance._counted_values, counters.task_values(instance))],
+            using,
+        )
+        rollups.move_tasks(
+            [
+                (
+                    rollups.stored_days(instance._counted_values),
+                    rollups.task_days(instance),
+                )
+            ],
+            using,
+        )
+
+
+@receiver(pre_delete, sender=Task)
+def remember_task_labels(sender, instance, using, **kwargs):
+    # Связи с метками удаляются каскадом, без сигналов m2m_changed
+    instance._removed_labels = counters.linked_labels(
+        task_ids=[instance.pk], using=using
+    )
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, using, **kwargs):
+    counters.add_tasks([counters.task_values(instance)], -1, using)
+    rollups.add_tasks([rollups.task_days(instance)], -1, using)
+    counters.remove_labels(instance.__dict__.pop("_removed_labels", {}), using)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def count_labels(sender, instance, action, reverse, pk_set, using, **kwargs):
+    if action == "post_add" and pk_set:
+        # pk_set в post_add - только действительно добавленные связи
+        if reverse:
+            counters.add("labels", {instance.pk: len(pk_set)}, using)
+        else:
+            counters.add("labels", dict.fromkeys(pk_set, 1), using)
+    elif action in ("pre_remove", "pre_clear"):
+        # А в remove() - все переданные, в том числе не связанные:
+        # удаляемые связи считаем до удаления
+        if reverse:
+            links = counters.linked_labels(
+                task_ids=pk_set, label_ids=[instance.pk], using=using
+            )
+        else:
+            links = counters.linked_labels(
+                task_ids=[instance.pk], label_ids=pk_set, using=using
+            )
+        instance._removed_labels = links
+    elif action in ("post_remove", "post_clear"):
+        counters.remove_labels(
+            instance.__dict__.pop("_removed_labels", {}), using
+        )
+
+
+@receiver(post_save, sender=Task)
+def publish_task_saved(sender, instance, created, using, **kwargs):
+    broker.publish(CREATE if created else UPDATE, [instance.pk], using)
+
+
+@receiver(post_delete, sender=Task)
+def publish_task_deleted(sender, instance, using, **kwargs):
+    broker.publish(DELETE, [instance.pk], using)
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def touch_tasks_on_labels_change(
+    sender, instance, action, reverse, pk_set, using, **kwargs
+):
+    """Изменение меток обновляет updated_at задачи: от него зависят
+    ETag и Last-Modified страниц задач"""
+    if reverse and action == "pre_clear":
+        # После очистки уже не узнать, у каких задач была эта метка
+        instance._cleared_task_ids = list(
+            instance.tasks.values_list("pk", flat=True)
+        )
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        task_ids = [instance.pk]
+    elif action == "post_clear":
+        task_ids = instance.__dict__.pop("_cleared_task_ids", [])
+    else:
+        task_ids = pk_set
+    if task_ids:
+        Task.objects.using(using).filter(pk__in=task_ids).update(
+            updated_at=timezone.now()
+        )
+        transaction.on_commit(task_list_version.increment, using=using)
+        broker.publish(UPDATE, task_ids, using)
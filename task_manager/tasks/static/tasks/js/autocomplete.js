@@ -0,0 +1,89 @@
+// Подгрузка вариантов для списков с атрибутом data-autocomplete-url.
+// В HTML приходят только выбранные варианты; остальные запрашиваются
+// у сервера по мере ввода и постранично по кнопке "ещё".
+(function () {
+    "use strict";
+
+    const DELAY = 250;
+
+    function init(select) {
+        const url = select.dataset.autocompleteUrl;
+        const search = document.createElement("input");
+        search.type = "search";
+        search.className = "form-control form-control-sm mb-1";
+        search.placeholder = select.dataset.autocompletePlaceholder || "…";
+        search.setAttribute("aria-controls", select.id);
+        select.before(search);
+
+        const more = document.createElement("button");
+        more.type = "button";
+        more.className = "btn btn-link btn-sm p-0";
+        more.textContent = select.dataset.autocompleteMore || "…";
+        more.hidden = true;
+        select.after(more);
+
+        let next = null;
+        let timer = null;
+        let request = 0;
+
+        function keepOption(option) {
+            return option.value === "" || option.selected;
+        }
+
+        function render(results, append) {
+            if (!append) {
+                Array.from(select.options)
+                    .filter((option) => !keepOption(option))
+                    .forEach((option) => option.remove());
+            }
+            const present = new Set(
+                Array.from(select.options).map((option) => option.value)
+            );
+            results
+                .filter((item) => !present.has(String(item.id)))
+                .forEach((item) => select.add(new Option(item.text, item.id)));
+        }
+
+        function load(params, append) {
+            const current = ++request;
+            fetch(url + "?" + new URLSearchParams(params), {
+                credentials: "same-origin",
+                headers: { Accept: "application/json" },
+            })
+                .then((response) => response.json())
+                .then((data) => {
+                    if (current !== request) {
+                        return;
+                    }
+                    render(data.results, append);
+                    next = data.next;
+                    more.hidden = !next;
+                });
+        }
+
+        search.addEventListener("input", () => {
+            clearTimeout(timer);
+            timer = setTimeout(() => load({ q: search.value }, false), DELAY);
+        });
+        more.addEventListener("click", () => {
+            if (next) {
+                load({ cursor: next }, true);
+            }
+        });
+        select.addEventListener(
+            "focus",
+            () => {
+                if (!search.value) {
+                    load({ q: "" }, true);
+                }
+            },
+            { once: true }
+        );
+    }
+
+    document.addEventListener("DOMContentLoaded", () => {
+        document
+            .querySelectorAll("select[data-autocomplete-url]")
+            .forEach(init);
+    });
+})();
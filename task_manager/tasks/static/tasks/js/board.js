@@ -0,0 +1,152 @@
+// Доска задач. Карточки колонки загружаются, когда колонка видна, и
+// дальше постранично по кнопке "ещё". Перетаскивание карточки в другую
+// колонку меняет только статус задачи - запрос к tasks:move.
+(function () {
+    "use strict";
+
+    const board = document.getElementById("task-board");
+    if (!board) {
+        return;
+    }
+    const csrfToken = document.querySelector(
+        "input[name=csrfmiddlewaretoken]"
+    ).value;
+
+    function fetchCards(url, container, button) {
+        return fetch(url, {credentials: "same-origin"})
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then((html) => {
+                const template = document.createElement("template");
+                template.innerHTML = html;
+                if (button) {
+                    button.replaceWith(template.content);
+                } else {
+                    container.append(template.content);
+                }
+            });
+    }
+
+    function loadColumn(cards) {
+        // Пустая колонка приходит уже "загруженной"
+        if (cards.dataset.loaded) {
+            return;
+        }
+        cards.dataset.loaded = "true";
+        fetchCards(cards.dataset.url, cards).catch(() => {
+            delete cards.dataset.loaded;
+        });
+    }
+
+    const columns = board.querySelectorAll(".board-cards");
+    if (window.IntersectionObserver) {
+        const observer = new IntersectionObserver((entries) => {
+            entries
+                .filter((entry) => entry.isIntersecting)
+                .forEach((entry) => {
+                    observer.unobserve(entry.target);
+                    loadColumn(entry.target);
+                });
+        });
+        columns.forEach((cards) => observer.observe(cards));
+    } else {
+        columns.forEach(loadColumn);
+    }
+
+    board.addEventListener("click", (event) => {
+        const button = event.target.closest(".board-more");
+        if (button) {
+            button.disabled = true;
+            fetchCards(button.dataset.url, null, button).catch(() => {
+                button.disabled = false;
+            });
+        }
+    });
+
+    // Порядок карточек - как в списке: новые задачи выше
+    function isNewer(card, other) {
+        const created = Number(card.dataset.created);
+        const otherCreated = Number(other.dataset.created);
+        if (created !== otherCreated) {
+            return created > otherCreated;
+        }
+        return Number(card.dataset.taskId) > Number(other.dataset.taskId);
+    }
+
+    function place(card, cards) {
+        const next = Array.from(cards.querySelectorAll(".board-card")).find(
+            (other) => other !== card && isNewer(card, other)
+        );
+        const more = cards.querySelector(".board-more");
+        if (next) {
+            next.before(card);
+        } else if (more) {
+            // Карточка окажется на одной из следующих страниц колонки
+            card.remove();
+        } else {
+            cards.append(card);
+        }
+        const empty = cards.querySelector(".board-empty");
+        if (empty) {
+            empty.remove();
+        }
+    }
+
+    function addToCount(column, delta) {
+        const badge = column.querySelector(".board-count");
+        badge.textContent = Number(badge.textContent) + delta;
+    }
+
+    let dragged = null;
+
+    board.addEventListener("dragstart", (event) => {
+        dragged = event.target.closest(".board-card");
+        if (dragged) {
+            event.dataTransfer.effectAllowed = "move";
+            event.dataTransfer.setData("text/plain", dragged.dataset.taskId);
+        }
+    });
+    board.addEventListener("dragover", (event) => {
+        if (dragged && event.target.closest(".board-column")) {
+            event.preventDefault();
+        }
+    });
+    board.addEventListener("drop", (event) => {
+        const column = event.target.closest(".board-column");
+        const card = dragged;
+        dragged = null;
+        if (!card || !column) {
+            return;
+        }
+        event.preventDefault();
+        const source = card.closest(".board-column");
+        if (source === column) {
+            return;
+        }
+        const body = new FormData();
+        body.append("status", column.dataset.statusId);
+        fetch(card.dataset.moveUrl, {
+            method: "POST",
+            body: body,
+            credentials: "same-origin",
+            headers: {"X-CSRFToken": csrfToken},
+        }).then((response) => {
+            if (!response.ok) {
+                return;
+            }
+            addToCount(source, -1);
+            addToCount(column, 1);
+            const cards = column.querySelector(".board-cards");
+            if (cards.dataset.loaded) {
+                place(card, cards);
+            } else {
+                // Колонка загрузит карточку вместе с остальными
+                card.remove();
+            }
+        });
+    });
+})();
@@ -0,0 +1,100 @@
+// Живое обновление списка задач. Сервер присылает номера изменившихся
+// задач (Server-Sent Events), страница запрашивает их строки с теми же
+// фильтрами и заменяет на месте. Строки задач, которые удалены или ушли
+// из-под фильтра, убираются; новые задачи появляются на первой странице.
+(function () {
+    "use strict";
+
+    const body = document.querySelector("tbody[data-events-url]");
+    if (!body || !window.EventSource) {
+        return;
+    }
+    const firstPage = body.hasAttribute("data-first-page");
+
+    function findRow(id) {
+        return body.querySelector('tr[data-task-id="' + id + '"]');
+    }
+
+    function load(ids) {
+        const params = new URLSearchParams(body.dataset.filterQuery);
+        params.set("ids", ids.join(","));
+        return fetch(body.dataset.rowsUrl + "?" + params, {
+            credentials: "same-origin",
+            headers: {Accept: "text/html"},
+        })
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.text();
+            })
+            .then((html) => {
+                const template = document.createElement("template");
+                template.innerHTML = html;
+                const rows = new Map();
+                template.content
+                    .querySelectorAll("tr[data-task-id]")
+                    .forEach((row) => rows.set(row.dataset.taskId, row));
+                return rows;
+            });
+    }
+
+    function place(id, row, created) {
+        const current = findRow(id);
+        if (current && row) {
+            const box = current.querySelector(".task-select");
+            if (box && box.checked) {
+                row.querySelector(".task-select").checked = true;
+            }
+            current.replaceWith(row);
+        } else if (current) {
+            current.remove();
+        } else if (row && created && firstPage) {
+            body.prepend(row);
+        }
+    }
+
+    function refresh(ids, created) {
+        // Старшие номера - новые задачи: они встают выше
+        ids = ids.map(String).sort((a, b) => a - b);
+        load(ids)
+            .then((rows) => {
+                ids.forEach((id) => place(id, rows.get(id), created));
+                const empty = body.querySelector("tr.tasks-empty");
+                if (empty && body.querySelector("tr[data-task-id]")) {
+                    empty.remove();
+                }
+            })
+            .catch(() => {});
+    }
+
+    function visibleIds() {
+        return Array.from(body.querySelectorAll("tr[data-task-id]")).map(
+            (row) => row.dataset.taskId
+        );
+    }
+
+    const source = new EventSource(body.dataset.eventsUrl);
+    let connected = false;
+
+    source.addEventListener("open", () => {
+        // Пока соединения не было, события терялись: сверяем видимые строки
+        if (connected && visibleIds().length) {
+            refresh(visibleIds(), false);
+        }
+        connected = true;
+    });
+    source.addEventListener("create", (event) => {
+        refresh(JSON.parse(event.data), true);
+    });
+    source.addEventListener("update", (event) => {
+        refresh(JSON.parse(event.data), false);
+    });
+    source.addEventListener("delete", (event) => {
+        JSON.parse(event.data).forEach((id) => place(String(id), null));
+    });
+    source.addEventListener("reset", () => {
+        // Изменений больше, чем поместилось в буфер сервера
+        window.location.reload();
+    });
+})();
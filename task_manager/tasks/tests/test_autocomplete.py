@@ -0,0 +1,189 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.choices import executor_choices
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task
+from task_manager.tasks.pagination import KeysetPaginator
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class AutocompleteViewsTest(TestCase):
+    """Тесты JSON-эндпоинтов автодополнения"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="ivanov",
+            password=TEST_PASSWORD,
+            first_name="Ivan",
+            last_name="Ivanov",
+        )
+        self.other = User.objects.create_user(
+            username="petrov", password=TEST_PASSWORD
+        )
+        # SQLite сравнивает без учета регистра только ASCII, поэтому
+        # в тестах поиска по началу строки латиница
+        for name in ["Work", "Workshop", "Personal", "Urgent"]:
+            Label.objects.create(name=name)
+        Status.objects.create(name="New")
+        Status.objects.create(name="In progress")
+        self.client.login(username="ivanov", password=TEST_PASSWORD)
+
+    def get_json(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:autocomplete_labels"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_labels_prefix_search(self):
+        data = self.get_json("tasks:autocomplete_labels", q="work")
+        self.assertEqual(
+            [item["text"] for item in data["results"]], ["Work", "Workshop"]
+        )
+        self.assertIsNone(data["next"])
+
+    def test_statuses(self):
+        data = self.get_json("tasks:autocomplete_statuses", q="new")
+        self.assertEqual([item["text"] for item in data["results"]], ["New"])
+
+    def test_users_search_by_name_and_username(self):
+        data = self.get_json("tasks:autocomplete_users", q="ivan")
+        self.assertEqual(
+            data["results"], [{"id": self.user.pk, "text": "Ivan Ivanov"}]
+        )
+        data = self.get_json("tasks:autocomplete_users", q="pet")
+        self.assertEqual(
+            data["results"], [{"id": self.other.pk, "text": "petrov"}]
+        )
+
+    def test_users_labelled_as_in_executor_choices(self):
+        """Подсказка и выбранный вариант в списке исполнителей подписаны
+        одинаково, в том числе у пользователя без имени"""
+        choices = dict(executor_choices.get())
+        for user in (self.user, self.other):
+            data = self.get_json("tasks:autocomplete_users", q=user.username)
+            self.assertEqual(data["results"][0]["text"], choices[user.pk])
+
+    def test_pagination(self):
+        for number in range(25):
+            Label.objects.create(name=f"Label {number:02}")
+        first = self.get_json("tasks:autocomplete_labels", q="label")
+        self.assertEqual(len(first["results"]), 20)
+        self.assertIsNotNone(first["next"])
+        # Курсор помнит строку поиска
+        second = self.get_json(
+            "tasks:autocomplete_labels", cursor=first["next"]
+        )
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next"])
+        names = [item["text"] for item in first["results"] + second["results"]]
+        self.assertEqual(names, [f"Label {number:02}" for number in range(25)])
+
+    def test_cursor_of_other_list(self):
+        """Курсор списка задач - первая страница подсказок, а не ошибка"""
+        status = Status.objects.get(name="New")
+        for number in range(3):
+            Task.objects.create(
+                name=f"Task {number}", status=status, author=self.user
+            )
+        token = KeysetPaginator(2).paginate(Task.objects.all()).next_cursor
+        data = self.get_json("tasks:autocomplete_labels", cursor=token)
+        self.assertEqual(len(data["results"]), 4)
+
+    def test_no_like_contains(self):
+        """Поиск идет только по началу строки"""
+        with CaptureQueriesContext(connection) as queries:
+            self.get_json("tasks:autocomplete_labels", q="work")
+        sql = queries[-1]["sql"]
+        self.assertIn("LIKE 'work%'", sql)
+
+    def test_prefix_search_uses_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite query plan")
+        plan = Label.objects.filter(name__istartswith="work").explain()
+        self.assertIn("labels_name_prefix_idx", plan)
+
+
+class AutocompleteWidgetsTest(TestCase):
+    """Тесты виджетов, которые рендерят только выбранные варианты"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.users = [
+            User.objects.create_user(username=f"user{number}")
+            for number in range(5)
+        ]
+        self.status = Status.objects.create(name="новый")
+        self.labels = [
+            Label.objects.create(name=f"Метка {number}") for number in range(5)
+        ]
+        self.client.login(username="author", password=TEST_PASSWORD)
+
+    def test_create_page_has_no_unselected_options(self):
+        response = self.client.get(reverse("tasks:create"))
+        content = response.content.decode()
+        self.assertIn(
+            'data-autocomplete-url="/tasks/autocomplete/users/"', content
+        )
+        self.assertNotIn("Метка 3", content)
+        self.assertIn("tasks/js/autocomplete.js", content)
+
+    def test_update_page_renders_selected_options(self):
+        task = Task.objects.create(
+            name="Задача",
+            status=self.status,
+            author=self.author,
+            executor=self.users[1],
+        )
+        task.labels.add(self.labels[2])
+        response = self.client.get(reverse("tasks:update", args=[task.pk]))
+        content = response.content.decode()
+        self.assertIn(f'<option value="{self.labels[2].pk}" selected>', content)
+        self.assertNotIn("Метка 3", content)
+        self.assertIn(f'<option value="{self.users[1].pk}" selected>', content)
+        self.assertNotIn(f'<option value="{self.users[2].pk}"', content)
+
+    def test_filter_renders_selected_options_only(self):
+        response = self.client.get(
+            reverse("tasks:tasks"), {"labels": self.labels[1].pk}
+        )
+        content = response.content.decode()
+        self.assertIn("Метка 1", content)
+        self.assertNotIn("Метка 4", content)
+
+    def test_validation_queries_submitted_pks_only(self):
+        data = {
+            "name": "Задача",
+            "status": self.status.pk,
+            "executor": self.users[0].pk,
+            "labels": [self.labels[0].pk, self.labels[1].pk],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            form = TaskForm(data=data)
+            self.assertTrue(form.is_valid())
+        label_queries = [q["sql"] for q in queries if '"labels"' in q["sql"]]
+        self.assertEqual(len(label_queries), 1)
+        self.assertIn(" IN ", label_queries[0])
+
+    def test_invalid_pk_rejected(self):
+        form = TaskForm(
+            data={"name": "Задача", "status": self.status.pk, "executor": 0}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("executor", form.errors)
@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskBoardColumnView
+
+User = get_user_model()
+
+
+class TaskBoardTest(TestCase):
+    """Тесты доски задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.executor = User.objects.create_user(username="executor")
+        self.new = Status.objects.create(name="новый")
+        self.in_work = Status.objects.create(name="в работе")
+        self.done = Status.objects.create(name="завершен")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Задача {number}",
+                status=self.new,
+                author=self.author,
+                executor=self.executor if number % 2 else None,
+            )
+            for number in range(5)
+        ]
+        self.client.force_login(self.author)
+
+    def test_column_counts(self):
+        url = reverse("tasks:board")
+        self.client.get(url)
+        # Только GROUP BY: статусы, сессия и пользователь - из кеша
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        counts = {
+            column["name"]: column["count"]
+            for column in response.context["columns"]
+        }
+        self.assertEqual(counts, {"новый": 5, "в работе": 0, "завершен": 0})
+
+    def test_counts_are_filtered(self):
+        response = self.client.get(
+            reverse("tasks:board"),
+            {"executor": self.executor.pk, "status": self.in_work.pk},
+        )
+        column = response.context["columns"][-1]
+        self.assertEqual((column["name"], column["count"]), ("новый", 2))
+        self.assertNotIn("status=", response.context["filter_query"])
+
+    @mock.patch.object(TaskBoardColumnView, "paginate_by", 1)
+    def test_column_pages(self):
+        url = reverse("tasks:board_column", args=[self.new.pk])
+        names = []
+        # Фильтры следующих страниц - из курсора
+        params = {"executor": self.executor.pk}
+        while True:
+            response = self.client.get(url, params)
+            page = response.context["page_obj"]
+            names.extend(task.name for task in page)
+            if not page.has_next():
+                break
+            params = {"cursor": page.next_cursor}
+        self.assertEqual(names, ["Задача 3", "Задача 1"])
+
+    def test_last_page(self):
+        url = reverse("tasks:board_column", args=[self.new.pk])
+        response = self.client.get(url)
+        self.assertEqual(len(response.context["page_obj"]), 5)
+        self.assertNotContains(response, "board-more")
+
+
+class TaskMoveTest(TestCase):
+    """Тесты переноса карточки в другую колонку"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.new = Status.objects.create(name="новый")
+        self.in_work = Status.objects.create(name="в работе")
+        self.task = Task.objects.create(
+            name="Задача", status=self.new, author=self.author
+        )
+        self.client.force_login(self.author)
+        self.async_client.force_login(self.author)
+        self.url = reverse("tasks:move", args=[self.task.pk])
+
+    def test_move(self):
+        updated_at = self.task.updated_at
+        response = self.client.post(self.url, {"status": self.in_work.pk})
+        self.assertEqual(
+            response.json(), {"id": self.task.pk, "status": self.in_work.pk}
+        )
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, self.in_work)
+        self.assertGreater(self.task.updated_at, updated_at)
+
+    def test_only_status_is_saved(self):
+        Task.objects.filter(pk=self.task.pk).update(name="Переименована")
+        self.client.post(self.url, {"status": self.in_work.pk})
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.name, "Переименована")
+
+    def test_invalid_status(self):
+        for status in ("", "abc", "999999"):
+            with self.subTest(status=status):
+                response = self.client.post(self.url, {"status": status})
+                self.assertEqual(response.status_code, 400)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, self.new)
+
+    def test_get_not_allowed(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+
+    @override_settings(ROOT_URLCONF="task_manager.async_urls")
+    async def test_async_move(self):
+        response = await self.async_client.post(
+            self.url, {"status": self.in_work.pk}
+        )
+        self.assertEqual(response.json()["status"], self.in_work.pk)
+        task = await Task.objects.aget(pk=self.task.pk)
+        self.assertEqual(task.status_id, self.in_work.pk)
+
+    @override_settings(ROOT_URLCONF="task_manager.async_urls")
+    async def test_async_invalid_status(self):
+        response = await self.async_client.post(self.url, {"status": "0"})
+        self.assertEqual(response.status_code, 400)
+        missing = reverse("tasks:move", args=[999999])
+        response = await self.async_client.post(
+            missing, {"status": self.in_work.pk}
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,165 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters, rollups
+from task_manager.tasks.conditional import task_list_version
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class TaskBulkViewTest(TestCase):
+    """Тесты действий над несколькими задачами"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.other_user = User.objects.create_user(
+            username="other", password=TEST_PASSWORD
+        )
+        self.status_new = Status.objects.create(name="новый")
+        self.status_done = Status.objects.create(name="завершен")
+        self.label = Label.objects.create(name="срочно")
+        self.own_tasks = [
+            Task.objects.create(
+                name=f"Своя {number}",
+                status=self.status_new,
+                author=self.author,
+            )
+            for number in range(3)
+        ]
+        self.foreign_task = Task.objects.create(
+            name="Чужая", status=self.status_new, author=self.other_user
+        )
+        self.all_ids = [task.pk for task in self.own_tasks] + [
+            self.foreign_task.pk
+        ]
+        self.client.login(username="author", password=TEST_PASSWORD)
+        self.url = reverse("tasks:bulk")
+
+    def post(self, **data):
+        data.setdefault("tasks", self.all_ids)
+        return self.client.post(self.url, data)
+
+    def messages(self, response):
+        return [str(message) for message in get_messages(response.wsgi_request)]
+
+    def test_set_status(self):
+        """Все задачи обновляются одним UPDATE"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post(action="status", status=self.status_done.pk)
+        updates = [
+            query
+            for query in queries
+            if query["sql"].startswith('UPDATE "tasks"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertRedirects(response, reverse("tasks:tasks"))
+        self.assertEqual(
+            Task.objects.filter(status=self.status_done).count(), 4
+        )
+
+    def test_set_and_clear_executor(self):
+        self.post(action="executor", executor=self.other_user.pk)
+        self.assertEqual(
+            Task.objects.filter(executor=self.other_user).count(), 4
+        )
+        self.post(action="executor", executor="")
+        self.assertFalse(Task.objects.filter(executor__isnull=False).exists())
+
+    def test_add_and_remove_label(self):
+        self.own_tasks[0].labels.add(self.label)
+        self.post(action="add_label", label=self.label.pk)
+        self.assertEqual(self.label.tasks.count(), 4)
+
+        self.post(
+            action="remove_label",
+            label=self.label.pk,
+            tasks=[task.pk for task in self.own_tasks],
+        )
+        self.assertEqual(list(self.label.tasks.all()), [self.foreign_task])
+
+    def test_updated_at_and_list_version_change(self):
+        version = task_list_version.get()
+        before = Task.objects.get(pk=self.foreign_task.pk).updated_at
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post(action="add_label", label=self.label.pk)
+        after = Task.objects.get(pk=self.foreign_task.pk).updated_at
+        self.assertGreater(after, before)
+        self.assertNotEqual(task_list_version.get(), version)
+
+    def test_counters_use_write_database(self):
+        """Счетчики и сводки меняются в той же базе, что и задачи"""
+        with (
+            mock.patch.object(counters, "add", wraps=counters.add) as add,
+            mock.patch.object(rollups, "add", wraps=rollups.add) as add_days,
+            mock.patch.object(
+                counters, "recount", wraps=counters.recount
+            ) as recount,
+        ):
+            self.post(action="status", status=self.status_done.pk)
+            self.post(action="add_label", label=self.label.pk)
+            self.post(action="remove_label", label=self.label.pk)
+        calls = [
+            *add.call_args_list,
+            *add_days.call_args_list,
+            *recount.call_args_list,
+        ]
+        self.assertTrue(add_days.called)
+        self.assertTrue(recount.called)
+        for call in calls:
+            self.assertEqual(call.args[2], "default")
+
+    def test_delete_reports_foreign_tasks(self):
+        response = self.post(action="delete")
+        self.assertEqual(list(Task.objects.all()), [self.foreign_task])
+        messages = self.messages(response)
+        self.assertEqual(len(messages), 2)
+        self.assertIn(f"#{self.foreign_task.pk} Чужая", messages[1])
+
+    def test_value_is_required(self):
+        response = self.post(action="status")
+        self.assertEqual(len(self.messages(response)), 1)
+        self.assertFalse(Task.objects.filter(status=self.status_done).exists())
+
+    def test_no_tasks_selected(self):
+        response = self.post(action="delete", tasks=[])
+        self.assertEqual(len(self.messages(response)), 1)
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_redirects_back_to_filtered_list(self):
+        next_url = reverse("tasks:tasks") + "?self_tasks=on"
+        response = self.post(
+            action="status", status=self.status_done.pk, next=next_url
+        )
+        self.assertRedirects(response, next_url)
+
+        response = self.post(
+            action="status",
+            status=self.status_done.pk,
+            next="https://example.com/",
+        )
+        self.assertRedirects(response, reverse("tasks:tasks"))
+
+    def test_requires_login_and_post(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.client.logout()
+        self.post(action="delete")
+        self.assertEqual(Task.objects.count(), 4)
+
+    def test_list_renders_bulk_form(self):
+        response = self.client.get(reverse("tasks:tasks"))
+        self.assertContains(response, 'form="task-bulk-form"', count=4)
+        self.assertContains(response, 'action="/tasks/bulk/"')
@@ -0,0 +1,126 @@
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.choices import executor_choices, status_choices
+from task_manager.tasks.filters import TaskFilter
+from task_manager.tasks.forms import TaskForm
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class CachedChoicesTest(TestCase):
+    """Тесты кешированных списков для формы и фильтра задач"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="executor",
+            password=TEST_PASSWORD,
+            first_name="Иван",
+            last_name="Петров",
+        )
+        self.status = Status.objects.create(name="новый")
+        self.label = Label.objects.create(name="Работа")
+
+    def render_choices(self, field):
+        return [(str(value), str(label)) for value, label in field.choices]
+
+    def test_form_renders_without_queries_when_cached(self):
+        TaskForm().as_p()
+        with self.assertNumQueries(0):
+            TaskForm().as_p()
+
+    def test_filter_renders_without_queries_when_cached(self):
+        request = SimpleNamespace(user=self.user)
+        TaskFilter(queryset=Task.objects.all(), request=request).form.as_p()
+        with self.assertNumQueries(0):
+            TaskFilter(
+                queryset=Task.objects.all(), request=request
+            ).form.as_p()
+
+    def test_choices_content(self):
+        form = TaskForm()
+        self.assertEqual(
+            self.render_choices(form.fields["status"]),
+            [("", "---------"), (str(self.status.pk), "новый")],
+        )
+        self.assertIn(
+            (str(self.user.pk), "Иван Петров"),
+            self.render_choices(form.fields["executor"]),
+        )
+        self.assertEqual(
+            self.render_choices(form.fields["labels"]),
+            [(str(self.label.pk), "Работа")],
+        )
+
+    def test_save_invalidates_choices(self):
+        TaskForm().as_p()
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name="в работе")
+            self.label.name = "Личное"
+            self.label.save()
+        form = TaskForm()
+        self.assertIn(
+            "в работе",
+            [label for _, label in self.render_choices(form.fields["status"])],
+        )
+        self.assertEqual(
+            self.render_choices(form.fields["labels"]),
+            [(str(self.label.pk), "Личное")],
+        )
+
+    def test_delete_invalidates_choices(self):
+        TaskForm().as_p()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label.delete()
+        self.assertEqual(self.render_choices(TaskForm().fields["labels"]), [])
+
+    def test_version_changes_after_commit(self):
+        """Пока транзакция не зафиксирована, список строится по старой
+        версии - из строк, которые видны другим запросам"""
+        version = status_choices.get_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status.delete()
+            self.assertEqual(status_choices.get_version(), version)
+        self.assertNotEqual(status_choices.get_version(), version)
+
+    def test_login_keeps_executor_choices(self):
+        """Обновление last_login не сбрасывает список исполнителей"""
+        version = executor_choices.get_version()
+        self.client.login(username="executor", password=TEST_PASSWORD)
+        self.assertEqual(executor_choices.get_version(), version)
+
+    def test_user_rename_invalidates_executor_choices(self):
+        TaskForm().as_p()
+        self.user.first_name = "Пётр"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertIn(
+            (str(self.user.pk), "Пётр Петров"),
+            self.render_choices(TaskForm().fields["executor"]),
+        )
+
+    def test_lost_version_key_does_not_resurrect_old_choices(self):
+        status_choices.get()
+        shared = caches["shared"]
+        shared.delete(status_choices.version_key)
+        with self.captureOnCommitCallbacks(execute=True):
+            Status.objects.create(name="в работе")
+        shared.delete(status_choices.version_key)
+        names = [label for _, label in status_choices.get()]
+        self.assertIn("в работе", names)
+
+    def test_validation_checks_submitted_pk(self):
+        form = TaskForm(
+            data={"name": "Задача", "status": 999999, "labels": [999999]}
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn("status", form.errors)
+        self.assertIn("labels", form.errors)
@@ -0,0 +1,99 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.management.commands import explain_task_filters
+from task_manager.tasks.management.commands.seed_tasks import (
+    LABEL_COUNT_WEIGHTS,
+)
+from task_manager.tasks.models import Task
+from task_manager.users.models import User
+
+
+class ExplainTaskFiltersCommandTest(TestCase):
+    """Тесты команды explain_task_filters"""
+
+    def test_all_filter_combinations_use_indexes(self):
+        """Ни один фильтр не приводит к seq scan или лишней сортировке"""
+        out = StringIO()
+        call_command("explain_task_filters", stdout=out)
+        output = out.getvalue()
+        for name in explain_task_filters.CANONICAL_FILTERS:
+            self.assertIn(f"{name} (first page): OK", output)
+            self.assertIn(f"{name} (next page): OK", output)
+
+    def test_fails_on_sequential_scan(self):
+        out = StringIO()
+        with (
+            mock.patch.object(
+                explain_task_filters.Command,
+                "explain",
+                return_value="3 0 0 SCAN tasks",
+            ),
+            self.assertRaises(CommandError),
+        ):
+            call_command("explain_task_filters", stdout=out)
+        self.assertIn("sequential scan", out.getvalue())
+
+    def test_fails_on_extra_sort(self):
+        out = StringIO()
+        plan = (
+            "8 0 0 SEARCH tasks_labels USING INDEX x (label_id=?)\n"
+            "77 0 0 USE TEMP B-TREE FOR ORDER BY"
+        )
+        with (
+            mock.patch.object(
+                explain_task_filters.Command, "explain", return_value=plan
+            ),
+            self.assertRaises(CommandError),
+        ):
+            call_command("explain_task_filters", stdout=out)
+        self.assertIn("extra sort", out.getvalue())
+
+
+class SeedTasksCommandTest(TestCase):
+    """Тесты команды seed_tasks"""
+
+    def seed(self, **options):
+        out = StringIO()
+        call_command("seed_tasks", stdout=out, seed=1, **options)
+        return out.getvalue()
+
+    def test_creates_requested_counts(self):
+        output = self.seed(
+            users=5, statuses=3, labels=10, tasks=300, batch_size=70
+        )
+        self.assertEqual(User.objects.count(), 5)
+        self.assertEqual(Status.objects.count(), 3)
+        self.assertEqual(Label.objects.count(), 10)
+        self.assertEqual(Task.objects.count(), 300)
+        self.assertIn("300 task(s)", output)
+        self.assertIn("tasks/s", output)
+
+    def test_label_count_distribution(self):
+        self.seed(users=3, statuses=2, labels=10, tasks=500)
+        counts = Task.objects.annotate(count=Count("labels")).values_list(
+            "count", flat=True
+        )
+        self.assertLessEqual(max(counts), len(LABEL_COUNT_WEIGHTS) - 1)
+        # Задач без меток и с одной меткой больше, чем с тремя и более
+        common = sum(1 for count in counts if count <= 1)
+        rare = sum(1 for count in counts if count >= 3)
+        self.assertGreater(common, rare)
+        self.assertGreater(rare, 0)
+
+    def test_repeated_runs_add_data(self):
+        self.seed(users=2, statuses=1, labels=1, tasks=10)
+        self.seed(users=2, statuses=1, labels=1, tasks=10)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Status.objects.count(), 2)
+        self.assertEqual(Task.objects.count(), 20)
+
+    def test_requires_users_and_statuses(self):
+        with self.assertRaises(CommandError):
+            self.seed(users=0, statuses=0, tasks=1)
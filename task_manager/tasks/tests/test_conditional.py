@@ -0,0 +1,145 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class ConditionalGetTest(TestCase):
+    """Тесты ответов 304 Not Modified для страниц задач"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.other_user = User.objects.create_user(
+            username="other", password=TEST_PASSWORD
+        )
+        self.status = Status.objects.create(name="новый")
+        self.label = Label.objects.create(name="ошибка")
+        self.task = Task.objects.create(
+            name="Задача", status=self.status, author=self.author
+        )
+        self.other_task = Task.objects.create(
+            name="Другая задача", status=self.status, author=self.author
+        )
+        self.client.login(username="author", password=TEST_PASSWORD)
+        self.list_url = reverse("tasks:tasks")
+        self.detail_url = reverse("tasks:detail", args=[self.task.pk])
+        # Первый ответ выдает CSRF-cookie, а она входит в ETag
+        self.client.get(self.list_url)
+
+    def revalidate(self, url, params=None):
+        """Повторный запрос с ETag из первого ответа"""
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return lambda: self.client.get(
+            url, params, headers={"if-none-match": response["ETag"]}
+        )
+
+    def test_not_modified(self):
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                again = self.revalidate(url)
+                with CaptureQueriesContext(connection) as queries:
+                    response = again()
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.templates, [])
+                for query in queries:
+                    self.assertNotIn('"labels"', query["sql"])
+
+    def test_last_modified(self):
+        response = self.client.get(self.detail_url)
+        response = self.client.get(
+            self.detail_url,
+            headers={"if-modified-since": response["Last-Modified"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_revalidation_does_not_read_tasks(self):
+        """Проверка ETag списка не зависит от числа задач"""
+        again = self.revalidate(self.list_url)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(again().status_code, 304)
+        self.assertEqual(
+            [query for query in queries if '"tasks"' in query["sql"]], []
+        )
+
+    def test_task_change(self):
+        list_again = self.revalidate(self.list_url)
+        detail_again = self.revalidate(self.detail_url)
+        self.task.name = "Новое название"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.save()
+        self.assertEqual(list_again().status_code, 200)
+        self.assertEqual(detail_again().status_code, 200)
+
+    def test_label_change(self):
+        list_again = self.revalidate(self.list_url)
+        detail_again = self.revalidate(self.detail_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label.tasks.add(self.task)
+        self.assertEqual(list_again().status_code, 200)
+        self.assertEqual(detail_again().status_code, 200)
+
+        detail_again = self.revalidate(self.detail_url)
+        self.label.tasks.clear()
+        self.assertEqual(detail_again().status_code, 200)
+
+    def test_related_name_change(self):
+        again = self.revalidate(self.detail_url)
+        self.status.name = "в работе"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.status.save()
+        self.assertEqual(again().status_code, 200)
+
+    def test_task_deleted_from_list(self):
+        """Удаление не самой новой задачи тоже меняет список"""
+        again = self.revalidate(self.list_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.delete()
+        self.assertEqual(again().status_code, 200)
+
+    def test_filters_have_own_etag(self):
+        again = self.revalidate(self.list_url)
+        response = self.client.get(
+            self.list_url,
+            {"self_tasks": "on"},
+            headers={"if-none-match": again()["ETag"]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_other_user(self):
+        again = self.revalidate(self.list_url)
+        self.client.login(username="other", password=TEST_PASSWORD)
+        self.assertEqual(again().status_code, 200)
+
+    def test_pending_message_is_rendered(self):
+        """Страница с одноразовым сообщением отдается целиком"""
+        self.client.login(username="other", password=TEST_PASSWORD)
+        etag = self.client.get(self.list_url)["ETag"]
+        # Удалить чужую задачу нельзя: данные те же, но есть сообщение
+        self.client.post(reverse("tasks:delete", args=[self.task.pk]))
+        response = self.client.get(
+            self.list_url, headers={"if-none-match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "alert-danger")
+
+    def test_missing_task(self):
+        response = self.client.get(reverse("tasks:detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncConditionalGetTest(ConditionalGetTest):
+    """Те же сценарии с асинхронной страницей задачи"""
@@ -0,0 +1,123 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import counters
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+
+
+class TaskCountersTest(TestCase):
+    """Тесты счетчиков задач у статусов, меток и пользователей"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.executor = User.objects.create_user(username="executor")
+        self.new = Status.objects.create(name="новый")
+        self.done = Status.objects.create(name="завершен")
+        self.bug = Label.objects.create(name="bug")
+        self.urgent = Label.objects.create(name="urgent")
+        self.task = Task.objects.create(
+            name="Задача",
+            status=self.new,
+            author=self.author,
+            executor=self.executor,
+        )
+
+    def assertCounts(self, model, field, expected):
+        key = "username" if model is User else "name"
+        counts = dict(model.objects.values_list(key, field))
+        self.assertEqual({name: counts[name] for name in expected}, expected)
+
+    def assertNoDrift(self):
+        self.assertEqual(
+            counters.recount(), dict.fromkeys(counters.COUNTERS, 0)
+        )
+
+    def test_create_and_update(self):
+        self.assertCounts(Status, "tasks_count", {"новый": 1, "завершен": 0})
+        self.assertCounts(
+            User, "assigned_tasks_count", {"executor": 1, "author": 0}
+        )
+        self.task.status = self.done
+        self.task.executor = None
+        self.task.save()
+        self.assertCounts(Status, "tasks_count", {"новый": 0, "завершен": 1})
+        self.assertCounts(User, "assigned_tasks_count", {"executor": 0})
+        self.assertNoDrift()
+
+    def test_stale_instance(self):
+        # Статус уже сменили в другом месте: уменьшается счетчик того
+        # статуса, что записан в базе, а не в объекте
+        Task.objects.filter(pk=self.task.pk).update(status=self.done)
+        counters.recount()
+        self.task.status = self.new
+        self.task.save()
+        self.assertCounts(Status, "tasks_count", {"новый": 1, "завершен": 0})
+
+    def test_delete(self):
+        self.task.labels.add(self.bug)
+        self.task.delete()
+        self.assertCounts(Status, "tasks_count", {"новый": 0})
+        self.assertCounts(User, "authored_tasks_count", {"author": 0})
+        self.assertCounts(Label, "tasks_count", {"bug": 0})
+
+    def test_labels(self):
+        self.task.labels.add(self.bug, self.urgent)
+        # Повторное добавление и удаление несвязанной метки ничего не меняют
+        self.task.labels.add(self.bug)
+        self.task.labels.remove(self.urgent)
+        self.task.labels.remove(self.urgent)
+        self.assertCounts(Label, "tasks_count", {"bug": 1, "urgent": 0})
+        self.bug.tasks.clear()
+        self.assertCounts(Label, "tasks_count", {"bug": 0})
+        self.assertNoDrift()
+
+    def test_form_save_keeps_counter(self):
+        stale = Status.objects.get(pk=self.new.pk)
+        Task.objects.create(name="Вторая", status=self.new, author=self.author)
+        stale.name = "открыт"
+        stale.save()
+        stale.refresh_from_db()
+        self.assertEqual(stale.tasks_count, 2)
+
+    def test_recount_command(self):
+        Status.objects.update(tasks_count=10)
+        out = StringIO()
+        call_command("recount", "status", "labels", stdout=out)
+        self.assertIn("status: 2 row(s) recounted", out.getvalue())
+        self.assertIn("labels: 0 row(s) recounted", out.getvalue())
+        self.assertCounts(Status, "tasks_count", {"новый": 1, "завершен": 0})
+
+    def test_recount_unknown_counter(self):
+        with self.assertRaises(CommandError):
+            call_command("recount", "nothing", stdout=StringIO())
+
+    def test_label_in_use_is_not_deleted(self):
+        self.task.labels.add(self.bug)
+        self.client.force_login(self.author)
+        self.client.post(reverse("labels:delete", args=[self.bug.pk]))
+        self.assertTrue(Label.objects.filter(pk=self.bug.pk).exists())
+
+    def test_label_with_drifted_counter_is_not_deleted(self):
+        self.task.labels.add(self.bug)
+        Label.objects.update(tasks_count=0)
+        self.client.force_login(self.author)
+        self.client.post(reverse("labels:delete", args=[self.bug.pk]))
+        self.assertTrue(Label.objects.filter(pk=self.bug.pk).exists())
+
+    @override_settings(ROOT_URLCONF="task_manager.async_urls")
+    async def test_label_with_drifted_counter_is_not_deleted_async(self):
+        await self.task.labels.aadd(self.bug)
+        await Label.objects.aupdate(tasks_count=0)
+        await self.async_client.aforce_login(self.author)
+        await self.async_client.post(
+            reverse("labels:delete", args=[self.bug.pk])
+        )
+        self.assertTrue(await Label.objects.filter(pk=self.bug.pk).aexists())
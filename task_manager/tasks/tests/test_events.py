@@ -0,0 +1,243 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import (
+    AsyncRequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.events import (
+    CREATE,
+    DELETE,
+    RESET,
+    UPDATE,
+    LocalBackend,
+    Subscription,
+    broker,
+)
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskEventsView
+
+User = get_user_model()
+
+
+class SubscriptionTest(SimpleTestCase):
+    """Тесты буфера подписчика"""
+
+    async def test_events_are_coalesced(self):
+        subscription = Subscription(buffer_size=10)
+        subscription.put(UPDATE, [1, 2])
+        subscription.put(UPDATE, [1])
+        subscription.put(CREATE, [3])
+        subscription.put(UPDATE, [3])
+        subscription.put(DELETE, [2])
+        self.assertEqual(
+            await subscription.get(timeout=1),
+            [(UPDATE, [1]), (DELETE, [2]), (CREATE, [3])],
+        )
+
+    async def test_created_and_deleted_task_is_dropped(self):
+        subscription = Subscription(buffer_size=10)
+        subscription.put(CREATE, [1])
+        subscription.put(DELETE, [1])
+        self.assertEqual(await subscription.get(timeout=1), [])
+
+    async def test_overflow_resets(self):
+        subscription = Subscription(buffer_size=2)
+        subscription.put(UPDATE, [1, 2, 3])
+        subscription.put(UPDATE, [4])
+        self.assertEqual(await subscription.get(timeout=1), [(RESET, [])])
+        subscription.put(UPDATE, [5])
+        self.assertEqual(await subscription.get(timeout=1), [(UPDATE, [5])])
+
+    async def test_timeout(self):
+        subscription = Subscription(buffer_size=2)
+        self.assertEqual(await subscription.get(timeout=0.01), [])
+
+    async def test_delivery_from_thread(self):
+        subscription = broker.subscribe()
+        try:
+            await asyncio.to_thread(broker.backend.publish, UPDATE, [1])
+            self.assertEqual(await subscription.get(timeout=1), [(UPDATE, [1])])
+        finally:
+            broker.unsubscribe(subscription)
+        self.assertNotIn(subscription, broker.backend.subscriptions)
+
+
+class TaskSignalsTest(TestCase):
+    """Тесты публикации изменений задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.status = Status.objects.create(name="новый")
+        self.label = Label.objects.create(name="bug")
+        patcher = mock.patch.object(broker, "backend")
+        self.backend = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def published(self):
+        return [call.args for call in self.backend.publish.call_args_list]
+
+    def test_create_update_delete(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(
+                name="Задача", status=self.status, author=self.author
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            task.save()
+        pk = task.pk
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+        self.assertEqual(
+            self.published(), [(CREATE, [pk]), (UPDATE, [pk]), (DELETE, [pk])]
+        )
+
+    def test_labels_change(self):
+        task = Task.objects.create(
+            name="Задача", status=self.status, author=self.author
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.label.tasks.add(task)
+        self.assertEqual(self.published(), [(UPDATE, [task.pk])])
+
+    def test_rolled_back_change_is_not_published(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            Task.objects.create(
+                name="Задача", status=self.status, author=self.author
+            )
+        # Версия списка задач и публикация
+        self.assertEqual(len(callbacks), 2)
+        self.backend.publish.assert_not_called()
+
+    def test_published_on_commit_of_saving_database(self):
+        # Сохранение в другую базу не ждет транзакции базы default
+        with mock.patch(
+            "task_manager.tasks.events.transaction.on_commit"
+        ) as on_commit:
+            Task.objects.using("default").create(
+                name="Задача", status=self.status, author=self.author
+            )
+            broker.publish(UPDATE, [1], "other")
+        usings = [call.kwargs["using"] for call in on_commit.call_args_list]
+        self.assertEqual(set(usings[:-1]), {"default"})
+        self.assertEqual(usings[-1], "other")
+
+
+class TaskRowsViewTest(TestCase):
+    """Тесты строк таблицы для живого обновления"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.status = Status.objects.create(name="новый")
+        self.other_status = Status.objects.create(name="в работе")
+        self.task = Task.objects.create(
+            name="Первая", status=self.status, author=self.author
+        )
+        self.other_task = Task.objects.create(
+            name="Вторая", status=self.other_status, author=self.author
+        )
+        self.client.force_login(self.author)
+        self.url = reverse("tasks:rows")
+
+    def test_rows(self):
+        response = self.client.get(
+            self.url, {"ids": f"{self.task.pk},{self.other_task.pk},x"}
+        )
+        self.assertContains(response, f'data-task-id="{self.task.pk}"')
+        self.assertContains(response, f'data-task-id="{self.other_task.pk}"')
+
+    def test_filtered_out(self):
+        response = self.client.get(
+            self.url,
+            {
+                "ids": f"{self.task.pk},{self.other_task.pk}",
+                "status": self.status.pk,
+            },
+        )
+        self.assertContains(response, f'data-task-id="{self.task.pk}"')
+        self.assertNotContains(response, f'data-task-id="{self.other_task.pk}"')
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.get(self.url, {"ids": self.task.pk})
+        self.assertEqual(response.status_code, 302)
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class TaskEventsViewTest(TestCase):
+    """Тесты потока изменений задач"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="user")
+        self.async_client.force_login(self.user)
+        self.client.force_login(self.user)
+        patcher = mock.patch.object(broker, "backend", LocalBackend())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def get_stream(self):
+        """Ответ самого view: тестовый клиент оборачивает поток в свой
+        генератор, а ASGI-обработчик закрывает aiter(response)"""
+        request = AsyncRequestFactory().get(reverse("tasks:events"))
+
+        async def auser():
+            return self.user
+
+        request.auser = auser
+        return await TaskEventsView.as_view()(request)
+
+    async def test_stream(self):
+        response = await self.get_stream()
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        try:
+            self.assertEqual(await anext(stream), b"retry: 5000\n\n")
+            broker.backend.publish(UPDATE, [7, 8])
+            self.assertEqual(
+                await anext(stream), b"event: update\ndata: [7, 8]\n\n"
+            )
+        finally:
+            await stream.aclose()
+        self.assertEqual(broker.backend.subscriptions, set())
+
+    @override_settings(TASK_EVENTS_HEARTBEAT=0.01)
+    async def test_heartbeat(self):
+        response = await self.get_stream()
+        stream = response.streaming_content
+        try:
+            await anext(stream)
+            self.assertEqual(await anext(stream), b": ping\n\n")
+        finally:
+            await stream.aclose()
+        self.assertEqual(broker.backend.subscriptions, set())
+
+    async def test_response_close_unsubscribes(self):
+        response = await self.get_stream()
+        content = aiter(response)
+        await anext(content)
+        self.assertEqual(len(broker.backend.subscriptions), 1)
+        await content.aclose()
+        self.assertEqual(broker.backend.subscriptions, set())
+
+    async def test_login_required(self):
+        await self.async_client.alogout()
+        response = await self.async_client.get(reverse("tasks:events"))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(broker.backend.subscriptions, set())
+
+    def test_list_page_subscribes(self):
+        response = self.client.get(reverse("tasks:tasks"))
+        self.assertContains(response, 'data-events-url="/tasks/events/"')
+        self.assertContains(response, "tasks/js/live.js")
+
+    @override_settings(ROOT_URLCONF="task_manager.urls")
+    def test_no_stream_under_wsgi(self):
+        response = self.client.get(reverse("tasks:tasks"))
+        self.assertNotContains(response, "data-events-url")
+        self.assertNotContains(response, "tasks/js/live.js")
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.views import TaskExportView
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class TaskExportViewTest(TestCase):
+    """Тесты потоковой выгрузки задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author",
+            password=TEST_PASSWORD,
+            first_name="Автор",
+            last_name="Задач",
+        )
+        self.status_new = Status.objects.create(name="новый")
+        self.status_done = Status.objects.create(name="завершен")
+        self.label_bug = Label.objects.create(name="ошибка")
+        self.label_urgent = Label.objects.create(name="срочно")
+        for number in range(5):
+            task = Task.objects.create(
+                name=f"Задача {number}",
+                description=f"Описание, строка {number}\nвторая строка",
+                status=self.status_new,
+                author=self.author,
+            )
+            task.labels.add(self.label_bug, self.label_urgent)
+        Task.objects.create(
+            name="Готовая задача",
+            status=self.status_done,
+            author=self.author,
+            executor=self.author,
+        )
+        self.client.login(username="author", password=TEST_PASSWORD)
+
+    def export(self, export_format, params=None):
+        response = self.client.get(
+            reverse("tasks:export", args=[export_format]), params
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_requires_login(self):
+        self.client.logout()
+        response = self.client.get(reverse("tasks:export", args=["csv"]))
+        self.assertEqual(response.status_code, 302)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse("tasks:export", args=["xml"]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["name"], "Готовая задача")
+        self.assertEqual(rows[0]["executor"], "Автор Задач")
+        self.assertEqual(rows[1]["labels"], "ошибка, срочно")
+        self.assertEqual(
+            rows[1]["description"], "Описание, строка 4\nвторая строка"
+        )
+
+    def test_jsonl_applies_filter(self):
+        lines = self.export("jsonl", {"status": self.status_new.id})
+        rows = [json.loads(line) for line in lines.splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertTrue(all(row["status"] == "новый" for row in rows))
+        self.assertEqual(rows[0]["labels"], ["ошибка", "срочно"])
+        self.assertEqual(rows[0]["executor"], "")
+
+    def test_invalid_filter_exports_nothing(self):
+        self.assertEqual(self.export("jsonl", {"status": "abc"}), "")
+
+    @mock.patch.object(TaskExportView, "chunk_size", 2)
+    def test_labels_are_loaded_per_chunk(self):
+        """Один запрос меток на пачку задач, а не на каждую задачу"""
+        response = self.client.get(reverse("tasks:export", args=["jsonl"]))
+        with CaptureQueriesContext(connection) as queries:
+            b"".join(response.streaming_content)
+        label_queries = [query for query in queries if "labels" in query["sql"]]
+        self.assertEqual(len(label_queries), 3)
+        self.assertEqual(len(queries), 4)
+
+    @override_settings(ROOT_URLCONF="task_manager.async_urls")
+    async def test_async_export(self):
+        """Под ASGI строки идут из асинхронного генератора, и Django не
+        собирает выгрузку в список перед отправкой"""
+        await self.async_client.aforce_login(self.author)
+        url = reverse("tasks:export", args=["csv"])
+        response = await self.async_client.get(
+            url, {"status": self.status_new.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b"".join(
+            [chunk async for chunk in response.streaming_content]
+        )
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["labels"], "ошибка, срочно")
+        response = await self.async_client.get(url, {"status": "abc"})
+        content = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(content), 1)
@@ -0,0 +1,209 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.importer import TaskImporter, read_rows
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+CSV_DATA = """name,description,status,executor,labels
+Первая,"Описание
+в две строки",новый,executor,"ошибка, срочно"
+Вторая,,завершен,Иван Петров,
+Х,,новый,,
+Третья,,неизвестный,,
+Четвертая,,новый,nobody,
+Пятая,,новый,,нет такой
+,,новый,,
+"""
+
+
+class TaskImporterTest(TestCase):
+    """Тесты импорта задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.executor = User.objects.create_user(
+            username="executor",
+            password=TEST_PASSWORD,
+            first_name="Иван",
+            last_name="Петров",
+        )
+        Status.objects.create(name="новый")
+        Status.objects.create(name="завершен")
+        Label.objects.create(name="ошибка")
+        Label.objects.create(name="срочно")
+
+    def import_csv(self, data=CSV_DATA, batch_size=1000):
+        importer = TaskImporter(self.author, batch_size)
+        return importer.run(read_rows(StringIO(data), "csv"))
+
+    def test_csv(self):
+        result = self.import_csv()
+        self.assertEqual(result.created, 2)
+        first = Task.objects.get(name="Первая")
+        self.assertEqual(first.description, "Описание\nв две строки")
+        self.assertEqual(first.executor, self.executor)
+        self.assertEqual(first.author, self.author)
+        self.assertEqual(
+            sorted(label.name for label in first.labels.all()),
+            ["ошибка", "срочно"],
+        )
+        # Исполнитель найден по полному имени, как в выгрузке
+        self.assertEqual(
+            Task.objects.get(name="Вторая").executor, self.executor
+        )
+
+    def test_rejected_rows(self):
+        result = self.import_csv()
+        self.assertEqual([row.line for row in result.rejected], [5, 6, 7, 8, 9])
+        errors = [row.error for row in result.rejected]
+        self.assertIn("2", errors[0])
+        self.assertIn("неизвестный", errors[1])
+        self.assertIn("nobody", errors[2])
+        self.assertIn("нет такой", errors[3])
+
+    def test_jsonl(self):
+        lines = [
+            json.dumps(
+                {"name": "Задача", "status": "новый", "labels": ["ошибка"]}
+            ),
+            "{broken",
+            "",
+            json.dumps(["не объект"]),
+        ]
+        importer = TaskImporter(self.author)
+        result = importer.run(read_rows(StringIO("\n".join(lines)), "jsonl"))
+        self.assertEqual(result.created, 1)
+        self.assertEqual([row.line for row in result.rejected], [2, 4])
+        task = Task.objects.get()
+        self.assertEqual(
+            [label.name for label in task.labels.all()], ["ошибка"]
+        )
+
+    def test_batches(self):
+        """Пачка задач и связи с метками - по одному INSERT на пачку"""
+        rows = "name,status,labels\n" + "".join(
+            f"Задача {number},новый,ошибка\n" for number in range(5)
+        )
+        # Загрузка словарей: статусы, метки, пользователи
+        importer = TaskImporter(self.author, batch_size=2)
+        # 3 пачки: SAVEPOINT, INSERT задач, INSERT связей, счетчики
+        # статуса, автора и метки, сводка дня, RELEASE; первая пачка еще
+        # создает строку сводки
+        with self.assertNumQueries(26):
+            result = importer.run(read_rows(StringIO(rows), "csv"))
+        self.assertEqual(result.created, 5)
+        label = Label.objects.get(name="ошибка")
+        self.assertEqual(label.tasks.count(), 5)
+        self.assertEqual(label.tasks_count, 5)
+
+    def test_export_round_trip(self):
+        task = Task.objects.create(
+            name="Из выгрузки",
+            status=Status.objects.get(name="новый"),
+            author=self.author,
+            executor=self.executor,
+        )
+        task.labels.set(Label.objects.all())
+        self.client.login(username="author", password=TEST_PASSWORD)
+        response = self.client.get(reverse("tasks:export", args=["csv"]))
+        exported = b"".join(response.streaming_content).decode()
+        task.delete()
+
+        result = self.import_csv(exported)
+        self.assertEqual(result.rejected, [])
+        imported = Task.objects.get(name="Из выгрузки")
+        self.assertEqual(imported.executor, self.executor)
+        self.assertEqual(imported.labels.count(), 2)
+
+
+class ImportTasksCommandTest(TestCase):
+    """Тесты команды import_tasks"""
+
+    def setUp(self):
+        User.objects.create_user(username="author", password=TEST_PASSWORD)
+        Status.objects.create(name="новый")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.path = self.directory / "tasks.csv"
+        self.path.write_text(
+            "name,status\nЗадача,новый\nДругая,нет\n", encoding="utf-8"
+        )
+
+    def test_import_with_error_report(self):
+        out, err = StringIO(), StringIO()
+        report = self.directory / "errors.csv"
+        call_command(
+            "import_tasks",
+            str(self.path),
+            "--author=author",
+            f"--errors={report}",
+            stdout=out,
+            stderr=err,
+        )
+        self.assertIn("Imported 1 task(s), rejected 1 row(s)", out.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+        with report.open(encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ["line", "error"])
+        self.assertEqual(rows[1][0], "3")
+
+    def test_unknown_author_and_format(self):
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", str(self.path), "--author=nobody")
+        path = self.directory / "tasks.txt"
+        path.write_text("", encoding="utf-8")
+        with self.assertRaises(CommandError):
+            call_command("import_tasks", str(path), "--author=author")
+
+
+class TaskImportViewTest(TestCase):
+    """Тесты загрузки файла с задачами"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        Status.objects.create(name="новый")
+        self.client.login(username="author", password=TEST_PASSWORD)
+        self.url = reverse("tasks:import")
+
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode("utf-8"))
+        return self.client.post(self.url, {"file": upload, **data})
+
+    def test_upload(self):
+        response = self.upload(
+            "tasks.csv", "name,status\nЗадача,новый\nДругая,нет\n"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["result"].created, 1)
+        self.assertEqual(len(response.context["rejected"]), 1)
+        self.assertEqual(Task.objects.get().author, self.user)
+
+    def test_explicit_format(self):
+        content = json.dumps({"name": "Задача", "status": "новый"})
+        response = self.upload("tasks.txt", content)
+        self.assertTrue(response.context["form"].errors)
+        response = self.upload("tasks.txt", content, format="jsonl")
+        self.assertEqual(response.context["result"].created, 1)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
@@ -0,0 +1,208 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.pagination import Cursor, KeysetPaginator
+from task_manager.tasks.views import AsyncTasksListView, TasksListView
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class KeysetPaginatorTest(TestCase):
+    """Тесты keyset-пагинации"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.status = Status.objects.create(name="новый")
+        self.tasks = [
+            Task.objects.create(
+                name=f"Задача {number}", status=self.status, author=self.author
+            )
+            for number in range(7)
+        ]
+        # Часть задач с одинаковым created_at - порядок решает id
+        same_time = timezone.now() - timedelta(days=1)
+        Task.objects.filter(pk__in=[t.pk for t in self.tasks[2:5]]).update(
+            created_at=same_time
+        )
+        self.expected = list(
+            Task.objects.order_by("-created_at", "-id").values_list(
+                "pk", flat=True
+            )
+        )
+
+    def walk_forward(self, paginator):
+        pages, cursor = [], None
+        while True:
+            page = paginator.paginate(Task.objects.all(), cursor)
+            pages.append([task.pk for task in page])
+            if not page.has_next():
+                return pages, page
+            cursor = Cursor.decode(page.next_cursor)
+
+    def test_pages_cover_all_rows_in_order(self):
+        """Страницы идут подряд без пропусков и повторов"""
+        pages, _ = self.walk_forward(KeysetPaginator(3))
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+
+    def test_previous_pages(self):
+        """Курсор назад возвращает предыдущую страницу"""
+        paginator = KeysetPaginator(3)
+        pages, last_page = self.walk_forward(paginator)
+        page = paginator.paginate(
+            Task.objects.all(), Cursor.decode(last_page.previous_cursor)
+        )
+        self.assertEqual([task.pk for task in page], pages[1])
+        self.assertTrue(page.has_next())
+        self.assertTrue(page.has_previous())
+
+        page = paginator.paginate(
+            Task.objects.all(), Cursor.decode(page.previous_cursor)
+        )
+        self.assertEqual([task.pk for task in page], pages[0])
+        self.assertFalse(page.has_previous())
+
+    def test_first_page_has_no_previous(self):
+        page = KeysetPaginator(3).paginate(Task.objects.all())
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_no_offset_and_no_count(self):
+        """Ни одна страница не использует OFFSET и COUNT(*)"""
+        paginator = KeysetPaginator(3)
+        with CaptureQueriesContext(connection) as queries:
+            self.walk_forward(paginator)
+        self.assertEqual(len(queries), 3)
+        for query in queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+            self.assertNotIn("COUNT(", query["sql"].upper())
+
+    def test_tampered_cursor_is_ignored(self):
+        token = KeysetPaginator(3).paginate(Task.objects.all()).next_cursor
+        self.assertIsNone(Cursor.decode(token[:-2] + "xx"))
+        self.assertIsNone(Cursor.decode("garbage"))
+        self.assertIsNone(Cursor.decode(None))
+
+    def test_cursor_of_other_ordering(self):
+        token = KeysetPaginator(3).paginate(Task.objects.all()).next_cursor
+        self.assertIsNone(Cursor.decode(token, [("name", "id")]))
+        self.assertIsNotNone(Cursor.decode(token, [("-created_at", "-id")]))
+        # Курсор без проверки сортировки не сдвигает чужую выборку
+        page = KeysetPaginator(3, ("name", "id")).paginate(
+            Task.objects.all(), Cursor.decode(token)
+        )
+        self.assertFalse(page.has_previous())
+
+
+@mock.patch.object(TasksListView, "paginate_by", 2)
+class TasksListPaginationTest(TestCase):
+    """Тесты пагинации списка задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.status_new = Status.objects.create(name="новый")
+        self.status_done = Status.objects.create(name="завершен")
+        for number in range(5):
+            Task.objects.create(
+                name=f"Новая {number}",
+                status=self.status_new,
+                author=self.author,
+            )
+            Task.objects.create(
+                name=f"Завершенная {number}",
+                status=self.status_done,
+                author=self.author,
+            )
+        self.client.login(username="author", password=TEST_PASSWORD)
+
+    def test_first_page(self):
+        response = self.client.get(reverse("tasks:tasks"))
+        self.assertEqual(len(response.context["tasks"]), 2)
+        self.assertTrue(response.context["is_paginated"])
+        self.assertTrue(response.context["page_obj"].has_next())
+        self.assertFalse(response.context["page_obj"].has_previous())
+
+    def test_cursor_keeps_filter(self):
+        """Фильтр из первой страницы действует на следующих"""
+        url = reverse("tasks:tasks")
+        response = self.client.get(url, {"status": self.status_new.id})
+        seen = []
+        while True:
+            tasks = response.context["tasks"]
+            seen.extend(tasks)
+            self.assertTrue(
+                all(task.status_id == self.status_new.id for task in tasks)
+            )
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"cursor": page.next_cursor})
+            # Форма фильтра показывает фильтр из курсора
+            self.assertEqual(
+                response.context["filter"].form["status"].value(),
+                str(self.status_new.id),
+            )
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len({task.pk for task in seen}), 5)
+
+    def test_list_queries_have_no_offset_or_count(self):
+        first = self.client.get(reverse("tasks:tasks"))
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(
+                reverse("tasks:tasks"),
+                {"cursor": first.context["page_obj"].next_cursor},
+            )
+        for query in queries:
+            self.assertNotIn("OFFSET", query["sql"].upper())
+            self.assertNotIn("COUNT(", query["sql"].upper())
+
+    def test_cursor_of_other_list(self):
+        """Курсор подсказок не подходит к списку и доске: первая страница"""
+        for number in range(25):
+            Status.objects.create(name=f"Status {number:02}")
+        token = self.client.get(
+            reverse("tasks:autocomplete_statuses"), {"q": "status"}
+        ).json()["next"]
+        for url in (
+            reverse("tasks:tasks"),
+            reverse("tasks:board_column", args=[self.status_new.pk]),
+        ):
+            response = self.client.get(url, {"cursor": token})
+            self.assertEqual(response.status_code, 200)
+            self.assertFalse(response.context["page_obj"].has_previous())
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+@mock.patch.object(AsyncTasksListView, "paginate_by", 2)
+class AsyncTasksListPaginationTest(TasksListPaginationTest):
+    """Те же сценарии с асинхронным списком задач"""
+
+    async def test_async_list(self):
+        await self.async_client.aforce_login(self.author)
+        response = await self.async_client.get(
+            reverse("tasks:tasks"), {"status": self.status_done.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(
+            response.resolver_match.func.view_class, AsyncTasksListView
+        )
+        self.assertEqual(len(response.context["tasks"]), 2)
+        for task in response.context["tasks"]:
+            self.assertEqual(task.status_id, self.status_done.id)
+            # Метки загружены вместе со страницей
+            self.assertIn("labels", task._prefetched_objects_cache)
+        self.assertTrue(response.context["page_obj"].has_next())
@@ -0,0 +1,182 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks import rollups
+from task_manager.tasks.models import DailyTaskStats, Task
+
+User = get_user_model()
+
+
+class TaskRollupsTest(TestCase):
+    """Тесты дневных сводок по задачам"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.new = Status.objects.create(name="новый")
+        self.done = Status.objects.create(name="завершен", is_closed=True)
+        self.today = timezone.localdate()
+        self.task = Task.objects.create(
+            name="Задача", status=self.new, author=self.author
+        )
+
+    def assertToday(self, created, closed):
+        row = DailyTaskStats.objects.filter(day=self.today).first()
+        self.assertEqual(
+            (row.created, row.closed) if row else (0, 0), (created, closed)
+        )
+
+    def test_create_close_reopen(self):
+        self.assertToday(1, 0)
+        self.task.status = self.done
+        self.task.save()
+        self.assertIsNotNone(self.task.closed_at)
+        self.assertToday(1, 1)
+        self.task.status = self.new
+        self.task.save()
+        self.assertIsNone(self.task.closed_at)
+        self.assertToday(1, 0)
+
+    def test_move_with_update_fields(self):
+        self.client.force_login(self.author)
+        self.client.post(
+            reverse("tasks:move", args=[self.task.pk]),
+            {"status": self.done.pk},
+        )
+        self.task.refresh_from_db()
+        self.assertIsNotNone(self.task.closed_at)
+        self.assertToday(1, 1)
+
+    def test_delete(self):
+        self.task.status = self.done
+        self.task.save()
+        self.task.delete()
+        self.assertToday(0, 0)
+
+    def test_closed_day_is_kept(self):
+        # Закрытая вчера задача, сохраненная сегодня, остается во вчерашнем
+        # дне закрытия
+        yesterday = timezone.now() - timedelta(days=1)
+        self.task.status = self.done
+        self.task.save()
+        Task.objects.filter(pk=self.task.pk).update(closed_at=yesterday)
+        rollups.rebuild()
+        task = Task.objects.get(pk=self.task.pk)
+        task.name = "Переименована"
+        task.save()
+        self.assertToday(1, 0)
+        row = DailyTaskStats.objects.get(day=timezone.localdate(yesterday))
+        self.assertEqual(row.closed, 1)
+
+    def test_bulk_status(self):
+        self.client.force_login(self.author)
+        self.client.post(
+            reverse("tasks:bulk"),
+            {
+                "tasks": [self.task.pk],
+                "action": "status",
+                "status": self.done.pk,
+            },
+        )
+        self.task.refresh_from_db()
+        self.assertIsNotNone(self.task.closed_at)
+        self.assertToday(1, 1)
+
+    def test_status_becomes_closed(self):
+        self.new.is_closed = True
+        self.new.save()
+        self.assertToday(1, 1)
+        self.new.is_closed = False
+        self.new.save()
+        self.task.refresh_from_db()
+        self.assertIsNone(self.task.closed_at)
+        self.assertToday(1, 0)
+
+    def test_bulk_created_tasks(self):
+        tasks = [
+            Task(name="Открытая", status=self.new, author=self.author),
+            Task(name="Закрытая", status=self.done, author=self.author),
+        ]
+        rollups.close_tasks(tasks, rollups.closed_status_ids())
+        Task.objects.bulk_create(tasks)
+        rollups.add_tasks(rollups.task_days(task) for task in tasks)
+        self.assertToday(3, 1)
+
+    def test_rebuild_command(self):
+        DailyTaskStats.objects.all().delete()
+        Task.objects.create(
+            name="Закрытая", status=self.done, author=self.author
+        )
+        Task.objects.update(closed_at=None)
+        out = StringIO()
+        call_command("rollup_tasks", stdout=out)
+        self.assertIn("1 day(s) rebuilt", out.getvalue())
+        self.assertToday(2, 1)
+
+    def test_daily(self):
+        daily = rollups.daily(7)
+        self.assertEqual(len(daily), 7)
+        self.assertEqual(
+            daily[-1], {"day": self.today, "created": 1, "closed": 0}
+        )
+        self.assertEqual(daily[0]["created"], 0)
+
+
+class DashboardTest(TestCase):
+    """Тесты статистики на главной странице"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author")
+        self.executor = User.objects.create_user(username="executor")
+        self.new = Status.objects.create(name="новый")
+        self.done = Status.objects.create(name="завершен", is_closed=True)
+        self.label = Label.objects.create(name="bug")
+        for status in (self.new, self.new, self.done):
+            task = Task.objects.create(
+                name="Задача",
+                status=status,
+                author=self.author,
+                executor=self.executor,
+            )
+            task.labels.add(self.label)
+        self.client.force_login(self.author)
+
+    def test_dashboard(self):
+        response = self.client.get(reverse("home"))
+        context = response.context
+        self.assertEqual(context["days"], 30)
+        self.assertEqual(
+            (context["created_total"], context["closed_total"]), (3, 1)
+        )
+        self.assertEqual(
+            (context["tasks_total"], context["open_total"]), (3, 2)
+        )
+        self.assertEqual(list(context["executors"]), [self.executor])
+        self.assertEqual(list(context["labels"]), [self.label])
+        self.assertContains(response, "Dashboard")
+
+    def test_tasks_table_is_not_read(self):
+        url = reverse("home")
+        self.client.get(url)
+        # Сводки за период, статусы, исполнители и метки; сессия и
+        # пользователь - из кеша
+        with self.assertNumQueries(4):
+            self.client.get(url, {"days": 90})
+
+    def test_period(self):
+        response = self.client.get(reverse("home"), {"days": 7})
+        self.assertEqual(len(response.context["daily"]), 7)
+        response = self.client.get(reverse("home"), {"days": 5})
+        self.assertEqual(response.context["days"], 30)
+
+    def test_anonymous(self):
+        self.client.logout()
+        response = self.client.get(reverse("home"))
+        self.assertNotIn("daily", response.context)
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class TaskRowCacheTest(TestCase):
+    """Тесты кеша строк таблицы задач"""
+
+    def setUp(self):
+        cache.clear()
+        self.author = User.objects.create_user(
+            username="author",
+            password=TEST_PASSWORD,
+            first_name="Иван",
+            last_name="Петров",
+        )
+        self.status = Status.objects.create(name="новый")
+        self.task = Task.objects.create(
+            name="Задача", status=self.status, author=self.author
+        )
+        self.client.force_login(self.author)
+        self.url = reverse("tasks:tasks")
+        self.client.get(self.url)
+
+    def test_unchanged_rows_are_cached(self):
+        with mock.patch.object(
+            User, "get_full_name", autospec=True, return_value="Иван Петров"
+        ) as get_full_name:
+            response = self.client.get(self.url)
+        get_full_name.assert_not_called()
+        self.assertContains(response, "Иван Петров")
+
+    def test_task_change(self):
+        self.task.name = "Переименованная задача"
+        self.task.save()
+        self.assertContains(self.client.get(self.url), "Переименованная")
+
+    def test_status_change(self):
+        self.status.name = "в работе"
+        self.status.save()
+        self.assertContains(self.client.get(self.url), "в работе")
+
+    def test_executor_change(self):
+        executor = User.objects.create_user(
+            username="executor", first_name="Пётр", last_name="Сидоров"
+        )
+        self.task.executor = executor
+        self.task.save()
+        self.client.get(self.url)
+        executor.last_name = "Иванов"
+        executor.save()
+        self.assertContains(self.client.get(self.url), "Пётр Иванов")
+
+    def test_language(self):
+        self.assertContains(self.client.get(self.url), "Edit")
+        response = self.client.get(self.url, HTTP_ACCEPT_LANGUAGE="ru")
+        self.assertContains(response, "Изменить")
@@ -0,0 +1,168 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tasks.search import search_tasks
+from task_manager.tasks.views import TasksListView
+
+User = get_user_model()
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class SearchTasksTest(TestCase):
+    """Тесты полнотекстового поиска задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.status = Status.objects.create(name="новый")
+        self.in_name = self.create_task(
+            "Починить принтер", "Бумага застревает в лотке"
+        )
+        self.in_description = self.create_task(
+            "Офисная техника", "Заказать картридж для принтера"
+        )
+        self.other = self.create_task("Обновить сайт", "Новая главная")
+
+    def create_task(self, name, description=""):
+        return Task.objects.create(
+            name=name,
+            description=description,
+            status=self.status,
+            author=self.author,
+        )
+
+    def search(self, query):
+        return list(
+            search_tasks(Task.objects.all(), query).order_by(
+                "-search_rank", "-id"
+            )
+        )
+
+    def test_finds_by_name_and_description(self):
+        self.assertEqual(
+            set(self.search("принтер")), {self.in_name, self.in_description}
+        )
+        self.assertEqual(self.search("картридж"), [self.in_description])
+
+    def test_name_ranks_above_description(self):
+        self.assertEqual(
+            self.search("принтер"), [self.in_name, self.in_description]
+        )
+
+    def test_case_insensitive_prefix(self):
+        self.assertEqual(self.search("ПОЧИН"), [self.in_name])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.search("принтер бумага"), [self.in_name])
+        self.assertEqual(self.search("принтер сайт"), [])
+
+    def test_query_syntax_is_ignored(self):
+        """Кавычки и операторы из ввода не ломают запрос"""
+        self.assertEqual(self.search('"картридж" OR (*'), [])
+        self.assertEqual(self.search('"картридж*'), [self.in_description])
+
+    def test_query_without_words_returns_queryset(self):
+        queryset = Task.objects.all()
+        self.assertIs(search_tasks(queryset, " !? "), queryset)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other.name = "Заменить принтер"
+        self.other.save()
+        self.assertIn(self.other, self.search("принтер"))
+        self.assertEqual(self.search("сайт"), [])
+
+        self.in_name.delete()
+        self.assertEqual(
+            self.search("принтер"), [self.other, self.in_description]
+        )
+
+    def test_no_like_scan(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.search("принтер")
+        self.assertNotIn("LIKE", queries[0]["sql"].upper())
+
+
+@mock.patch.object(TasksListView, "paginate_by", 2)
+class TasksListSearchTest(TestCase):
+    """Тесты поиска на странице задач"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(
+            username="author", password=TEST_PASSWORD
+        )
+        self.status_new = Status.objects.create(name="новый")
+        self.status_done = Status.objects.create(name="завершен")
+        for number in range(5):
+            Task.objects.create(
+                name=f"Отчет {number}",
+                description="отчет " * number,
+                status=self.status_new,
+                author=self.author,
+            )
+        Task.objects.create(
+            name="Отчет завершен",
+            status=self.status_done,
+            author=self.author,
+        )
+        Task.objects.create(
+            name="Другое", status=self.status_new, author=self.author
+        )
+        self.client.login(username="author", password=TEST_PASSWORD)
+
+    def test_search_pages_follow_rank(self):
+        url = reverse("tasks:tasks")
+        response = self.client.get(
+            url, {"q": "отчет", "status": self.status_new.id}
+        )
+        seen = []
+        while True:
+            seen.extend(response.context["tasks"])
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"cursor": page.next_cursor})
+            self.assertEqual(
+                response.context["filter"].form["q"].value(), "отчет"
+            )
+
+        ranks = [task.search_rank for task in seen]
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len({task.pk for task in seen}), 5)
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        self.assertTrue(
+            all(task.status_id == self.status_new.id for task in seen)
+        )
+
+    def test_pages_across_equal_ranks(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("ts_rank is PostgreSQL-only")
+        for _number in range(5):
+            Task.objects.create(
+                name="Счет", status=self.status_new, author=self.author
+            )
+        url = reverse("tasks:tasks")
+        response = self.client.get(url, {"q": "счет"})
+        seen = []
+        for _page in range(5):
+            seen.extend(task.pk for task in response.context["tasks"])
+            page = response.context["page_obj"]
+            if not page.has_next():
+                break
+            response = self.client.get(url, {"cursor": page.next_cursor})
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_empty_search_keeps_date_order(self):
+        response = self.client.get(reverse("tasks:tasks"), {"q": ""})
+        self.assertEqual(
+            [task.name for task in response.context["tasks"]],
+            ["Другое", "Отчет завершен"],
+        )
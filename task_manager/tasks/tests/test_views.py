@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 from task_manager.statuses.models import Status
@@ -219,3 +219,13 @@ class TaskPermissionTest(TestCase):
         self.assertEqual(
             Task.objects.count(), task_count_before
         )  # Задача не удалена
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncTasksViewsTest(TasksViewsTest):
+    """Те же сценарии с асинхронными view"""
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncTaskPermissionTest(TaskPermissionTest):
+    """Те же сценарии с асинхронными view"""
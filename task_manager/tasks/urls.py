@@ -6,8 +6,38 @@ app_name = "tasks"
 
 urlpatterns = [
     path("", views.TasksListView.as_view(), name="tasks"),
+    path(
+        "export.<str:export_format>",
+        views.TaskExportView.as_view(),
+        name="export",
+    ),
+    path("import/", views.TaskImportView.as_view(), name="import"),
+    path("bulk/", views.TaskBulkView.as_view(), name="bulk"),
+    path("rows/", views.TaskRowsView.as_view(), name="rows"),
+    path("board/", views.TaskBoardView.as_view(), name="board"),
+    path(
+        "board/<int:pk>/",
+        views.TaskBoardColumnView.as_view(),
+        name="board_column",
+    ),
     path("create/", views.TaskCreateView.as_view(), name="create"),
     path("<int:pk>/", views.TaskDetailView.as_view(), name="detail"),
     path("<int:pk>/update/", views.TaskUpdateView.as_view(), name="update"),
     path("<int:pk>/delete/", views.TaskDeleteView.as_view(), name="delete"),
+    path("<int:pk>/move/", views.TaskMoveView.as_view(), name="move"),
+    path(
+        "autocomplete/users/",
+        views.UserAutocompleteView.as_view(),
+        name="autocomplete_users",
+    ),
+    path(
+        "autocomplete/labels/",
+        views.LabelAutocompleteView.as_view(),
+        name="autocomplete_labels",
+    ),
+    path(
+        "autocomplete/statuses/",
+        views.StatusAutocompleteView.as_view(),
+        name="autocomplete_statuses",
+    ),
 ]
@@ -0,0 +1,8 @@
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+
+def validate_task_name(name):
+    """Правила для названия задачи, общие для формы и импорта"""
+    if len(name) < 2:
+        raise ValidationError(_("Task name must be at least 2 characters long"))
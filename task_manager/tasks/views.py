@@ -1,23 +1,74 @@
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.contrib.messages.views import SuccessMessageMixin
-from django.shortcuts import redirect
-from django.urls import reverse_lazy
+from django.db.models import Count, Q
+from django.forms import Media
+from django.http import (
+    Http404,
+    JsonResponse,
+    QueryDict,
+    StreamingHttpResponse,
+)
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import NoReverseMatch, reverse, reverse_lazy
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.utils.translation import gettext_lazy as _
-from django.views.generic import CreateView, DeleteView, DetailView, UpdateView
-from django_filters.views import FilterView
+from django.views.generic import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    FormView,
+    ListView,
+    TemplateView,
+    UpdateView,
+    View,
+)
+from django_filters.views import FilterMixin, FilterView
+
+from task_manager.async_views import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncDetailView,
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+    AsyncUpdateView,
+)
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
 
+from .choices import status_choices
+from .conditional import (
+    AsyncConditionalGetMixin,
+    ConditionalGetMixin,
+    task_list_version,
+)
+from .events import broker
+from .export import EXPORT_FORMATS
 from .filters import TaskFilter
-from .forms import TaskForm
+from .forms import TaskBulkForm, TaskForm, TaskImportForm
+from .importer import TaskImporter, read_rows
 from .models import Task
+from .pagination import Cursor, KeysetPaginator
+from .search import SEARCH_ORDERING
+
 
+class TaskListMixin:
+    """Общее у синхронного и асинхронного списка задач: фильтры,
+    курсор, сортировка страницы и контекст шаблона"""
 
-class TasksListView(LoginRequiredMixin, FilterView):
     model = Task
     template_name = "tasks/index.html"
     context_object_name = "tasks"
     filterset_class = TaskFilter
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
+    paginate_by = 50
+    cursor_param = "cursor"
 
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -25,12 +76,332 @@ class TasksListView(LoginRequiredMixin, FilterView):
             "status", "author", "executor"
         ).prefetch_related("labels")
 
+    def get_cursor(self):
+        if not hasattr(self, "_cursor"):
+            self._cursor = Cursor.decode(
+                self.request.GET.get(self.cursor_param),
+                [self.get_ordering(), SEARCH_ORDERING],
+            )
+        return self._cursor
+
+    def get_filterset_kwargs(self, filterset_class):
+        """Фильтры следующих страниц берутся из курсора, а не из URL"""
+        kwargs = super().get_filterset_kwargs(filterset_class)
+        cursor = self.get_cursor()
+        if cursor is not None:
+            kwargs["data"] = cursor.params or None
+        return kwargs
+
+    def get_filter_params(self):
+        cursor = self.get_cursor()
+        if cursor is not None:
+            return cursor.params
+        params = self.request.GET.copy()
+        params.pop(self.cursor_param, None)
+        return params
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """Keyset-пагинация по (created_at, id) вместо OFFSET/COUNT.
+        Результаты поиска идут по релевантности - (search_rank, id)"""
+        ordering = self.get_ordering()
+        if "search_rank" in queryset.query.annotations:
+            ordering = SEARCH_ORDERING
+        return KeysetPaginator(per_page, ordering)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["filter_query"] = self.get_filter_params().urlencode()
+        context["events_url"] = self.get_events_url()
+        context["bulk_form"] = TaskBulkForm()
+        context["media"] = (
+            context["filter"].form.media + context["bulk_form"].media
+        )
+        if context["events_url"]:
+            context["media"] += Media(js=["tasks/js/live.js"])
+        return context
+
+    def get_events_url(self):
+        """Поток изменений есть только среди асинхронных маршрутов"""
+        try:
+            return reverse("tasks:events")
+        except NoReverseMatch:
+            return None
+
+
+class TasksListView(
+    LoginRequiredMixin, ConditionalGetMixin, TaskListMixin, FilterView
+):
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.paginate(
+            queryset, self.get_cursor(), self.get_filter_params()
+        )
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def get_validators(self):
+        """Версия списка задач и адрес страницы с фильтрами и курсором.
+
+        Версию меняют сохранение и удаление задачи (signals.py), а
+        массовые операции в обход сигналов - сами, после фиксации
+        транзакции. К таблице задач проверка не обращается и стоит
+        одинаково при любом их числе; Last-Modified у списка поэтому нет.
+        """
+        return None, [task_list_version.get(), self.request.get_full_path()]
+
+
+class AsyncTasksListView(
+    AsyncLoginRequiredMixin,
+    AsyncConditionalGetMixin,
+    TaskListMixin,
+    FilterMixin,
+    AsyncListView,
+):
+    """Список задач под ASGI: фильтры проверяются в потоке (их поля
+    читают справочники синхронно), страница задач вместе с метками
+    читается через aiterator"""
+
+    async def aget_queryset(self):
+        return await sync_to_async(self.filter_tasks)()
+
+    def filter_tasks(self):
+        """Как BaseFilterView.get: выборка фильтра или пустая выборка,
+        если фильтры не прошли проверку"""
+        self.filterset = self.get_filterset(self.get_filterset_class())
+        if (
+            not self.filterset.is_bound
+            or self.filterset.is_valid()
+            or not self.get_strict()
+        ):
+            return self.filterset.qs
+        return self.filterset.queryset.none()
+
+    async def apaginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = await paginator.apaginate(
+            queryset, self.get_cursor(), self.get_filter_params()
+        )
+        return paginator, page
+
+    async def aget_validators(self):
+        return None, [
+            await task_list_version.aget(),
+            self.request.get_full_path(),
+        ]
+
+    def get_context_data(self, **kwargs):
+        kwargs.setdefault("filter", self.filterset)
+        return super().get_context_data(**kwargs)
+
+
+class TaskExportMixin:
+    """Потоковая выгрузка задач с теми же фильтрами, что и в списке.
+
+    Задачи читаются через iterator(chunk_size) - в PostgreSQL это серверный
+    курсор, - а метки подгружаются одним запросом на пачку. Поэтому память
+    не растет с числом задач, а первые строки уходят клиенту сразу.
+    """
+
+    chunk_size = 2000
+
+    def get_queryset(self):
+        filterset = TaskFilter(
+            self.request.GET or None,
+            queryset=Task.objects.select_related(
+                "status", "author", "executor"
+            ).prefetch_related("labels"),
+            request=self.request,
+        )
+        if filterset.is_bound and not filterset.is_valid():
+            return filterset.queryset.none()
+        queryset = filterset.qs
+        if "search_rank" in queryset.query.annotations:
+            return queryset.order_by(*SEARCH_ORDERING)
+        return queryset.order_by(*TasksListView.ordering)
+
+    def get_export_format(self, export_format):
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        return EXPORT_FORMATS[export_format]
+
+    def streaming_response(self, content, content_type, export_format):
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response["Content-Disposition"] = (
+            f'attachment; filename="tasks.{export_format}"'
+        )
+        return response
+
+
+class TaskExportView(LoginRequiredMixin, TaskExportMixin, View):
+    def get(self, request, export_format):
+        content_type, stream, _astream = self.get_export_format(export_format)
+        tasks = self.get_queryset().iterator(chunk_size=self.chunk_size)
+        return self.streaming_response(
+            stream(tasks), content_type, export_format
+        )
+
+
+class TaskRowsView(LoginRequiredMixin, ListView):
+    """Строки таблицы для задач из параметра ids - живое обновление списка.
+
+    Остальные параметры - фильтры страницы: задача, которая ушла из-под
+    фильтра, в ответ не попадает, и страница убирает ее строку.
+    """
+
+    template_name = "tasks/rows.html"
+    context_object_name = "tasks"
+
+    def get_task_ids(self):
+        ids = self.request.GET.get("ids", "").split(",")
+        task_ids = [int(task_id) for task_id in ids if task_id.isdigit()]
+        # Больше задач за раз поток не присылает: буфер сбросился бы
+        return task_ids[: settings.TASK_EVENTS_BUFFER_SIZE]
+
+    def get_queryset(self):
+        params = self.request.GET.copy()
+        params.pop("ids", None)
+        filterset = TaskFilter(
+            params or None,
+            queryset=Task.objects.filter(pk__in=self.get_task_ids())
+            .select_related("status", "author", "executor")
+            .prefetch_related("labels"),
+            request=self.request,
+        )
+        if filterset.is_bound and not filterset.is_valid():
+            return filterset.queryset.none()
+        return filterset.qs
 
-class TaskDetailView(LoginRequiredMixin, DetailView):
+
+class TaskBoardMixin:
+    """Задачи доски: фильтры списка, кроме статуса - статус здесь колонка"""
+
+    def get_filter_params(self):
+        params = self.request.GET.copy()
+        params.pop("status", None)
+        params.pop("cursor", None)
+        return params
+
+    def filter_tasks(self, params):
+        filterset = TaskFilter(
+            params or None, queryset=Task.objects.all(), request=self.request
+        )
+        if filterset.is_bound and not filterset.is_valid():
+            return filterset.queryset.none()
+        return filterset.qs
+
+
+class TaskBoardView(LoginRequiredMixin, TaskBoardMixin, TemplateView):
+    """Доска: колонка на каждый статус.
+
+    Число задач в колонках - один запрос с GROUP BY status_id по индексу
+    tasks_status_created_idx, названия статусов - из кеша. Сами задачи
+    страница подгружает по колонкам через TaskBoardColumnView.
+    """
+
+    template_name = "tasks/board.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        params = self.get_filter_params()
+        counts = dict(
+            self.filter_tasks(params)
+            .order_by()
+            .values_list("status")
+            .annotate(count=Count("id"))
+        )
+        context["columns"] = [
+            {"status_id": pk, "name": name, "count": counts.get(pk, 0)}
+            for pk, name in status_choices.get()
+        ]
+        context["filter"] = TaskFilter(
+            params or None, queryset=Task.objects.none(), request=self.request
+        )
+        context["filter_query"] = params.urlencode()
+        context["media"] = context["filter"].form.media + Media(
+            js=["tasks/js/board.js"]
+        )
+        return context
+
+
+class TaskBoardColumnView(LoginRequiredMixin, TaskBoardMixin, TemplateView):
+    """Страница карточек одной колонки доски.
+
+    Keyset-пагинация, как в списке: следующая страница - один запрос
+    по индексу (status_id, created_at, id), а фильтры едут в курсоре.
+    """
+
+    template_name = "tasks/board_cards.html"
+    paginate_by = 20
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        cursor = Cursor.decode(
+            self.request.GET.get("cursor"), [TasksListView.ordering]
+        )
+        params = cursor.params if cursor else self.get_filter_params()
+        queryset = (
+            self.filter_tasks(params)
+            .filter(status_id=self.kwargs["pk"])
+            .select_related("executor")
+        )
+        paginator = KeysetPaginator(self.paginate_by, TasksListView.ordering)
+        context["page_obj"] = paginator.paginate(queryset, cursor, params)
+        context["status_id"] = self.kwargs["pk"]
+        return context
+
+
+class TaskMoveMixin:
+    """Перенос карточки в другую колонку - смена одного поля status.
+
+    Форма задачи не нужна: сохраняются только status и updated_at, а
+    сигналы post_save обновляют версию списка и поток изменений.
+    """
+
+    http_method_names = ["post"]
+    update_fields = ["status", "updated_at"]
+
+    def get_status_id(self):
+        status_id = self.request.POST.get("status", "")
+        return int(status_id) if status_id.isdigit() else None
+
+    def invalid_status(self):
+        return JsonResponse(
+            {"error": str(_("Select a valid status"))}, status=400
+        )
+
+    def moved(self, task):
+        return JsonResponse({"id": task.pk, "status": task.status_id})
+
+
+class TaskMoveView(LoginRequiredMixin, TaskMoveMixin, View):
+    def post(self, request, pk):
+        task = get_object_or_404(Task, pk=pk)
+        status_id = self.get_status_id()
+        status = None
+        if status_id is not None:
+            status = Status.objects.filter(pk=status_id).first()
+        if status is None:
+            return self.invalid_status()
+        # Объект статуса, а не только id: save() смотрит на is_closed
+        task.status = status
+        task.save(update_fields=self.update_fields)
+        return self.moved(task)
+
+
+class TaskDetailView(LoginRequiredMixin, ConditionalGetMixin, DetailView):
     model = Task
     template_name = "tasks/detail.html"
     context_object_name = "task"
 
+    def get_validators(self):
+        updated_at = (
+            Task.objects.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            return None
+        return updated_at, [self.kwargs["pk"], updated_at]
+
     def get_queryset(self):
         return (
             super()
@@ -78,3 +449,309 @@ class TaskDeleteView(
         """Обработка случая, когда пользователь не автор"""
         messages.error(self.request, _("Only the author can delete a task"))
         return redirect("tasks:tasks")
+
+
+class TaskBulkView(LoginRequiredMixin, FormView):
+    """Действие над задачами, отмеченными в списке"""
+
+    form_class = TaskBulkForm
+    http_method_names = ["post"]
+
+    def get_success_url(self):
+        """Возврат на ту же страницу списка, с теми же фильтрами"""
+        url = self.request.POST.get("next")
+        if url and url_has_allowed_host_and_scheme(
+            url,
+            allowed_hosts={self.request.get_host()},
+            require_https=self.request.is_secure(),
+        ):
+            return url
+        return reverse("tasks:tasks")
+
+    def form_valid(self, form):
+        count, denied = form.save(self.request.user)
+        if count and form.cleaned_data["action"] == "delete":
+            messages.success(
+                self.request, _("Tasks deleted: %(count)d") % {"count": count}
+            )
+        elif count:
+            messages.success(
+                self.request, _("Tasks updated: %(count)d") % {"count": count}
+            )
+        if denied:
+            messages.error(
+                self.request,
+                _("Only the author can delete a task. Not deleted: %(tasks)s")
+                % {"tasks": ", ".join(f"#{task.pk} {task}" for task in denied)},
+            )
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_success_url())
+
+
+class TaskImportView(LoginRequiredMixin, FormView):
+    """Загрузка файла с задачами; автор задач - текущий пользователь"""
+
+    form_class = TaskImportForm
+    template_name = "tasks/import.html"
+    batch_size = 1000
+    # Сколько отклоненных строк показать на странице
+    rejected_limit = 100
+
+    def form_valid(self, form):
+        upload = form.cleaned_data["file"]
+        upload.open()
+        file = io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline="")
+        importer = TaskImporter(self.request.user, self.batch_size)
+        try:
+            result = importer.run(read_rows(file, form.cleaned_data["format"]))
+        except UnicodeDecodeError:
+            form.add_error("file", _("The file must be UTF-8 encoded"))
+            return self.form_invalid(form)
+        return self.render_to_response(
+            self.get_context_data(
+                form=self.form_class(),
+                result=result,
+                rejected=result.rejected[: self.rejected_limit],
+            )
+        )
+
+
+class AutocompleteView(LoginRequiredMixin, View):
+    """Постраничный поиск вариантов для выпадающих списков по началу строки.
+
+    Ответ: {"results": [{"id": ..., "text": ...}], "next": курсор или null}.
+    """
+
+    model = None
+    search_fields = ("name",)
+    ordering = ("name", "id")
+    paginate_by = 20
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def get_label(self, obj):
+        return str(obj)
+
+    def get(self, request, *args, **kwargs):
+        cursor = Cursor.decode(request.GET.get("cursor"), [self.ordering])
+        params = cursor.params if cursor else QueryDict(mutable=True)
+        if cursor is None:
+            params["q"] = request.GET.get("q", "").strip()
+
+        queryset = self.get_queryset()
+        query = params.get("q", "")
+        if query:
+            condition = Q()
+            for field in self.search_fields:
+                condition |= Q(**{f"{field}__istartswith": query})
+            queryset = queryset.filter(condition)
+
+        paginator = KeysetPaginator(self.paginate_by, self.ordering)
+        page = paginator.paginate(queryset, cursor, params)
+        return JsonResponse(
+            {
+                "results": [
+                    {"id": obj.pk, "text": self.get_label(obj)} for obj in page
+                ],
+                "next": page.next_cursor,
+            }
+        )
+
+
+class StatusAutocompleteView(AutocompleteView):
+    model = Status
+
+    def get_queryset(self):
+        return Status.objects.only("name")
+
+
+class LabelAutocompleteView(AutocompleteView):
+    model = Label
+
+    def get_queryset(self):
+        return Label.objects.only("name")
+
+
+class UserAutocompleteView(AutocompleteView):
+    model = User
+    search_fields = ("username", "first_name", "last_name")
+    ordering = ("username", "id")
+
+    def get_queryset(self):
+        return User.objects.only("username", "first_name", "last_name")
+
+    def get_label(self, obj):
+        return obj.get_display_name()
+
+
+class AsyncTaskDetailView(
+    AsyncLoginRequiredMixin, AsyncConditionalGetMixin, AsyncDetailView
+):
+    model = Task
+    template_name = "tasks/detail.html"
+    context_object_name = "task"
+
+    async def aget_validators(self):
+        updated_at = await (
+            Task.objects.filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", flat=True)
+            .afirst()
+        )
+        if updated_at is None:
+            return None
+        return updated_at, [self.kwargs["pk"], updated_at]
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .select_related("status", "author", "executor")
+            .prefetch_related("labels")
+        )
+
+
+class AsyncTaskCreateView(AsyncLoginRequiredMixin, AsyncCreateView):
+    model = Task
+    form_class = TaskForm
+    template_name = "tasks/create.html"
+    success_url = reverse_lazy("tasks:tasks")
+    success_message = _("Task successfully created")
+
+    def save_form(self, form):
+        """Устанавливаем автора задачи автоматически"""
+        form.instance.author = self.request.user
+        return super().save_form(form)
+
+
+class AsyncTaskUpdateView(AsyncLoginRequiredMixin, AsyncUpdateView):
+    model = Task
+    form_class = TaskForm
+    template_name = "tasks/update.html"
+    success_url = reverse_lazy("tasks:tasks")
+    success_message = _("Task successfully updated")
+
+    def get_queryset(self):
+        # Форма читает метки задачи при создании, синхронно
+        return super().get_queryset().prefetch_related("labels")
+
+
+class AsyncTaskDeleteView(AsyncLoginRequiredMixin, AsyncDeleteView):
+    model = Task
+    template_name = "tasks/delete.html"
+    success_url = reverse_lazy("tasks:tasks")
+    success_message = _("Task successfully deleted")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        if self.object.author_id != request.user.pk:
+            return self.handle_no_permission()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        if self.object.author_id != request.user.pk:
+            return self.handle_no_permission()
+        return await self.adelete_object()
+
+    def handle_no_permission(self):
+        """Обработка случая, когда пользователь не автор"""
+        messages.error(self.request, _("Only the author can delete a task"))
+        return redirect("tasks:tasks")
+
+
+class EventStreamResponse(StreamingHttpResponse):
+    """Поток, который закрывается вместе с генератором событий.
+
+    StreamingHttpResponse оборачивает асинхронный генератор в свой, и
+    aclose() обертки до генератора не доходит: подписка осталась бы в
+    брокере до сборки мусора. Здесь streaming_content и __aiter__ отдают
+    сам генератор, поэтому он должен выдавать bytes.
+    """
+
+    @property
+    def streaming_content(self):
+        return self._iterator
+
+    @streaming_content.setter
+    def streaming_content(self, value):
+        self._set_streaming_content(value)
+
+    def __aiter__(self):
+        return self._iterator
+
+
+class TaskEventsView(AsyncLoginRequiredMixin, View):
+    """Поток изменений задач в формате Server-Sent Events.
+
+    Событие - действие (create, update, delete или reset) и JSON-список
+    номеров задач. Пока изменений нет, раз в TASK_EVENTS_HEARTBEAT
+    секунд уходит комментарий: прокси не закрывают соединение, а
+    отключившийся клиент обнаруживается при записи.
+    """
+
+    # Задержка переподключения браузера, мс
+    retry = 5000
+
+    async def get(self, request, *args, **kwargs):
+        response = EventStreamResponse(
+            self.stream(), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx не должен копить поток в своем буфере
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self):
+        subscription = broker.subscribe()
+        try:
+            yield f"retry: {self.retry}\n\n".encode()
+            while True:
+                events = await subscription.get(settings.TASK_EVENTS_HEARTBEAT)
+                if not events:
+                    yield b": ping\n\n"
+                for action, task_ids in events:
+                    yield (
+                        f"event: {action}\ndata: {json.dumps(task_ids)}\n\n"
+                    ).encode()
+        finally:
+            broker.unsubscribe(subscription)
+
+
+class AsyncTaskExportView(AsyncLoginRequiredMixin, TaskExportMixin, View):
+    """Выгрузка под ASGI читает задачи через aiterator(chunk_size).
+
+    Синхронный итератор ASGI-обработчик Django собрал бы в список целиком
+    перед отправкой. Фильтры проверяются синхронно: формы django-filter
+    могут читать базу.
+    """
+
+    async def get(self, request, export_format):
+        content_type, _stream, astream = self.get_export_format(export_format)
+        queryset = await sync_to_async(self.get_queryset)()
+        tasks = queryset.aiterator(chunk_size=self.chunk_size)
+        return self.streaming_response(
+            astream(tasks), content_type, export_format
+        )
+
+
+class AsyncTaskMoveView(AsyncLoginRequiredMixin, TaskMoveMixin, View):
+    async def post(self, request, pk):
+        try:
+            task = await Task.objects.aget(pk=pk)
+        except Task.DoesNotExist:
+            raise Http404 from None
+        status_id = self.get_status_id()
+        status = None
+        if status_id is not None:
+            status = await Status.objects.filter(pk=status_id).afirst()
+        if status is None:
+            return self.invalid_status()
+        task.status = status
+        await task.asave(update_fields=self.update_fields)
+        return self.moved(task)
@@ -0,0 +1,46 @@
+from django.forms import Select, SelectMultiple
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+
+class AutocompleteMixin:
+    """Список, который рендерит только выбранные варианты.
+
+    Остальные варианты подгружаются в браузере из JSON-эндпоинта
+    по мере ввода, поэтому размер страницы не зависит от числа записей.
+    """
+
+    def __init__(self, url_name, attrs=None, choices=()):
+        self.url_name = url_name
+        super().__init__(attrs, choices)
+
+    class Media:
+        js = ("tasks/js/autocomplete.js",)
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs["data-autocomplete-url"] = reverse(self.url_name)
+        attrs["data-autocomplete-placeholder"] = _("Search…")
+        attrs["data-autocomplete-more"] = _("Show more")
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        selected = {str(v) for v in value if v not in (None, "")}
+        choices = self.choices
+        self.choices = [
+            (option_value, label)
+            for option_value, label in choices
+            if option_value == "" or str(option_value) in selected
+        ]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+
+class AutocompleteSelect(AutocompleteMixin, Select):
+    pass
+
+
+class AutocompleteSelectMultiple(AutocompleteMixin, SelectMultiple):
+    pass
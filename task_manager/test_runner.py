@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """Тесты идут в одном процессе, и кеш в его памяти для них общий,
+    как Redis для нескольких воркеров. Без этого тесты проверяли бы
+    обходной путь для однопроцессного кеша, а не основной; сам обходной
+    путь тесты включают через override_settings."""
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.shared_cache_is_local = settings.SHARED_CACHE_IS_LOCAL
+        settings.SHARED_CACHE_IS_LOCAL = False
+
+    def teardown_test_environment(self, **kwargs):
+        settings.SHARED_CACHE_IS_LOCAL = self.shared_cache_is_local
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,124 @@
+"""Бюджет SQL-запросов для тестов view.
+
+    class MyViewTest(QueryBudgetMixin, TestCase):
+        def test_list(self):
+            with self.assertQueryBudget(5, max_time_ms=50):
+                self.client.get(url)
+
+Контекст считает запросы через execute_wrapper соединения и запоминает
+для каждого место вызова: строку шаблона, если запрос выполнил шаблон
+(например, обращение к task.executor в цикле), иначе первую строку кода
+проекта в стеке. При превышении бюджета тест падает со списком запросов,
+сгруппированных по месту вызова, - так N+1 видно сразу.
+"""
+
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from task_manager.instrumentation import ExecuteWrapper, call_site
+
+# Служебные запросы тестовой транзакции: к работе view отношения не имеют
+IGNORED_SQL = re.compile(r"^\s*(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO)\b")
+
+# Литералы, которые отличают "одинаковые" запросы N+1 друг от друга
+LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+@dataclass
+class CapturedQuery:
+    sql: str
+    seconds: float
+    call_site: str
+
+
+def normalize_sql(sql):
+    """Запрос без литералов: SELECT ... WHERE id = ? вместо id = 15"""
+    return LITERAL_RE.sub("?", sql)
+
+
+class QueryBudget(ExecuteWrapper):
+    """Контекст, который собирает запросы к базе и проверяет бюджет"""
+
+    def __init__(self, max_queries, max_time_ms=None, using=DEFAULT_DB_ALIAS):
+        self.max_queries = max_queries
+        self.max_time_ms = max_time_ms
+        self.connection = connections[using]
+        self.queries = []
+
+    def __enter__(self):
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._wrapper.__exit__(exc_type, exc_value, traceback)
+
+    def record(self, sql, params, many, context, seconds):
+        if not IGNORED_SQL.match(sql):
+            self.queries.append(
+                CapturedQuery(sql, seconds, call_site(sys._getframe()))
+            )
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def time_ms(self):
+        return sum(query.seconds for query in self.queries) * 1000
+
+    def errors(self):
+        errors = []
+        if self.count > self.max_queries:
+            errors.append(
+                f"{self.count} queries, the budget is {self.max_queries}"
+            )
+        if self.max_time_ms is not None and self.time_ms > self.max_time_ms:
+            errors.append(
+                f"{self.time_ms:.1f} ms in queries, "
+                f"the budget is {self.max_time_ms} ms"
+            )
+        return errors
+
+    def report(self):
+        """Запросы, сгруппированные по месту вызова, самые частые - первыми"""
+        sites = defaultdict(list)
+        for query in self.queries:
+            sites[query.call_site].append(query)
+        lines = []
+        for site, queries in sorted(
+            sites.items(), key=lambda item: -len(item[1])
+        ):
+            total_ms = sum(query.seconds for query in queries) * 1000
+            lines.append(f"{len(queries)} x {site} ({total_ms:.1f} ms)")
+            statements = Counter(normalize_sql(query.sql) for query in queries)
+            for sql, count in statements.most_common():
+                lines.append(f"    {count} x {sql}")
+        return "\n".join(lines)
+
+
+class QueryBudgetMixin:
+    """assertQueryBudget для TestCase"""
+
+    def assertQueryBudget(
+        self, max_queries, max_time_ms=None, using=DEFAULT_DB_ALIAS
+    ):
+        return _AssertQueryBudget(self, max_queries, max_time_ms, using)
+
+
+class _AssertQueryBudget(QueryBudget):
+    def __init__(self, test_case, *args):
+        super().__init__(*args)
+        self.test_case = test_case
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        super().__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        errors = self.errors()
+        if errors:
+            self.test_case.fail("; ".join(errors) + "\n" + self.report())
@@ -0,0 +1,110 @@
+from unittest import mock
+
+import rollbar
+from asgiref.sync import async_to_sync, iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from django.utils.module_loading import import_string
+from rollbar.lib.session import get_current_session
+
+from task_manager.instrumentation import QueryTimer
+from task_manager.labels.models import Label
+from task_manager.middleware import RollbarMiddleware
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsgiRequestTest(TestCase):
+    """Запросы через ASGI-обработчик с асинхронными view"""
+
+    def setUp(self):
+        user = User.objects.create_user(username="user")
+        Status.objects.create(name="новый")
+        self.async_client.force_login(user)
+
+    def test_middleware_is_async_capable(self):
+        # Один синхронный middleware перевел бы всю цепочку в поток
+        for path in settings.MIDDLEWARE:
+            with self.subTest(path):
+                middleware = import_string(path)
+                self.assertTrue(getattr(middleware, "async_capable", False))
+
+    @override_settings(REQUEST_TIMING=True)
+    async def test_queries_in_threads_are_timed(self):
+        url = reverse("statuses:statuses")
+        await self.async_client.get(url)
+        response = await self.async_client.get(url)
+        self.assertContains(response, "новый")
+        # Запрос списка выполнен в потоке sync_to_async, но учтен
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    def test_wrapper_sees_other_thread_connections(self):
+        def count():
+            try:
+                # Статусы заблокированы записью в setUp, метки - нет
+                return Label.objects.count()
+            finally:
+                connection.close()
+
+        timer = QueryTimer()
+        with timer.install():
+            async_to_sync(sync_to_async(count, thread_sensitive=False))()
+        self.assertEqual(timer.count, 1)
+
+
+@override_settings(ROLLBAR={"access_token": "token", "patch_debugview": False})
+class RollbarMiddlewareTest(SimpleTestCase):
+    """Тесты отчетов Rollbar без блокировки цикла событий"""
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(rollbar, "init"),
+            mock.patch.object(rollbar, "BASE_DATA_HOOK"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.request = RequestFactory().get(
+            "/", HTTP_BAGGAGE="rollbar.session.id=session"
+        )
+        try:
+            raise ValueError("boom")
+        except ValueError as error:
+            self.error = error
+
+    def test_sync_mode(self):
+        middleware = RollbarMiddleware(lambda request: HttpResponse())
+        self.assertFalse(iscoroutinefunction(middleware.process_exception))
+
+    async def test_async_report(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        middleware = RollbarMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with mock.patch.object(rollbar, "report_exc_info") as report:
+            await middleware.process_exception(self.request, self.error)
+        exc_info, request = report.call_args.args
+        self.assertEqual(
+            exc_info, (ValueError, self.error, self.error.__traceback__)
+        )
+        self.assertIs(request, self.request)
+
+    async def test_session_lives_until_response(self):
+        sessions = []
+
+        async def get_response(request):
+            sessions.append(get_current_session())
+            return HttpResponse()
+
+        await RollbarMiddleware(get_response)(self.request)
+        self.assertIn({"key": "session_id", "value": "session"}, sessions[0])
+        self.assertEqual(get_current_session(), [])
@@ -0,0 +1,213 @@
+import asyncio
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from task_manager.benchmarks import (
+    CASES,
+    BenchmarkRunner,
+    ConcurrencyBenchmark,
+    RowRenderBenchmark,
+    ServerBenchmark,
+    SessionBenchmark,
+    StartupBenchmark,
+    build_report,
+    compare_reports,
+)
+from task_manager.tasks.models import Task
+
+
+class BenchmarkRunnerTest(TestCase):
+    """Тесты нагрузочных замеров на маленькой базе"""
+
+    def test_run(self):
+        out = StringIO()
+        results = BenchmarkRunner(repeat=2, stdout=out).run([30, 60])
+        self.assertEqual(list(results), ["30", "60"])
+        self.assertGreaterEqual(Task.objects.count(), 60)
+        for cases in results.values():
+            self.assertEqual(list(cases), [case.name for case in CASES])
+            for stats in cases.values():
+                self.assertGreater(stats["queries"], 0)
+                self.assertLessEqual(stats["min_ms"], stats["median_ms"])
+                self.assertLessEqual(stats["median_ms"], stats["p95_ms"])
+        self.assertIn("task_list", out.getvalue())
+
+    def test_compare_reports(self):
+        base = build_report({"1000": {"task_list": {"median_ms": 10.0}}}, 5)
+        current = build_report(
+            {
+                "1000": {
+                    "task_list": {"median_ms": 12.0},
+                    "task_detail": {"median_ms": 1.0},
+                }
+            },
+            5,
+        )
+        self.assertEqual(
+            compare_reports(base, current),
+            [("1000", "task_list", 10.0, 12.0, 20.0)],
+        )
+
+
+class ConcurrencyBenchmarkTest(SimpleTestCase):
+    """Тесты сравнения профилей базы под параллельной нагрузкой"""
+
+    def test_run(self):
+        out = StringIO()
+        benchmark = ConcurrencyBenchmark(seconds=0.2, stdout=out)
+        # Базы профилей появляются во время теста, поэтому разрешаем их
+        # здесь, а не в атрибуте databases, который проверяется заранее
+        aliases = {f"benchmark_{name}" for name in benchmark.profiles()}
+        with (
+            mock.patch.object(type(self), "databases", aliases),
+            tempfile.TemporaryDirectory() as directory,
+        ):
+            results = benchmark.run([1, 2], directory)
+        self.assertEqual(
+            [(result.profile, result.threads) for result in results],
+            [
+                ("sqlite_default", 1),
+                ("sqlite_default", 2),
+                ("sqlite_tuned", 1),
+                ("sqlite_tuned", 2),
+            ],
+        )
+        for result in results:
+            self.assertGreater(result.operations, 0)
+            self.assertLessEqual(result.median_ms, result.p95_ms)
+        self.assertIn("sqlite_tuned", out.getvalue())
+
+    def test_crashed_thread_fails_run(self):
+        benchmark = ConcurrencyBenchmark(seconds=0.2)
+        aliases = {f"benchmark_{name}" for name in benchmark.profiles()}
+        with (
+            mock.patch.object(type(self), "databases", aliases),
+            mock.patch.object(
+                ConcurrencyBenchmark, "read", side_effect=KeyError("boom")
+            ),
+            tempfile.TemporaryDirectory() as directory,
+            self.assertRaisesMessage(RuntimeError, "threads crashed"),
+        ):
+            benchmark.run([2], directory)
+
+
+class SessionBenchmarkTest(TestCase):
+    """Тесты замера затрат на сессию"""
+
+    def test_run(self):
+        out = StringIO()
+        results = {
+            result.profile: result
+            for result in SessionBenchmark(requests=5, stdout=out).run()
+        }
+        self.assertEqual(list(results), list(SessionBenchmark.profiles))
+        self.assertEqual(results["db"].writes_per_request, 0)
+        self.assertEqual(results["db_sliding"].writes_per_request, 1)
+        self.assertEqual(results["coalesced"].queries_per_request, 0)
+        self.assertIn("coalesced", out.getvalue())
+
+
+class RowRenderBenchmarkTest(SimpleTestCase):
+    """Тесты замера отрисовки строк таблицы задач"""
+
+    def test_run(self):
+        out = StringIO()
+        results = RowRenderBenchmark(stdout=out).run([5, 20])
+        self.assertEqual([result.rows for result in results], [5, 20])
+        for result in results:
+            self.assertGreater(result.cold_ms, 0)
+            self.assertGreater(result.warm_ms, 0)
+        self.assertIn("warm", out.getvalue())
+
+
+class StartupBenchmarkTest(SimpleTestCase):
+    """Тесты замера запуска процесса и первых запросов"""
+
+    def test_run(self):
+        out = StringIO()
+        results = StartupBenchmark(runs=1, paths=("/login/",), stdout=out).run()
+        self.assertEqual([result.mode for result in results], ["cold", "warm"])
+        for result in results:
+            self.assertGreater(result.startup_ms, 0)
+            self.assertGreater(result.first_request_ms["/login/"], 0)
+            self.assertGreater(result.second_request_ms["/login/"], 0)
+        self.assertIn("/login/", out.getvalue())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok" if self.path == "/" else b"missing"
+        self.send_response(200 if self.path == "/" else 404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ServerBenchmarkTest(SimpleTestCase):
+    """Тесты нагрузки на HTTP-сервер одновременными клиентами"""
+
+    def setUp(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.port = server.server_address[1]
+        self.benchmark = ServerBenchmark(seconds=0.3)
+
+    def test_load(self):
+        result = asyncio.run(self.benchmark.load(self.port, 5, ["/"], ""))
+        self.assertEqual(result.clients, 5)
+        self.assertGreater(result.requests, 5)
+        self.assertEqual(result.errors, 0)
+        self.assertGreater(result.median_ms, 0)
+
+    def test_load_counts_errors(self):
+        result = asyncio.run(
+            self.benchmark.load(self.port, 2, ["/", "/missing"], "")
+        )
+        self.assertGreater(result.errors, 0)
+        self.assertGreater(result.requests, 0)
+
+    def test_setup(self):
+        with tempfile.TemporaryDirectory() as directory:
+            setup = self.benchmark.setup(self.benchmark.environment(directory))
+        self.assertTrue(setup["session"])
+        self.assertIsInstance(setup["task"], int)
+
+    def test_missing_server(self):
+        with (
+            mock.patch(
+                "task_manager.management.commands.benchmark_servers.find_spec",
+                return_value=None,
+            ),
+            self.assertRaisesMessage(CommandError, "uvicorn is not installed"),
+        ):
+            call_command("benchmark_servers", servers="asgi")
+
+
+class SQLiteSettingsTest(TestCase):
+    """Настройки SQLite применяются к каждому соединению"""
+
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_pragmas(self):
+        # 1 - NORMAL
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("cache_size"), -64 * 1024)
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
@@ -0,0 +1,165 @@
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import SimpleTestCase, override_settings
+from prometheus_client import REGISTRY
+
+from task_manager.cache import Entry, TieredCache
+from task_manager.checks import check_shared_cache
+
+
+def tier_count(tier, result):
+    return (
+        REGISTRY.get_sample_value(
+            "task_manager_cache_tier_requests_total",
+            {"tier": tier, "result": result},
+        )
+        or 0
+    )
+
+
+class TieredCacheTest(SimpleTestCase):
+    """Тесты двухуровневого кеша поверх кеша в файлах"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CACHES={
+                "default": {
+                    "BACKEND": "task_manager.cache.TieredCache",
+                    "LOCATION": "shared",
+                    "OPTIONS": {"LOCAL_MAX_ENTRIES": 2, "LOCAL_TIMEOUT": 60},
+                },
+                "shared": {
+                    "BACKEND": (
+                        "django.core.cache.backends.filebased.FileBasedCache"
+                    ),
+                    "LOCATION": directory.name,
+                },
+            }
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.cache = caches["default"]
+        self.shared = caches["shared"]
+
+    def test_backend(self):
+        self.assertIsInstance(self.cache, TieredCache)
+        self.assertIs(self.cache.shared, self.shared)
+
+    def test_set_get_delete(self):
+        self.cache.set("key", {"a": 1})
+        self.assertEqual(self.cache.get("key"), {"a": 1})
+        self.assertEqual(self.shared.get("key"), {"a": 1})
+        self.assertTrue(self.cache.has_key("key"))
+        self.cache.delete("key")
+        self.assertIsNone(self.cache.get("key"))
+        self.assertIsNone(self.shared.get("key"))
+        self.assertEqual(self.cache.get("key", "default"), "default")
+
+    def test_local_tier_serves_repeated_reads(self):
+        self.shared.set("key", "value")
+        local_hits = tier_count("local", "hit")
+        shared_hits = tier_count("shared", "hit")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(tier_count("shared", "hit"), shared_hits + 1)
+        # Изменение из другого процесса видно только после LOCAL_TIMEOUT
+        self.shared.set("key", "changed")
+        self.assertEqual(self.cache.get("key"), "value")
+        self.assertEqual(tier_count("local", "hit"), local_hits + 1)
+        self.assertEqual(tier_count("shared", "hit"), shared_hits + 1)
+
+    def test_local_tier_expires(self):
+        self.shared.set("key", "value")
+        self.cache.get("key")
+        self.shared.set("key", "changed")
+        with mock.patch(
+            "task_manager.cache.time.monotonic",
+            return_value=time.monotonic() + 61,
+        ):
+            self.assertEqual(self.cache.get("key"), "changed")
+
+    def test_local_tier_is_lru(self):
+        for key in ("a", "b"):
+            self.cache.set(key, key)
+        self.cache.get("a")
+        self.cache.set("c", "c")
+        self.assertEqual(list(self.cache._local), [":1:a", ":1:c"])
+
+    def test_misses(self):
+        local_misses = tier_count("local", "miss")
+        shared_misses = tier_count("shared", "miss")
+        self.assertIsNone(self.cache.get("missing"))
+        self.assertEqual(tier_count("local", "miss"), local_misses + 1)
+        self.assertEqual(tier_count("shared", "miss"), shared_misses + 1)
+
+    def test_versions(self):
+        self.cache.set("key", "v1", version=1)
+        self.cache.set("key", "v2", version=2)
+        self.assertEqual(self.cache.get("key", version=1), "v1")
+        self.assertEqual(self.cache.get("key", version=2), "v2")
+        self.assertIsNone(self.cache.get("key", version=3))
+
+    def test_incr_reads_shared_tier(self):
+        self.cache.set("counter", 1)
+        self.assertEqual(self.cache.incr("counter"), 2)
+        self.assertEqual(self.cache.get("counter"), 2)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+    def test_add(self):
+        self.assertTrue(self.cache.add("key", "first"))
+        self.assertFalse(self.cache.add("key", "second"))
+        self.assertEqual(self.cache.get("key"), "first")
+
+    def test_get_or_set(self):
+        build = mock.Mock(return_value=["choice"])
+        self.assertEqual(self.cache.get_or_set("key", build, 60), ["choice"])
+        self.assertEqual(self.cache.get_or_set("key", build, 60), ["choice"])
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(self.cache.get("key"), ["choice"])
+        self.assertIsInstance(self.shared.get("key"), Entry)
+
+    def test_get_or_set_refreshes_before_expiry(self):
+        self.cache.get_or_set("key", "old", 60)
+        # Далеко до срока: пересчета нет даже при большом разбросе
+        with mock.patch("task_manager.cache.random.random", return_value=0.9):
+            self.assertEqual(self.cache.get_or_set("key", "new", 60), "old")
+        # За секунду до срока с вычислением в 1 с пересчет вероятен
+        entry = self.shared.get("key")
+        entry.delta = 1.0
+        entry.expires_at = time.time() + 1
+        self.cache.set("key", entry, 60)
+        with mock.patch("task_manager.cache.random.random", return_value=0.9):
+            self.assertEqual(self.cache.get_or_set("key", "new", 60), "new")
+        self.assertEqual(self.cache.get("key"), "new")
+
+    def test_get_or_set_without_timeout_is_not_wrapped(self):
+        self.cache.get_or_set("key", 1, None)
+        self.assertEqual(self.shared.get("key"), 1)
+
+    def test_clear(self):
+        self.cache.set("key", "value")
+        self.cache.clear()
+        self.assertEqual(self.cache._local, {})
+        self.assertIsNone(self.shared.get("key"))
+
+
+class SharedCacheCheckTest(SimpleTestCase):
+    """Тесты проверки общего кеша в памяти процесса"""
+
+    @override_settings(SHARED_CACHE_IS_LOCAL=True, DEBUG=False)
+    def test_local_shared_cache_warns(self):
+        errors = check_shared_cache(None)
+        self.assertEqual([error.id for error in errors], ["task_manager.W001"])
+
+    @override_settings(SHARED_CACHE_IS_LOCAL=True, DEBUG=True)
+    def test_debug_is_silent(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+    @override_settings(SHARED_CACHE_IS_LOCAL=False, DEBUG=False)
+    def test_shared_backend_is_silent(self):
+        self.assertEqual(check_shared_cache(None), [])
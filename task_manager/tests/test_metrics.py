@@ -0,0 +1,104 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.metrics import build_registry
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class MetricsViewTest(TestCase):
+    """Тесты /metrics"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", password=TEST_PASSWORD
+        )
+        self.staff = User.objects.create_user(
+            username="staff", password=TEST_PASSWORD, is_staff=True
+        )
+        self.url = reverse("metrics")
+
+    def read_metrics(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode()
+
+    def test_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_token(self):
+        response = self.client.get(
+            self.url, headers={"Authorization": "Bearer secret"}
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(
+            self.url, headers={"Authorization": "Bearer wrong"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS=False)
+    def test_disabled(self):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_request_metrics(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("statuses:statuses"))
+        self.client.get("/no-such-page/")
+        text = self.read_metrics()
+        self.assertIn(
+            'task_manager_request_duration_seconds_bucket{le="0.005",'
+            'view="statuses:statuses"}',
+            text,
+        )
+        self.assertIn(
+            'task_manager_responses_total{status="200",'
+            'view="statuses:statuses"}',
+            text,
+        )
+        self.assertIn(
+            'task_manager_responses_total{status="404",view="<unresolved>"}',
+            text,
+        )
+        self.assertIn(
+            'task_manager_db_queries_total{view="statuses:statuses"}', text
+        )
+
+    def test_row_counts(self):
+        Status.objects.create(name="новый")
+        text = self.read_metrics()
+        self.assertIn('task_manager_rows{table="statuses"} 1.0', text)
+        self.assertIn('task_manager_rows{table="users"} 2.0', text)
+        self.assertIn('task_manager_rows{table="tasks"} 0.0', text)
+
+    def test_cache_requests(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("tasks:create"))
+        self.client.get(reverse("tasks:create"))
+        text = self.read_metrics()
+        for result in ("hit", "miss"):
+            self.assertIn(
+                'task_manager_cache_requests_total{cache="choices:statuses",'
+                f'result="{result}"}}',
+                text,
+            )
+
+    def test_multiprocess_registry(self):
+        """В многопроцессном режиме значения читаются из общего каталога"""
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            mock.patch.dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory),
+        ):
+            names = {metric.name for metric in build_registry().collect()}
+        self.assertEqual(names, {"task_manager_rows"})
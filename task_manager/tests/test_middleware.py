@@ -0,0 +1,78 @@
+import json
+import re
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.statuses.models import Status
+from task_manager.users.models import User
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+def parse_server_timing(header):
+    """{"db": (мс, описание), ...} из заголовка Server-Timing"""
+    metrics = {}
+    for entry in header.split(", "):
+        name, *params = entry.split(";")
+        values = dict(param.split("=", 1) for param in params)
+        metrics[name] = (float(values["dur"]), values.get("desc"))
+    return metrics
+
+
+class RequestTimingMiddlewareTest(TestCase):
+    """Тесты заголовка Server-Timing и журнала медленных запросов"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", password=TEST_PASSWORD
+        )
+        Status.objects.create(name="новый")
+        self.client.force_login(self.user)
+        self.url = reverse("statuses:statuses")
+
+    def test_disabled_by_default(self):
+        response = self.client.get(self.url)
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_TIMING=True)
+    def test_server_timing(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(list(metrics), ["db", "view", "tpl", "mw", "total"])
+        self.assertEqual(metrics["db"][1], '"2 queries"')
+        self.assertGreater(metrics["tpl"][0], 0)
+        self.assertLessEqual(
+            metrics["view"][0] + metrics["tpl"][0], metrics["total"][0]
+        )
+
+    @override_settings(REQUEST_TIMING=True)
+    def test_redirect(self):
+        """Без TemplateResponse время view считается до конца ответа"""
+        response = self.client.post(
+            reverse("statuses:create"), {"name": "в работе"}
+        )
+        self.assertEqual(response.status_code, 302)
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(metrics["tpl"][0], 0)
+        self.assertGreater(metrics["view"][0], 0)
+
+    @override_settings(REQUEST_TIMING=True, REQUEST_TIMING_SLOW_QUERIES=1)
+    def test_slow_request_log(self):
+        with self.assertLogs("task_manager.timing", "WARNING") as logs:
+            self.client.get(self.url)
+        payload = json.loads(
+            re.match(r".*Slow request (.*)$", logs.output[0]).group(1)
+        )
+        self.assertEqual(payload["path"], self.url)
+        self.assertEqual(payload["status"], 200)
+        self.assertEqual(payload["queries"], 2)
+        self.assertEqual(
+            payload["view"], "task_manager.statuses.views.StatusesListView"
+        )
+
+    @override_settings(REQUEST_TIMING=True)
+    def test_fast_request_is_not_logged(self):
+        with self.assertNoLogs("task_manager.timing"):
+            self.client.get(self.url)
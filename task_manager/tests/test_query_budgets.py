@@ -0,0 +1,372 @@
+"""Бюджеты SQL-запросов всех view задач, пользователей, статусов и меток.
+
+Каждый сценарий проверяется на нескольких объемах данных: число запросов
+не должно расти вместе с базой. Если бюджет превышен, тест показывает
+запросы, сгруппированные по месту вызова (шаблон или код проекта).
+Бюджет уменьшается вместе с оптимизациями; увеличивать его можно только
+вместе с объяснением, откуда взялся новый запрос.
+"""
+
+from dataclasses import dataclass
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from task_manager.labels.models import Label
+from task_manager.statuses.models import Status
+from task_manager.tasks.models import Task
+from task_manager.tests.query_budget import QueryBudgetMixin
+from task_manager.users.models import User
+
+# Объемы данных: задач, пользователей, статусов и меток каждого вида
+SIZES = (1, 10, 60)
+
+# Общий потолок времени запросов одного сценария, мс
+MAX_TIME_MS = 250
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+@dataclass
+class Case:
+    """Сценарий: request(test) возвращает (метод, путь, данные);
+    подготовка внутри request в бюджет не входит"""
+
+    name: str
+    max_queries: int
+    request: object
+    max_time_ms: int = MAX_TIME_MS
+
+
+def get(name, max_queries, url, *args, data=None):
+    return Case(
+        name,
+        max_queries,
+        lambda test: ("get", reverse(url, args=args), data),
+    )
+
+
+def _task_url(url):
+    return lambda test: reverse(url, args=[test.task.pk])
+
+
+def _task_form(test):
+    return {
+        "name": "Задача из теста бюджета",
+        "status": test.status.pk,
+        "executor": test.user.pk,
+        "labels": [test.label.pk],
+    }
+
+
+def _new_task(test):
+    return Task.objects.create(
+        name="Удаляемая", status=test.status, author=test.user
+    )
+
+
+def _bulk(test):
+    tasks = Task.objects.values_list("pk", flat=True)[:50]
+    return (
+        "post",
+        reverse("tasks:bulk"),
+        {"tasks": list(tasks), "action": "add_label", "label": test.label.pk},
+    )
+
+
+def _import(test):
+    upload = SimpleUploadedFile(
+        "tasks.csv",
+        f"name,status,labels\nИмпорт,{test.status.name},{test.label.name}\n".encode(),
+    )
+    return "post", reverse("tasks:import"), {"file": upload}
+
+
+TASK_CASES = [
+    get("task_list", 3, "tasks:tasks"),
+    get(
+        "task_list_filtered",
+        3,
+        "tasks:tasks",
+        data={"executor": "", "labels": "", "self_tasks": "on"},
+    ),
+    get("task_search", 3, "tasks:tasks", data={"q": "отчет"}),
+    Case(
+        "task_detail",
+        3,
+        lambda test: ("get", _task_url("tasks:detail")(test), None),
+    ),
+    get("task_create_form", 0, "tasks:create"),
+    Case(
+        "task_create",
+        15,
+        lambda test: ("post", reverse("tasks:create"), _task_form(test)),
+    ),
+    Case(
+        "task_update_form",
+        2,
+        lambda test: ("get", _task_url("tasks:update")(test), None),
+    ),
+    Case(
+        "task_update",
+        10,
+        lambda test: (
+            "post",
+            _task_url("tasks:update")(test),
+            _task_form(test),
+        ),
+    ),
+    Case(
+        "task_delete_form",
+        6,
+        lambda test: ("get", _task_url("tasks:delete")(test), None),
+    ),
+    Case(
+        "task_delete",
+        13,
+        lambda test: (
+            "post",
+            reverse("tasks:delete", args=[_new_task(test).pk]),
+            None,
+        ),
+    ),
+    get("task_export_csv", 2, "tasks:export", "csv"),
+    get("task_export_jsonl", 2, "tasks:export", "jsonl"),
+    Case("task_bulk", 6, _bulk),
+    get("task_import_form", 0, "tasks:import"),
+    Case("task_import", 9, _import),
+    get("autocomplete_users", 1, "tasks:autocomplete_users", data={"q": "s"}),
+    get("autocomplete_labels", 1, "tasks:autocomplete_labels"),
+    get("autocomplete_statuses", 1, "tasks:autocomplete_statuses"),
+]
+
+
+def _user_form(username):
+    return {
+        "first_name": "Бюджет",
+        "last_name": "Тестов",
+        "username": username,
+        "password1": TEST_PASSWORD,
+        "password2": TEST_PASSWORD,
+    }
+
+
+def _delete_self(test):
+    # Удалить можно только себя: входим под новым пользователем
+    user = User.objects.create_user(
+        username=f"doomed_{User.objects.count()}", password=TEST_PASSWORD
+    )
+    test.client.force_login(user)
+    return "post", reverse("user_delete", args=[user.pk]), None
+
+
+USER_CASES = [
+    get("user_list", 2, "users"),
+    get("user_create_form", 0, "user_create"),
+    Case(
+        "user_create",
+        4,
+        lambda test: (
+            "post",
+            reverse("user_create"),
+            _user_form(f"new_{User.objects.count()}"),
+        ),
+    ),
+    Case(
+        "user_update_form",
+        2,
+        lambda test: ("get", reverse("user_update", args=[test.user.pk]), None),
+    ),
+    Case(
+        "user_update",
+        5,
+        lambda test: (
+            "post",
+            reverse("user_update", args=[test.user.pk]),
+            _user_form(test.user.username),
+        ),
+    ),
+    Case(
+        "user_delete_form",
+        2,
+        lambda test: ("get", reverse("user_delete", args=[test.user.pk]), None),
+    ),
+    Case("user_delete", 16, _delete_self),
+]
+
+
+def _named_cases(app, model, max_queries):
+    """Сценарии CRUD статусов или меток: у них одинаковые view"""
+    names = iter(range(10**6))
+
+    def update_url(test):
+        return reverse(f"{app}:update", args=[test.named[app].pk])
+
+    def delete_url(test):
+        return reverse(f"{app}:delete", args=[test.named[app].pk])
+
+    def delete_new(test):
+        obj = model.objects.create(name=f"удаляемый {next(names)}")
+        return "post", reverse(f"{app}:delete", args=[obj.pk]), None
+
+    return [
+        get(f"{app}_list", max_queries["list"], f"{app}:{app}"),
+        get(f"{app}_create_form", max_queries["create_form"], f"{app}:create"),
+        Case(
+            f"{app}_create",
+            max_queries["create"],
+            lambda test: (
+                "post",
+                reverse(f"{app}:create"),
+                {"name": f"новый {next(names)}"},
+            ),
+        ),
+        Case(
+            f"{app}_update_form",
+            max_queries["form"],
+            lambda test: ("get", update_url(test), None),
+        ),
+        Case(
+            f"{app}_update",
+            max_queries["update"],
+            lambda test: ("post", update_url(test), {"name": "изменен"}),
+        ),
+        Case(
+            f"{app}_delete_form",
+            max_queries["form"],
+            lambda test: ("get", delete_url(test), None),
+        ),
+        Case(f"{app}_delete", max_queries["delete"], delete_new),
+    ]
+
+
+STATUS_CASES = _named_cases(
+    "statuses",
+    Status,
+    {
+        "list": 1,
+        "create_form": 0,
+        "form": 1,
+        "create": 2,
+        "update": 3,
+        "delete": 4,
+    },
+)
+# Удаление метки дополнительно чистит связи с задачами
+LABEL_CASES = _named_cases(
+    "labels",
+    Label,
+    {
+        "list": 1,
+        "create_form": 0,
+        "form": 1,
+        "create": 2,
+        "update": 3,
+        "delete": 6,
+    },
+)
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Число и время SQL-запросов view не растут вместе с базой"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="budget",
+            password=TEST_PASSWORD,
+            first_name="Бюджет",
+            last_name="Тестов",
+        )
+        self.status = Status.objects.create(name="бюджетный")
+        self.label = Label.objects.create(name="бюджетная")
+        self.task = Task.objects.create(
+            name="Задача бюджета",
+            status=self.status,
+            author=self.user,
+            executor=self.user,
+        )
+        self.task.labels.add(self.label)
+        self.named = {"statuses": self.status, "labels": self.label}
+
+    def seed_to(self, size):
+        """Дополняет базу до size задач, пользователей, статусов и меток"""
+        call_command(
+            "seed_tasks",
+            users=max(0, size - User.objects.count()),
+            statuses=max(0, size - Status.objects.count()),
+            labels=max(0, size - Label.objects.count()),
+            tasks=max(0, size - Task.objects.count()),
+            seed=size,
+            verbosity=0,
+        )
+
+    def login(self):
+        # Сохранение формы пользователя меняет хеш пароля, а с ним
+        # и ключ сессии: без обновления сессия была бы сброшена
+        self.user.refresh_from_db()
+        self.client.force_login(self.user)
+
+    def send(self, case):
+        method, path, data = case.request(self)
+        response = getattr(self.client, method)(path, data)
+        if response.streaming:
+            b"".join(response.streaming_content)
+        self.assertLess(response.status_code, 400, case.name)
+        return response
+
+    def check_cases(self, cases):
+        for size in SIZES:
+            self.seed_to(size)
+            for case in cases:
+                with self.subTest(size=size, case=case.name):
+                    self.login()
+                    # Первый запрос заполняет кеши списков выбора
+                    self.send(case)
+                    self.login()
+                    with self.assertQueryBudget(
+                        case.max_queries, case.max_time_ms
+                    ):
+                        self.send(case)
+
+    def test_tasks(self):
+        self.check_cases(TASK_CASES)
+
+    def test_users(self):
+        self.check_cases(USER_CASES)
+
+    def test_statuses(self):
+        self.check_cases(STATUS_CASES)
+
+    def test_labels(self):
+        self.check_cases(LABEL_CASES)
+
+
+class QueryBudgetReportTest(QueryBudgetMixin, TestCase):
+    """Сообщение о превышении бюджета показывает, откуда запросы"""
+
+    def test_groups_queries_by_call_site(self):
+        status = Status.objects.create(name="новый")
+        for number in range(3):
+            user = User.objects.create_user(username=f"user_{number}")
+            Task.objects.create(
+                name=f"Задача {number}", status=status, author=user
+            )
+        with (
+            self.assertRaises(AssertionError) as error,
+            self.assertQueryBudget(2),
+        ):
+            for task in Task.objects.all():
+                task.author.get_full_name()
+        message = str(error.exception)
+        self.assertIn("4 queries, the budget is 2", message)
+        self.assertIn("3 x task_manager/tests/test_query_budgets.py", message)
+        self.assertIn('WHERE "users"."id" = %s LIMIT ?', message)
+
+    def test_time_budget(self):
+        with (
+            self.assertRaisesRegex(AssertionError, "ms in queries"),
+            self.assertQueryBudget(10, max_time_ms=0),
+        ):
+            Status.objects.count()
@@ -0,0 +1,135 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from task_manager.sessions import PRUNE_LOCK_KEY, REFRESHED_KEY, SessionStore
+from task_manager.users.models import User
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class SessionStoreTest(TestCase):
+    """Тесты движка сессий без лишних записей"""
+
+    def setUp(self):
+        self.session = SessionStore()
+        self.session["key"] = "value"
+        self.session.save()
+
+    def load(self):
+        return SessionStore(self.session.session_key)
+
+    def expire_date(self):
+        return Session.objects.get(pk=self.session.session_key).expire_date
+
+    def test_unchanged_session_is_not_written(self):
+        session = self.load()
+        with self.assertNumQueries(0):
+            self.assertEqual(session["key"], "value")
+            session.save()
+
+    def test_changed_session_is_written(self):
+        session = self.load()
+        session["key"] = "changed"
+        session.save()
+        self.assertEqual(self.load()["key"], "changed")
+        caches["shared"].clear()
+        self.assertEqual(self.load()["key"], "changed")
+
+    def test_stale_session_expiry_is_refreshed(self):
+        session = self.load()
+        session[REFRESHED_KEY] = 0
+        session.modified = False
+        Session.objects.update(expire_date=timezone.now())
+        session.save()
+        self.assertGreater(
+            self.expire_date(), timezone.now() + timedelta(days=13)
+        )
+        self.assertAlmostEqual(self.load()[REFRESHED_KEY], time.time(), -1)
+
+    def test_request_reads_session_from_cache(self):
+        user = User.objects.create_user(username="user", password=TEST_PASSWORD)
+        self.client.force_login(user)
+        url = reverse("statuses:statuses")
+        self.client.get(url)
+        session = Session.objects.get(pk=self.client.session.session_key)
+        # Только статусы: сессия и пользователь - из кеша
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        expire_date = session.expire_date
+        session.refresh_from_db()
+        self.assertEqual(session.expire_date, expire_date)
+
+    def test_logout_elsewhere_with_local_cache(self):
+        # Выход в другом процессе удаляет строку в базе, а копия в кеше
+        # этого процесса остается
+        Session.objects.filter(pk=self.session.session_key).delete()
+        self.assertEqual(self.load()["key"], "value")
+        with override_settings(SHARED_CACHE_IS_LOCAL=True):
+            self.assertNotIn("key", self.load())
+
+    @override_settings(SHARED_CACHE_IS_LOCAL=True)
+    async def test_async_load_with_local_cache(self):
+        await Session.objects.filter(pk=self.session.session_key).adelete()
+        session = await SessionStore(self.session.session_key).aload()
+        self.assertEqual(session, {})
+
+
+@override_settings(SESSION_PRUNE_INTERVAL=60)
+class SessionPruneTest(TestCase):
+    """Тесты удаления истекших сессий"""
+
+    def setUp(self):
+        caches["shared"].delete(PRUNE_LOCK_KEY)
+        patcher = mock.patch.object(SessionStore, "next_prune", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        past = timezone.now() - timedelta(days=1)
+        Session.objects.bulk_create(
+            Session(session_key=f"expired{number}", expire_date=past)
+            for number in range(5)
+        )
+        self.session = SessionStore()
+        self.session.save()
+
+    def test_clear_expired_in_batches(self):
+        with mock.patch("task_manager.sessions.PRUNE_BATCH_SIZE", 2):
+            self.assertEqual(SessionStore.clear_expired(), 5)
+        self.assertEqual(
+            list(Session.objects.values_list("pk", flat=True)),
+            [self.session.session_key],
+        )
+
+    def test_prune_after_interval(self):
+        SessionStore.prune_if_due()
+        self.assertEqual(Session.objects.count(), 6)
+        later = time.monotonic() + 61
+        with (
+            mock.patch(
+                "task_manager.sessions.time.monotonic", return_value=later
+            ),
+            mock.patch.object(
+                SessionStore, "clear_expired", wraps=SessionStore.clear_expired
+            ) as clear_expired,
+        ):
+            SessionStore.prune_if_due()
+            # Другой процесс с наступившим сроком видит ключ в кеше
+            SessionStore.next_prune = 0
+            SessionStore.prune_if_due()
+        clear_expired.assert_called_once()
+        self.assertEqual(Session.objects.count(), 1)
+
+    @override_settings(SESSION_PRUNE_INTERVAL=0)
+    def test_disabled(self):
+        with mock.patch(
+            "task_manager.sessions.time.monotonic", return_value=1e12
+        ):
+            SessionStore.prune_if_due()
+            SessionStore.prune_if_due()
+        self.assertEqual(Session.objects.count(), 6)
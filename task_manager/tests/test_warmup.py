@@ -0,0 +1,37 @@
+from pathlib import Path
+
+from django.template import engines
+from django.test import SimpleTestCase
+
+from task_manager.warmup import template_names, warm_templates, warm_up
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+class WarmupTest(SimpleTestCase):
+    """Тесты подготовки воркера к первому запросу"""
+
+    def setUp(self):
+        self.loader = engines["django"].engine.template_loaders[0]
+        self.loader.reset()
+
+    def test_cached_loader(self):
+        self.assertEqual(
+            type(self.loader).__module__, "django.template.loaders.cached"
+        )
+
+    def test_template_names(self):
+        names = template_names(TEMPLATE_DIR)
+        self.assertIn("base.html", names)
+        self.assertIn("tasks/rows.html", names)
+
+    def test_warm_templates(self):
+        count = warm_templates()
+        self.assertGreater(count, len(template_names(TEMPLATE_DIR)))
+        for name in template_names(TEMPLATE_DIR):
+            self.assertIn(name, self.loader.get_template_cache)
+
+    def test_warm_up_logs(self):
+        with self.assertLogs("task_manager.warmup", "INFO") as logs:
+            warm_up()
+        self.assertIn("Worker warmed up", logs.output[0])
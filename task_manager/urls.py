@@ -29,5 +29,6 @@ urlpatterns = [
     path("labels/", include("task_manager.labels.urls")),
     path("login/", views.login_view, name="login"),
     path("logout/", views.logout_view, name="logout"),
+    path("metrics", views.metrics_view, name="metrics"),
     path("admin/", admin.site.urls),
 ]
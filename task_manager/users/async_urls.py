@@ -0,0 +1,13 @@
+from task_manager.async_views import async_urlpatterns
+from task_manager.users import views
+from task_manager.users.urls import urlpatterns
+
+urlpatterns = async_urlpatterns(
+    urlpatterns,
+    {
+        "users": views.AsyncUsersIndexView,
+        "user_create": views.AsyncUserCreateView,
+        "user_update": views.AsyncUserUpdateView,
+        "user_delete": views.AsyncUserDeleteView,
+    },
+)
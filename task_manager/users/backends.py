@@ -0,0 +1,52 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.db import transaction
+
+
+def user_cache_key(user_id):
+    return f"users:{user_id}"
+
+
+def forget_users(user_ids, using=None):
+    """Убирает пользователей из кеша сразу и еще раз после коммита
+    транзакции базы using: иначе параллельный запрос успел бы положить
+    в кеш старую строку"""
+    cache = caches["shared"]
+    keys = [user_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys), using=using)
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend, который берет пользователя сессии из кеша.
+
+    AuthenticationMiddleware загружает пользователя в каждом запросе;
+    здесь он читается из общего кеша, а не из базы. Проверка хеша
+    сессии остается за django.contrib.auth: в кеше лежит пользователь
+    с паролем, и после смены пароля старые сессии не подходят к хешу.
+    Кеш - общий, без уровня в памяти процесса, чтобы смена пароля или
+    удаление сразу действовали во всех процессах. Сброс - в signals.py.
+    Если общий кеш - память процесса (SHARED_CACHE_IS_LOCAL), сброс в
+    одном процессе не виден другим, и пользователь читается из базы.
+    """
+
+    timeout = 60 * 60
+
+    def get_user(self, user_id):
+        if settings.SHARED_CACHE_IS_LOCAL:
+            return super().get_user(user_id)
+        cache = caches["shared"]
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, self.timeout)
+            return user
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        # Без этого request.auser() под ASGI читал бы пользователя из базы
+        return await sync_to_async(self.get_user)(user_id)
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+from django.db import migrations
+
+from task_manager.operations import RunVendorSQL
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    # Индексы для поиска по началу строки без учета регистра (istartswith)
+    operations = [
+        RunVendorSQL(
+            sql={
+                "postgresql": (
+                    "CREATE INDEX users_username_prefix_idx "
+                    "ON users (UPPER(username::text) text_pattern_ops)"
+                ),
+                "sqlite": (
+                    "CREATE INDEX users_username_prefix_idx "
+                    "ON users (username COLLATE NOCASE)"
+                ),
+            },
+            reverse_sql={
+                "postgresql": "DROP INDEX users_username_prefix_idx",
+                "sqlite": "DROP INDEX users_username_prefix_idx",
+            },
+        ),
+        RunVendorSQL(
+            sql={
+                "postgresql": (
+                    "CREATE INDEX users_first_name_prefix_idx "
+                    "ON users (UPPER(first_name::text) text_pattern_ops)"
+                ),
+                "sqlite": (
+                    "CREATE INDEX users_first_name_prefix_idx "
+                    "ON users (first_name COLLATE NOCASE)"
+                ),
+            },
+            reverse_sql={
+                "postgresql": "DROP INDEX users_first_name_prefix_idx",
+                "sqlite": "DROP INDEX users_first_name_prefix_idx",
+            },
+        ),
+        RunVendorSQL(
+            sql={
+                "postgresql": (
+                    "CREATE INDEX users_last_name_prefix_idx "
+                    "ON users (UPPER(last_name::text) text_pattern_ops)"
+                ),
+                "sqlite": (
+                    "CREATE INDEX users_last_name_prefix_idx "
+                    "ON users (last_name COLLATE NOCASE)"
+                ),
+            },
+            reverse_sql={
+                "postgresql": "DROP INDEX users_last_name_prefix_idx",
+                "sqlite": "DROP INDEX users_last_name_prefix_idx",
+            },
+        ),
+    ]
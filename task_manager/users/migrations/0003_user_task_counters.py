@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:52
+
+from django.db import migrations
+
+import task_manager.fields
+from task_manager.operations import AddColumn
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_name_prefix_indexes"),
+    ]
+
+    # Без перестройки таблицы в SQLite: сохраняются индексы из 0002
+    operations = [
+        AddColumn(
+            model_name="user",
+            name="assigned_tasks_count",
+            field=task_manager.fields.CounterField(),
+        ),
+        AddColumn(
+            model_name="user",
+            name="authored_tasks_count",
+            field=task_manager.fields.CounterField(),
+        ),
+    ]
@@ -2,11 +2,17 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.fields import CounterField
+
 
 # Create your models here.
 class User(AbstractUser):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Число задач пользователя как автора и как исполнителя,
+    # см. tasks/counters.py
+    authored_tasks_count = CounterField()
+    assigned_tasks_count = CounterField()
 
     class Meta:
         db_table = "users"
@@ -15,3 +21,8 @@ class User(AbstractUser):
 
     def __str__(self):
         return self.username
+
+    def get_display_name(self):
+        """Имя в списках выбора, подсказках и выгрузке: полное имя, а
+        если его нет - логин"""
+        return self.get_full_name() or self.username
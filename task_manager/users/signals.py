@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import forget_users
+from .models import User
+
+
+@receiver([post_save, post_delete], sender=User)
+def forget_cached_user(sender, instance, using, update_fields=None, **kwargs):
+    # Вход сохраняет только last_login: устаревшее значение в кеше
+    # ничему не мешает, а сброс стоил бы запроса после каждого входа
+    if update_fields is not None and set(update_fields) == {"last_login"}:
+        return
+    forget_users([instance.pk], using)
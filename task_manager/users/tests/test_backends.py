@@ -0,0 +1,99 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from task_manager.users.backends import CachedModelBackend, user_cache_key
+from task_manager.users.forms import UserRegistrationForm
+from task_manager.users.models import User
+
+TEST_PASSWORD = "ValidPassword123!"
+
+
+class CachedModelBackendTest(TestCase):
+    """Тесты кеша пользователя сессии"""
+
+    def setUp(self):
+        caches["shared"].clear()
+        self.user = User.objects.create_user(
+            username="user",
+            password=TEST_PASSWORD,
+            first_name="Иван",
+            last_name="Петров",
+        )
+        self.backend = CachedModelBackend()
+        self.url = reverse("statuses:statuses")
+
+    def cached(self):
+        return caches["shared"].get(user_cache_key(self.user.pk))
+
+    def test_get_user_is_cached(self):
+        self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+
+    def test_missing_user(self):
+        self.assertIsNone(self.backend.get_user(999999))
+        self.assertIsNone(self.backend.get_user(999999))
+
+    def test_request_does_not_load_user(self):
+        self.client.login(username="user", password=TEST_PASSWORD)
+        self.client.get(self.url)
+        # Остался только запрос списка статусов
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+
+    def test_login_keeps_cache(self):
+        self.backend.get_user(self.user.pk)
+        self.client.login(username="user", password=TEST_PASSWORD)
+        self.assertIsNotNone(self.cached())
+
+    def test_save_invalidates(self):
+        self.backend.get_user(self.user.pk)
+        self.user.first_name = "Пётр"
+        self.user.save()
+        self.assertIsNone(self.cached())
+        self.assertEqual(self.backend.get_user(self.user.pk).first_name, "Пётр")
+
+    def test_delete_invalidates(self):
+        self.backend.get_user(self.user.pk)
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertIsNone(self.backend.get_user(user_id))
+
+    def test_inactive_user(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_password_change_logs_out_other_sessions(self):
+        self.client.login(username="user", password=TEST_PASSWORD)
+        self.client.get(self.url)
+        form = UserRegistrationForm(
+            instance=self.user,
+            data={
+                "first_name": "Иван",
+                "last_name": "Петров",
+                "username": "user",
+                "password1": "NewPassword456!",
+                "password2": "NewPassword456!",
+            },
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertIsNone(self.cached())
+        response = self.client.get(self.url)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    @override_settings(SHARED_CACHE_IS_LOCAL=True)
+    def test_local_shared_cache_is_not_used(self):
+        # Другой процесс не узнал бы о сбросе кеша в этом
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        self.assertIsNone(self.cached())
+        with self.assertNumQueries(1):
+            self.backend.get_user(self.user.pk)
+
+    async def test_aget_user_is_cached(self):
+        self.assertEqual(await self.backend.aget_user(self.user.pk), self.user)
+        self.assertEqual(self.cached(), self.user)
@@ -1,5 +1,5 @@
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 
 UserModel = get_user_model()
@@ -130,3 +130,8 @@ def test_anonymous_user_cannot_delete_users(self):
     """аноним не может удалять пользователей"""
     response = self.client.get(reverse("user_delete", args=[1]))
     self.assertNotEqual(response.status_code, 200)  # Не должен иметь доступ
+
+
+@override_settings(ROOT_URLCONF="task_manager.async_urls")
+class AsyncUsersViewsTest(UsersViewsTest):
+    """Те же сценарии с асинхронными view"""
@@ -6,6 +6,13 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
+from task_manager.async_views import (
+    AsyncCreateView,
+    AsyncDeleteView,
+    AsyncListView,
+    AsyncLoginRequiredMixin,
+    AsyncUpdateView,
+)
 from task_manager.users.forms import UserRegistrationForm
 from task_manager.users.models import User
 
@@ -60,4 +67,60 @@ class UserDeleteView(
     success_url = reverse_lazy("users")
     success_message = _("The user has been successfully deleted")
     permission_message = _("You do not have permission to delete another user.")
-    login_url = reverse_lazy("login")
\ No newline at end of file
+    login_url = reverse_lazy("login")
+
+
+class AsyncUserPermissionMixin(UserPermissionMixin):
+    """Проверка прав для асинхронных view: сравниваются id, пользователь
+    из URL не загружается"""
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.user.pk != kwargs["pk"]:
+            messages.error(request, self.permission_message)
+            return redirect(self.redirect_url)
+        # Синхронный dispatch UserPermissionMixin пропускается
+        return await super(UserPermissionMixin, self).dispatch(
+            request, *args, **kwargs
+        )
+
+
+class AsyncUsersIndexView(AsyncListView):
+    model = User
+    template_name = "users/index.html"
+    context_object_name = "users"
+    paginate_by = 10
+    ordering = ["id"]
+
+
+class AsyncUserCreateView(AsyncCreateView):
+    model = User
+    form_class = UserRegistrationForm
+    template_name = "users/new_user.html"
+    success_url = reverse_lazy("login")
+    success_message = _("The user has been successfully registered")
+    form_title = _("Registration")
+    form_submit = _("Register")
+
+
+class AsyncUserUpdateView(
+    AsyncLoginRequiredMixin, AsyncUserPermissionMixin, AsyncUpdateView
+):
+    model = User
+    form_class = UserRegistrationForm
+    template_name = "users/update.html"
+    success_url = reverse_lazy("users")
+    success_message = _("The user has been successfully updated")
+    login_url = reverse_lazy("login")
+    form_title = _("Edit User")
+    form_submit = _("To change")
+
+
+class AsyncUserDeleteView(
+    AsyncLoginRequiredMixin, AsyncUserPermissionMixin, AsyncDeleteView
+):
+    model = User
+    template_name = "users/delete.html"
+    success_url = reverse_lazy("users")
+    success_message = _("The user has been successfully deleted")
+    permission_message = _("You do not have permission to delete another user.")
+    login_url = reverse_lazy("login")
@@ -1,9 +1,24 @@
+import hmac
+
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, HttpResponse, HttpResponseForbidden
 from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
+from task_manager.labels.models import Label
+from task_manager.metrics import render_metrics
+from task_manager.statuses.models import Status
+from task_manager.tasks import rollups
+from task_manager.users.models import User
+
+# Периоды графика на главной странице, в днях; первый - по умолчанию
+DASHBOARD_PERIODS = [30, 7, 90]
+# Сколько исполнителей и меток показывать
+DASHBOARD_TOP = 10
+
 
 def test_error(request):
     # Это вызовет ошибку для тестирования Rollbar
@@ -11,7 +26,59 @@ def test_error(request):
 
 
 def home(request):
-    return render(request, "home.html")
+    if not request.user.is_authenticated:
+        return render(request, "home.html")
+    return render(request, "home.html", _dashboard_context(request))
+
+
+def _dashboard_context(request):
+    """Статистика для главной страницы.
+
+    Таблица задач не читается: график - из дневных сводок
+    (tasks/rollups.py), распределения - из счетчиков задач у статусов,
+    исполнителей и меток (tasks/counters.py).
+    """
+    days = request.GET.get("days", "")
+    if not days.isdigit() or int(days) not in DASHBOARD_PERIODS:
+        days = DASHBOARD_PERIODS[0]
+    days = int(days)
+    daily = rollups.daily(days)
+    statuses = list(
+        Status.objects.only("name", "is_closed", "tasks_count").order_by(
+            "-tasks_count", "name"
+        )
+    )
+    executors = list(
+        User.objects.filter(assigned_tasks_count__gt=0)
+        .only("username", "first_name", "last_name", "assigned_tasks_count")
+        .order_by("-assigned_tasks_count", "username")[:DASHBOARD_TOP]
+    )
+    labels = list(
+        Label.objects.filter(tasks_count__gt=0)
+        .only("name", "tasks_count")
+        .order_by("-tasks_count", "name")[:DASHBOARD_TOP]
+    )
+    return {
+        "days": days,
+        "periods": sorted(DASHBOARD_PERIODS),
+        "daily": daily,
+        "daily_peak": max(
+            (max(row["created"], row["closed"]) for row in daily), default=0
+        ),
+        "created_total": sum(row["created"] for row in daily),
+        "closed_total": sum(row["closed"] for row in daily),
+        "statuses": statuses,
+        "tasks_total": sum(status.tasks_count for status in statuses),
+        "open_total": sum(
+            status.tasks_count for status in statuses if not status.is_closed
+        ),
+        "executors": executors,
+        "executors_peak": max(
+            (user.assigned_tasks_count for user in executors), default=0
+        ),
+        "labels": labels,
+        "labels_peak": max((label.tasks_count for label in labels), default=0),
+    }
 
 
 def login_view(request):
@@ -40,3 +107,20 @@ def logout_view(request):
     logout(request)
     messages.success(request, _("You are logged out"))
     return redirect("home")
+
+
+def metrics_view(request):
+    if not settings.METRICS:
+        raise Http404
+    if not _can_read_metrics(request):
+        return HttpResponseForbidden()
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+def _can_read_metrics(request):
+    token = settings.METRICS_TOKEN
+    header = request.headers.get("Authorization", "")
+    if token and hmac.compare_digest(header, f"Bearer {token}"):
+        return True
+    return request.user.is_staff
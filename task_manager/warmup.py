@@ -0,0 +1,75 @@
+"""Подготовка воркера к первому запросу.
+
+Django многое делает лениво, при первом запросе: импортирует URLconf со
+всеми view, загружает переводы, а кешированный загрузчик разбирает
+шаблон при первом обращении к нему (base.html с тегами
+django_bootstrap5 - в каждой странице). warm_up() делает это заранее;
+gunicorn.conf.py вызывает ее после загрузки приложения в воркере.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from django import forms
+from django.apps import apps
+from django.conf import settings
+from django.forms.renderers import get_default_renderer
+from django.template import engines
+from django.urls import reverse
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+# Приложения, чьи шаблоны разбираются вместе с шаблонами проекта
+WARMUP_APPS = ("task_manager", "django_bootstrap5")
+
+
+def template_names(directory):
+    """Имена шаблонов каталога, как их передают в get_template()"""
+    return sorted(
+        path.relative_to(directory).as_posix()
+        for path in directory.rglob("*.html")
+    )
+
+
+def warm_templates():
+    """Разбирает шаблоны WARMUP_APPS и виджетов форм; возвращает их
+    число"""
+    engine = engines["django"]
+    count = 0
+    for label in WARMUP_APPS:
+        directory = Path(apps.get_app_config(label).path) / "templates"
+        for name in template_names(directory):
+            engine.get_template(name)
+            count += 1
+    # Виджеты форм рисуются отдельным движком шаблонов
+    renderer = get_default_renderer()
+    directory = Path(forms.__file__).parent / "templates"
+    for name in template_names(directory):
+        renderer.get_template(name)
+        count += 1
+    return count
+
+
+def warm_urls():
+    # Импорт URLconf и заполнение таблицы обратного разрешения
+    reverse("home")
+
+
+def warm_translations():
+    for code, _name in settings.LANGUAGES:
+        with translation.override(code):
+            translation.gettext("Tasks")
+
+
+def warm_up():
+    started = time.perf_counter()
+    warm_urls()
+    warm_translations()
+    count = warm_templates()
+    logger.info(
+        "Worker warmed up in %.1f ms (%d templates)",
+        (time.perf_counter() - started) * 1000,
+        count,
+    )